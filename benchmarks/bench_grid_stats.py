@@ -0,0 +1,74 @@
+"""
+Benchmark: grid statistics computed for put_grid
+
+Compares compute_grid_stats, which computes min, max, mean and the range counts
+in one pass over the float32 cells (a second counting pass for the default range
+values that depend on min and max), with the numpy implementation it replaced:
+a filtered copy of the valid cells, then one pass for each statistic and for
+each range value.
+
+Usage:
+    python bench_grid_stats.py [rows] [cols] [repeat]
+"""
+
+import sys
+from time import perf_counter
+
+import numpy as np
+import numpy.ma as ma
+
+from pydsstools.heclib.utils import compute_grid_stats
+
+
+def numpy_grid_stats(data, compute_range=True):
+    # previous implementation
+    if isinstance(data, ma.core.MaskedArray):
+        data = data[~data.mask]
+        data = data._data
+    else:
+        data = data[~np.isnan(data)]
+    min_value = data.min()
+    max_value = data.max()
+    mean_value = data.mean()
+    if isinstance(compute_range, (list, tuple)):
+        range_values = sorted(
+            [x for x in compute_range if not (np.isnan(x) or x < min_value or x > max_value)]
+        )
+    elif min_value < 0 and max_value > 0:
+        range_values = [round(x, 2) for x in np.linspace(min_value, max_value, 10).tolist()]
+    else:
+        range_values = [min_value, 0.25 * (min_value + max_value), 0.5 * (min_value + max_value),
+                        0.75 * (min_value + max_value)]
+        range_values = [round(x, 2) for x in range_values]
+    range_counts = [(data >= val).sum() for val in range_values[0:19]]
+    return min_value, max_value, mean_value, range_counts
+
+
+def timeit(func, data, compute_range, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func(data, compute_range)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main(rows=4000, cols=4000, repeat=5):
+    rng = np.random.default_rng(0)
+    grid = (rng.standard_normal((rows, cols)) * 20).astype(np.float32)
+    grid[rng.random((rows, cols)) < 0.2] = np.nan
+    masked = ma.masked_invalid(grid)
+    explicit = [-30.0, -10.0, 0.0, 5.0, 10.0, 20.0, 40.0]
+    print("grid = %d x %d, 20%% nodata, best of %d" % (rows, cols, repeat))
+    for name, data in (("NaN nodata", grid), ("masked", masked)):
+        for range_name, compute_range in (("default range", True), ("7 range values", explicit)):
+            fast = timeit(compute_grid_stats, data, compute_range, repeat)
+            slow = timeit(numpy_grid_stats, data, compute_range, repeat)
+            print(
+                "%-10s %-15s  kernel = %7.3f s  numpy = %7.3f s  speed-up = %5.1f"
+                % (name, range_name, fast, slow, slow / fast)
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:4]])
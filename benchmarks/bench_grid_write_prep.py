@@ -0,0 +1,90 @@
+"""
+Benchmark: preparation of numpy grid for put_grid
+
+Compares the fused pass used by put_grid (NaN/nodata/mask to nodata, row flip and
+float32 cast into one output array, statistics computed on that array) with the
+steps it replaced (np.where copy, astype copy, flipud and ascontiguousarray copy,
+statistics on the np.where copy). Reports time and peak memory allocated by numpy
+in multiples of the float32 grid size.
+
+Usage:
+    python bench_grid_write_prep.py [rows] [cols] [repeat]
+"""
+
+import sys
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+import numpy.ma as ma
+
+from pydsstools.heclib.utils import compute_grid_stats, UNDEFINED
+from pydsstools.heclib.dss.HecDss import _grid_array_to_write
+
+
+def fused_prep(data, nodata):
+    _data = _grid_array_to_write(data, nodata, True)
+    compute_grid_stats(_data, True, nodata=nodata)
+    return _data
+
+
+def numpy_prep(data, nodata):
+    # previous put_grid steps
+    _data = data
+    inplace = False
+    if not isinstance(data, ma.core.MaskedArray):
+        inplace = True
+        _data = np.where(data == nodata, np.nan, data)
+    compute_grid_stats(_data, True)
+    if isinstance(_data, ma.core.MaskedArray):
+        mask = _data.mask
+        _data = _data._data
+    else:
+        mask = np.isnan(data)
+    if _data.dtype != np.float32:
+        _data = _data.astype(np.float32, casting="unsafe", copy=True)
+        inplace = True
+    if inplace:
+        _data[mask] = nodata
+    else:
+        _data = _data.astype(np.float32, casting="unsafe", copy=True)
+        _data[mask] = nodata
+    _data = np.flipud(_data)
+    return np.ascontiguousarray(_data)
+
+
+def measure(func, data, nodata, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func(data, nodata)
+        best = min(best, perf_counter() - start)
+    tracemalloc.start()
+    func(data, nodata)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main(rows=4000, cols=4000, repeat=5):
+    rng = np.random.default_rng(0)
+    grid = (rng.random((rows, cols)) * 100).astype(np.float32)
+    grid[rng.random((rows, cols)) < 0.2] = np.nan
+    grid_size = grid.nbytes
+    cases = (
+        ("float32", grid),
+        ("float64", grid.astype(np.float64)),
+        ("masked", ma.masked_invalid(grid)),
+    )
+    print("grid = %d x %d, 20%% nodata, best of %d" % (rows, cols, repeat))
+    for name, data in cases:
+        fast, fast_peak = measure(fused_prep, data, UNDEFINED, repeat)
+        slow, slow_peak = measure(numpy_prep, data, UNDEFINED, repeat)
+        print(
+            "%-8s fused = %7.3f s (%.1fx grid)  numpy = %7.3f s (%.1fx grid)  speed-up = %5.1f"
+            % (name, fast, fast_peak / grid_size, slow, slow_peak / grid_size, slow / fast)
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:4]])
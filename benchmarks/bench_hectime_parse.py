@@ -0,0 +1,57 @@
+"""
+Benchmark: parsing DSS date strings
+
+Compares HecTime.getPyDateTimeFromString, which parses the DSS date formats
+directly, with dateutil.parser.parse used as the general fallback. Strings with
+24:00 or ':' between date and time fail in dateutil and needed a second parse.
+
+Usage:
+    python bench_hectime_parse.py [number of strings]
+"""
+
+import sys
+from time import perf_counter
+from datetime import datetime, timedelta
+
+from dateutil import parser
+from pydsstools.core import HecTime
+
+formats = {
+    "DDMMMYYYY": "%d%b%Y",
+    "DDMMMYYYY HHMM": "%d%b%Y %H%M",
+    "DDMMMYYYY:HHMM": "%d%b%Y:%H%M",
+    "DDMMMYYYY HH:MM:SS": "%d%b%Y %H:%M:%S",
+}
+
+
+def date_strings(count, fmt):
+    start = datetime(1950, 1, 1)
+    return [(start + timedelta(hours=7 * i)).strftime(fmt).upper() for i in range(count)]
+
+
+def timeit(func, strings):
+    start = perf_counter()
+    for text in strings:
+        func(text)
+    return perf_counter() - start
+
+
+def main(count=50000):
+    print("strings per format = %d" % count)
+    for name, fmt in formats.items():
+        strings = date_strings(count, fmt)
+        fast = timeit(HecTime.getPyDateTimeFromString, strings)
+        try:
+            slow = timeit(parser.parse, strings)
+            slow = "%8.3f s  speed-up = %6.1f" % (slow, slow / fast)
+        except (ValueError, OverflowError):
+            slow = "     n/a  (not parsed by dateutil)"
+        print("%-20s  fast = %8.3f s  dateutil = %s" % (name, fast, slow))
+
+    strings = ["%s 24:00" % x for x in date_strings(count, "%d%b%Y")]
+    fast = timeit(HecTime.getPyDateTimeFromString, strings)
+    print("%-20s  fast = %8.3f s" % ("DDMMMYYYY 24:00", fast))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]])
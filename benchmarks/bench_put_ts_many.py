@@ -0,0 +1,61 @@
+"""
+Benchmark: writing many small regular time-series
+
+Compares one put_ts call per series with a single put_ts_many call.
+
+Usage:
+    python bench_put_ts_many.py [number of series] [values per series]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from time import perf_counter
+
+import numpy as np
+from pydsstools.heclib.dss import HecDss
+from pydsstools.core import TimeSeriesContainer
+
+
+def containers(count, length):
+    result = []
+    for i in range(count):
+        tsc = TimeSeriesContainer()
+        tsc.pathname = "/BENCH/LOC%d/FLOW//1HOUR/PUT/" % i
+        tsc.startDateTime = "01JAN2000 01:00"
+        tsc.numberValues = length
+        tsc.units = "cfs"
+        tsc.type = "INST"
+        tsc.interval = 1
+        tsc.values = np.random.rand(length).astype(np.float32)
+        result.append(tsc)
+    return result
+
+
+def main(count=10000, length=24):
+    folder = tempfile.mkdtemp(prefix="pydsstools_bench_")
+    try:
+        items = containers(count, length)
+
+        start = perf_counter()
+        with HecDss.Open(os.path.join(folder, "loop.dss")) as fid:
+            for tsc in items:
+                fid.put_ts(tsc)
+        loop = perf_counter() - start
+
+        start = perf_counter()
+        with HecDss.Open(os.path.join(folder, "many.dss")) as fid:
+            status, errors = fid.put_ts_many(items)
+        many = perf_counter() - start
+
+        print("series = %d, values per series = %d" % (count, length))
+        print("put_ts loop   = %8.3f s" % loop)
+        print("put_ts_many   = %8.3f s  speed-up = %5.2f  failed = %d"
+              % (many, loop / many, np.count_nonzero(status)))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:3]])
@@ -0,0 +1,78 @@
+"""
+Benchmark: reading separate DSS files from a thread pool
+
+The heclib read calls release the GIL and the record reads of DSS-7 files on
+separate Open objects are not serialized, so threads that each own an Open object
+(one file per thread) read in parallel. zopen and zclose are still serialized.
+Each file gets one long 15-minute regular time-series which is read back
+completely, and the values are sorted (numpy sort also releases the GIL).
+
+Usage:
+    python bench_threaded_read.py [number of files] [years of data]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pydsstools.heclib.dss import HecDss
+from pydsstools.core import TimeSeriesContainer
+
+pathname = "/BENCH/THREADS/FLOW//15MINUTE/READ/"
+window = ("01JAN2000 00:15", "31DEC2000 24:00")
+
+
+def create_file(dss_file, years):
+    values = np.random.rand(years * 365 * 96).astype(np.float32)
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2000 00:15"
+    tsc.numberValues = values.size
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    tsc.values = values
+    with HecDss.Open(dss_file) as fid:
+        fid.put_ts(tsc)
+
+
+def read_file(dss_file, end_date):
+    with HecDss.Open(dss_file, mode="r") as fid:
+        ts = fid.read_ts(pathname, window=(window[0], end_date))
+    values = np.sort(np.asarray(ts.values))
+    return len(values)
+
+
+def main(file_no=8, years=10):
+    folder = tempfile.mkdtemp(prefix="pydsstools_bench_")
+    end_date = "31DEC%d 24:00" % (2000 + years - 1)
+    try:
+        files = [os.path.join(folder, "bench_%d.dss" % i) for i in range(file_no)]
+        for dss_file in files:
+            create_file(dss_file, years)
+
+        print("files = %d, values per file = %d" % (file_no, years * 365 * 96))
+        base = None
+        workers = 1
+        while workers <= file_no:
+            start = perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                counts = list(pool.map(lambda f: read_file(f, end_date), files))
+            elapsed = perf_counter() - start
+            base = elapsed if base is None else base
+            print(
+                "threads = %2d  time = %8.3f s  speed-up = %5.2f  values read = %d"
+                % (workers, elapsed, base / elapsed, sum(counts))
+            )
+            workers *= 2
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    args = [int(x) for x in sys.argv[1:3]]
+    main(*args)
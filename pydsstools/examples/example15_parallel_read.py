@@ -0,0 +1,26 @@
+"""
+Read the same time-series from many dss files (e.g., ensemble members) using worker processes
+"""
+
+from glob import glob
+from pydsstools.heclib.dss.parallel import ParallelReader
+
+dss_files = sorted(glob("ensemble/member_*.dss"))
+pathname = "/REGULAR/TIMESERIES/FLOW//1HOUR/Ex1/"
+startDate = "15JUL2019 19:00:00"
+endDate = "15AUG2019 19:00:00"
+
+if __name__ == "__main__":
+    with ParallelReader(max_workers=4) as reader:
+        # DataFrame with one column per file
+        df, errors = reader.read_ts(
+            dss_files, pathname, window=(startDate, endDate), wide=True
+        )
+        for dss_file, error in errors.items():
+            print("Could not read %s: %s" % (dss_file, error))
+        print(df.describe())
+
+        # Process one file at a time to keep memory flat
+        for dss_file, series, error in reader.iter_ts(dss_files, pathname):
+            if error is None:
+                print(dss_file, series.max())
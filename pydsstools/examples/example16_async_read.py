@@ -0,0 +1,52 @@
+"""
+Read many records concurrently from asyncio tasks while the event loop stays responsive
+"""
+
+import os
+import asyncio
+from time import perf_counter
+from pydsstools.heclib.dss.aio import AsyncOpen
+
+dss_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_dss", "example.dss")
+pathname_pattern = "/*/*/*/*/*/*/"
+repeat = 20
+
+
+async def heartbeat(interval, lags):
+    # measures how late the event loop wakes up this task
+    while True:
+        t0 = perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(perf_counter() - t0 - interval)
+
+
+async def read_record(fid, pathname):
+    if "/PAIRED/" in pathname:
+        return await fid.read_pd(pathname)
+    if "/GRID/" in pathname:
+        return await fid.read_grid(pathname)
+    return await fid.read_ts(pathname, trim_missing=True)
+
+
+async def main():
+    lags = []
+    beat = asyncio.create_task(heartbeat(0.005, lags))
+    async with AsyncOpen(dss_file, mode="r", max_pending=16) as fid:
+        pathnames = await fid.getPathnameList(pathname_pattern, sort=1)
+        pathnames = [p for p in pathnames if "/GRID/" not in p] * repeat
+        t0 = perf_counter()
+        results = await asyncio.gather(
+            *[read_record(fid, p) for p in pathnames], return_exceptions=True
+        )
+        elapsed = perf_counter() - t0
+    beat.cancel()
+
+    errors = sum(isinstance(r, Exception) for r in results)
+    print("%d reads (%d errors) in %.3f s" % (len(results), errors, elapsed))
+    if lags:
+        print("event loop lag: max %.2f ms, mean %.2f ms"
+              % (1000 * max(lags), 1000 * sum(lags) / len(lags)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+Test of DssWriter
+"""
+
+import os
+import asyncio
+import tempfile
+import threading
+import numpy as np
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.heclib.dss.writer import DssWriter
+from pydsstools.core import TimeSeriesContainer
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test10.dss")
+window = ("01JAN2020 01:00", "01JAN2020 10:00")
+
+
+def make_tsc(pathname, offset=0):
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2020 01:00"
+    tsc.numberValues = 10
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    tsc.values = np.arange(10, dtype=np.float32) + offset
+    return tsc
+
+
+def test_many_producers():
+    pathnames = ["/TEST10/THREAD%d/FLOW//1HOUR/OBS/" % i for i in range(40)]
+
+    def produce(names):
+        for name in names:
+            writer.submit_ts(make_tsc(name))
+
+    with DssWriter(dss_file, max_queue=8) as writer:
+        threads = [threading.Thread(target=produce, args=(pathnames[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.flush()
+        stats = writer.stats()
+    assert stats["written"] == 40 and stats["failed"] == 0
+    with Open(dss_file, mode="r") as fid:
+        results, errors = fid.read_ts_many(pathnames, window=window)
+    assert not errors and len(results) == 40
+
+
+def test_failed_job():
+    with DssWriter(dss_file) as writer:
+        good = writer.submit_ts(make_tsc("/TEST10/GOOD/FLOW//1HOUR/OBS/"))
+        bad = make_tsc("/TEST10/BAD/FLOW//1HOUR/OBS/")
+        bad.numberValues = 20
+        bad = writer.submit_ts(bad)
+        assert good.result() == 0
+        # the exception of the failed write is raised
+        err = bad.exception()
+        assert err is not None and "numberValues" in str(err)
+
+
+def test_async():
+    async def produce(writer):
+        return await asyncio.gather(
+            *[writer.aput_ts(make_tsc("/TEST10/ASYNC%d/FLOW//1HOUR/OBS/" % i)) for i in range(10)]
+        )
+
+    with DssWriter(dss_file, max_queue=2) as writer:
+        status = asyncio.run(produce(writer))
+    assert status == [0] * 10
+
+
+def test_closed():
+    writer = DssWriter(dss_file)
+    writer.close()
+    try:
+        writer.submit_ts(make_tsc("/TEST10/CLOSED/FLOW//1HOUR/OBS/"))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("submit after close did not fail")
+
+
+if __name__ == "__main__":
+    for test in [test_many_producers, test_failed_job, test_async, test_closed]:
+        test()
+        print("Passed %s" % test.__name__)
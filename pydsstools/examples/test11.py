@@ -0,0 +1,106 @@
+"""
+Test of AsyncOpen
+"""
+
+import os
+import asyncio
+import tempfile
+import numpy as np
+from pydsstools.heclib.dss.aio import AsyncOpen, _workers
+from pydsstools.core import TimeSeriesContainer
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test11.dss")
+sample_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_dss", "example.dss")
+pathnames = ["/TEST11/LOC%d/FLOW//1HOUR/OBS/" % i for i in range(5)]
+window = ("01JAN2020 01:00", "01JAN2020 10:00")
+
+
+def make_tsc(pathname, offset):
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2020 01:00"
+    tsc.numberValues = 10
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    tsc.values = np.arange(10, dtype=np.float32) + offset
+    return tsc
+
+
+async def write_records():
+    async with AsyncOpen(dss_file) as fid:
+        await asyncio.gather(*[fid.put_ts(make_tsc(p, 10 * i)) for i, p in enumerate(pathnames)])
+
+
+def test_concurrent_reads():
+    async def read():
+        async with AsyncOpen(dss_file, mode="r", max_pending=2) as fid:
+            return await asyncio.gather(*[fid.read_ts(p, window=window) for p in pathnames])
+
+    results = asyncio.run(read())
+    for i, ts in enumerate(results):
+        assert np.asarray(ts.values)[0] == 10 * i
+
+
+def test_loop_responsive():
+    # heartbeat of the event loop while many reads of the bundled file are pending
+    interval = 0.005
+
+    async def heartbeat(stop, lags):
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            before = loop.time()
+            await asyncio.sleep(interval)
+            lags.append(loop.time() - before - interval)
+
+    async def run():
+        lags = []
+        stop = asyncio.Event()
+        beat = asyncio.create_task(heartbeat(stop, lags))
+        await asyncio.sleep(0)
+        async with AsyncOpen(sample_file, mode="r", max_pending=4) as fid:
+            calls = []
+            for _ in range(20):
+                calls.append(fid.read_ts("/REGULAR/TIMESERIES/FLOW//1HOUR/Ex1/"))
+                calls.append(fid.read_ts("/IRREGULAR/TIMESERIES/FLOW//IR-DECADE/Ex3/", regular=False))
+                calls.append(fid.read_pd("/PAIRED/DATA/FREQ-FLOW///Ex5/"))
+            results = await asyncio.gather(*calls)
+        stop.set()
+        await beat
+        return results, lags
+
+    results, lags = asyncio.run(run())
+    assert all(result is not None for result in results)
+    assert lags and max(lags) < 0.05, max(lags)
+
+
+def test_shared_worker():
+    async def run():
+        async with AsyncOpen(dss_file, mode="r") as fid1, AsyncOpen(dss_file, mode="r") as fid2:
+            assert fid1._worker is fid2._worker
+            async with AsyncOpen(dss_file, version=7, mode="r") as fid3:
+                # a different version gets its own handle
+                assert fid3._worker is not fid1._worker
+                assert len(_workers) == 2
+        assert not _workers
+
+    asyncio.run(run())
+
+
+def test_not_opened():
+    async def run():
+        fid = AsyncOpen(dss_file, mode="r")
+        try:
+            await fid.read_ts(pathnames[0])
+        except RuntimeError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+
+
+if __name__ == "__main__":
+    asyncio.run(write_records())
+    for test in [test_concurrent_reads, test_loop_responsive, test_shared_worker, test_not_opened]:
+        test()
+        print("Passed %s" % test.__name__)
@@ -0,0 +1,91 @@
+"""
+Test of DssHandlePool
+"""
+
+import os
+import tempfile
+import threading
+import numpy as np
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.heclib.dss.pool import DssHandlePool
+from pydsstools.core import TimeSeriesContainer
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test12.dss")
+window = ("01JAN2020 01:00", "01JAN2020 10:00")
+
+
+def write_record(pathname, offset=0):
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2020 01:00"
+    tsc.numberValues = 10
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    tsc.values = np.arange(10, dtype=np.float32) + offset
+    with Open(dss_file) as fid:
+        fid.put_ts(tsc)
+
+
+def test_shared_handle():
+    with DssHandlePool() as pool:
+        fids = []
+
+        def acquire():
+            fids.append(pool.acquire(dss_file))
+
+        threads = [threading.Thread(target=acquire) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # one handle for all the threads, duplicate opens are closed
+        assert len(set(map(id, fids))) == 1
+        assert pool.info().in_use == 1
+        for fid in fids:
+            pool.release(fid)
+        with pool.open(dss_file) as fid:
+            assert fid is fids[0]
+        info = pool.info()
+    assert info.handles == 1 and info.in_use == 0 and info.hits >= 1
+
+
+def test_reopen_on_external_change():
+    pathname = "/TEST12/CHANGE/FLOW//1HOUR/OBS/"
+    with DssHandlePool() as pool:
+        fid = pool.acquire(dss_file)
+        write_record(pathname, 100)
+        # read-only handle in use is replaced, the old one closes on release
+        with pool.open(dss_file) as fid2:
+            assert fid2 is not fid
+            ts = fid2.read_ts(pathname, window=window)
+            assert np.asarray(ts.values)[0] == 100
+        pool.release(fid)
+        assert pool.info().reopens == 1
+
+
+def test_lru_limit():
+    with DssHandlePool(max_handles=1) as pool:
+        with pool.open(dss_file, mode="r"):
+            pass
+        with pool.open(dss_file, mode="rw"):
+            pass
+        info = pool.info()
+    assert info.handles == 1 and info.evictions == 1
+
+
+def test_release_unknown():
+    with DssHandlePool() as pool, Open(dss_file, mode="r") as fid:
+        try:
+            pool.release(fid)
+        except Exception:
+            pass
+        else:
+            raise AssertionError("release of handle not from the pool did not fail")
+
+
+if __name__ == "__main__":
+    write_record("/TEST12/INIT/FLOW//1HOUR/OBS/")
+    for test in [test_shared_handle, test_reopen_on_external_change, test_lru_limit, test_release_unknown]:
+        test()
+        print("Passed %s" % test.__name__)
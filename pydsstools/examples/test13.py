@@ -0,0 +1,52 @@
+"""
+Test of Open.put_pd_columns
+"""
+
+import os
+import tempfile
+import numpy as np
+from pydsstools.heclib.dss.HecDss import Open
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test13.dss")
+pathname = "/TEST13/PREALLOCATED/FREQ-FLOW///OBS/"
+rows = 10
+curves = 6
+
+
+def preallocate():
+    with Open(dss_file) as fid:
+        fid.preallocate_pd((rows, curves), pathname=pathname, label_size=12)
+
+
+def test_runs_and_values():
+    columns = {2: np.full(rows, 2.0), 3: np.full(rows, 3.0), 5: np.ones((rows, 2)) * 5}
+    with Open(dss_file) as fid:
+        # runs 2-3 and 5-6
+        assert fid.put_pd_columns(pathname, columns) == 2
+        df = fid.read_pd(pathname)
+    assert (df.iloc[:, 1] == 2).all() and (df.iloc[:, 2] == 3).all()
+    assert (df.iloc[:, 4] == 5).all() and (df.iloc[:, 5] == 5).all()
+
+
+def test_partial_labels():
+    columns = {1: np.zeros(rows), 2: np.zeros(rows), 3: np.zeros(rows)}
+    with Open(dss_file) as fid:
+        # the curve with new label is stored apart from the others
+        assert fid.put_pd_columns(pathname, columns, labels={2: "Curve B"}) == 3
+        labels = fid.pd_header(pathname)["labels"]
+    assert labels[1] == "Curve B"
+    # labels of curves not in labels are kept
+    assert labels[0] == "1" and labels[2] == "3"
+
+
+def test_invalid_curve():
+    with Open(dss_file) as fid:
+        assert fid.put_pd_columns(pathname, {curves + 1: np.zeros(rows)}) is None
+        assert fid.put_pd_columns(pathname, {1: np.zeros(rows + 1)}) is None
+
+
+if __name__ == "__main__":
+    preallocate()
+    for test in [test_runs_and_values, test_partial_labels, test_invalid_curve]:
+        test()
+        print("Passed %s" % test.__name__)
@@ -0,0 +1,97 @@
+"""
+Test of RatingTable
+"""
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.heclib.dss.rating import RatingTable
+from pydsstools.core import PairedDataContainer, UNDEFINED
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test14.dss")
+rating_pathname = "/TEST14/GAGE/STAGE-FLOW///RATING/"
+stage_pathname = "/TEST14/GAGE/STAGE//1HOUR/OBS/"
+flow_pathname = "/TEST14/GAGE/FLOW//1HOUR/COMPUTED/"
+
+
+def write_records():
+    pdc = PairedDataContainer()
+    pdc.pathname = rating_pathname
+    pdc.independent_axis = np.array([1, 2, 3, 4], dtype=np.float32)
+    pdc.curves = np.array([[10, 20, 30, 40]], dtype=np.float32)
+    pdc.data_no = 4
+    pdc.curve_no = 1
+    pdc.independent_units = "ft"
+    pdc.dependent_units = "cfs"
+    pdc.labels_list = ["Rating"]
+    index = pd.date_range("2020-01-01 01:00", periods=4, freq="h")
+    stage = pd.Series([1.5, 2.5, np.nan, 3.5], index=index)
+    with Open(dss_file) as fid:
+        fid.put_pd(pdc)
+        fid.put_series(stage, stage_pathname, units="ft")
+
+
+def test_apply():
+    rating = RatingTable([1, 2, 3], [10, 20, 40])
+    out = rating.apply([[1, 1.5], [2.5, 5]])
+    assert out.shape == (2, 2)
+    assert np.allclose(out[0], [10, 15]) and out[1, 0] == 30
+    # outside the ordinates
+    assert np.isnan(out[1, 1])
+    extrapolated = RatingTable([1, 2, 3], [10, 20, 40], extrapolate=True)
+    assert extrapolated.apply([4])[0] == 60
+
+
+def test_missing_values():
+    curve = np.array([0, 10, UNDEFINED, 30, 40], dtype=np.float32)
+    rating = RatingTable([1, 2, 3, 4, 5], curve)
+    # monotonic on the values that are not missing
+    assert rating.increasing[0]
+    out = rating.apply([1.5, 2.5])
+    assert out[0] == 5 and np.isnan(out[1])
+
+
+def test_inverse():
+    rating = RatingTable([1, 2, 3], [10, 20, 40])
+    assert np.allclose(rating.inverse([15, 30]), [1.5, 2.5])
+    decreasing = RatingTable([1, 2, 3], [40, 20, 10])
+    assert np.allclose(decreasing.inverse([30]), [1.5])
+    try:
+        RatingTable([1, 2, 3], [10, 30, 20]).inverse([15])
+    except Exception:
+        pass
+    else:
+        raise AssertionError("inverse of non-monotonic curve did not fail")
+
+
+def test_family():
+    rating = RatingTable([1, 2, 3], [[1, 2], [2, 4], [3, 6]], params=[0, 1])
+    assert np.allclose(rating.apply([1.5, 2], param=[0.5, 1]), [2.25, 4])
+    assert np.allclose(rating.apply([2], param=0), [2])
+
+
+def test_log():
+    rating = RatingTable([1, 10, 100], [1, 100, 10000], log=True)
+    assert np.allclose(rating.apply([5]), [25])
+    assert np.allclose(rating.inverse([25]), [5])
+
+
+def test_apply_ts():
+    with Open(dss_file) as fid:
+        rating = RatingTable.from_dss(fid, rating_pathname)
+        assert rating.labels == ["Rating"] and rating.dependent_units == "cfs"
+        ts = rating.apply_ts(fid, stage_pathname, flow_pathname)
+        assert ts is not None
+        flow = fid.read_ts(flow_pathname, window=("01JAN2020 01:00", "01JAN2020 04:00"), as_pandas=True)
+    assert np.allclose(flow.values[[0, 1, 3]], [15, 25, 35])
+    # missing stays missing
+    assert np.isnan(flow.values[2])
+
+
+if __name__ == "__main__":
+    write_records()
+    for test in [test_apply, test_missing_values, test_inverse, test_family, test_log, test_apply_ts]:
+        test()
+        print("Passed %s" % test.__name__)
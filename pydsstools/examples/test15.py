@@ -0,0 +1,85 @@
+"""
+Test of calendar aware regular time-series times (nptimes, pytimes)
+"""
+
+import os
+import tempfile
+import numpy as np
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import TimeSeriesContainer, getRegularDatetime64
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test15.dss")
+
+DAY = 86400
+
+
+def dates(*values):
+    return np.array(values, dtype="datetime64[s]")
+
+
+def write_record(pathname, start, interval, count):
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = start
+    tsc.numberValues = count
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = interval
+    tsc.values = np.arange(count, dtype=np.float32)
+    with Open(dss_file) as fid:
+        fid.put_ts(tsc)
+
+
+def test_month():
+    # 31JAN2000 24:00 is followed by 29FEB2000 24:00
+    times = getRegularDatetime64("31JAN2000 24:00", 30 * DAY, 4)
+    expected = dates("2000-02-01", "2000-03-01", "2000-04-01", "2000-05-01")
+    assert np.array_equal(times, expected)
+    # month end stays at month end
+    times = getRegularDatetime64(np.datetime64("2000-01-31T00:00"), 30 * DAY, 3)
+    assert np.array_equal(times, dates("2000-01-31", "2000-02-29", "2000-03-31"))
+
+
+def test_semi_month():
+    # 24:00 of the 15th and of the month end
+    times = getRegularDatetime64("15JAN2000 24:00", 15 * DAY, 4)
+    expected = dates("2000-01-16", "2000-02-01", "2000-02-16", "2000-03-01")
+    assert np.array_equal(times, expected)
+
+
+def test_tri_month():
+    times = getRegularDatetime64("10JAN2000 24:00", 10 * DAY, 5)
+    expected = dates("2000-01-11", "2000-01-21", "2000-02-01", "2000-02-11", "2000-02-21")
+    assert np.array_equal(times, expected)
+
+
+def test_year():
+    times = getRegularDatetime64("31DEC1999 24:00", 365 * DAY, 3)
+    assert np.array_equal(times, dates("2000-01-01", "2001-01-01", "2002-01-01"))
+
+
+def test_day_24_00():
+    times = getRegularDatetime64("01JAN2000 24:00", DAY, 2)
+    assert np.array_equal(times, dates("2000-01-02", "2000-01-03"))
+
+
+def test_record_times():
+    pathname = "/TEST15/MONTHLY/FLOW//1MON/OBS/"
+    write_record(pathname, "31JAN2000 24:00", 30 * DAY, 4)
+    with Open(dss_file, mode="r") as fid:
+        ts = fid.read_ts(pathname, window=("31JAN2000 24:00", "30APR2000 24:00"))
+    expected = dates("2000-02-01", "2000-03-01", "2000-04-01", "2000-05-01")
+    assert np.array_equal(ts.nptimes, expected)
+    assert ts.pytimes == expected.tolist()
+
+    pathname = "/TEST15/DAILY/FLOW//1DAY/OBS/"
+    write_record(pathname, "01JAN2000 24:00", DAY, 3)
+    with Open(dss_file, mode="r") as fid:
+        ts = fid.read_ts(pathname, window=("01JAN2000 24:00", "03JAN2000 24:00"))
+    assert np.array_equal(ts.nptimes, dates("2000-01-02", "2000-01-03", "2000-01-04"))
+
+
+if __name__ == "__main__":
+    for test in [test_month, test_semi_month, test_tri_month, test_year, test_day_24_00, test_record_times]:
+        test()
+        print("Passed %s" % test.__name__)
@@ -0,0 +1,94 @@
+"""
+Test of ParallelReader on sample_dss/example.dss
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.heclib.dss import parallel
+from pydsstools.heclib.dss.parallel import ParallelReader
+
+sample_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_dss", "example.dss")
+folder = tempfile.mkdtemp()
+# copies, so that the workers read several files
+dss_files = [os.path.join(folder, "example_%d.dss" % i) for i in range(3)]
+records = [
+    ("/REGULAR/TIMESERIES/FLOW//1HOUR/Ex1/", True),
+    ("/IRREGULAR/TIMESERIES/FLOW//IR-DECADE/Ex3/", False),
+]
+
+
+def copy_files():
+    for dss_file in dss_files:
+        shutil.copy(sample_file, dss_file)
+
+
+def read_serial(pathname, regular):
+    with Open(sample_file, mode="r") as fid:
+        return fid.read_ts(pathname, regular=regular, trim_missing=False, as_pandas=True)
+
+
+def test_same_as_serial():
+    with ParallelReader(max_workers=2, max_in_flight=2) as reader:
+        for pathname, regular in records:
+            expected = read_serial(pathname, regular)
+            results, errors = reader.read_ts(dss_files, pathname, regular=regular)
+            assert not errors, errors
+            assert sorted(results) == sorted(dss_files)
+            for series in results.values():
+                assert series.index.equals(expected.index)
+                assert np.array_equal(series.values, expected.values, equal_nan=True)
+
+
+def test_shared_memory_block():
+    times = np.array(["2020-01-01T01:00", "2020-01-01T02:00"], dtype="datetime64[ns]")
+    values = np.array([1.5, np.nan])
+    name = parallel._to_shared_memory(times, values)
+    block = parallel._worker_blocks[name]
+    # the data starts after the header, the first byte is the released flag
+    assert block.buf[0] == 0
+    out_times, out_values = parallel._from_shared_memory(
+        name, [((2,), times.dtype.str), ((2,), values.dtype.str)]
+    )
+    assert np.array_equal(out_times, times)
+    assert np.array_equal(out_values, values, equal_nan=True)
+    assert block.buf[0] == 1
+    # released blocks are closed at the next copy
+    parallel._close_worker_blocks()
+    assert name not in parallel._worker_blocks
+    # empty arrays need no block
+    assert parallel._to_shared_memory(np.empty(0)) is None
+
+
+def _failing_result(pathname, result):
+    parallel._ts_result(pathname, result)
+    raise ValueError("could not build result")
+
+
+def test_errors():
+    missing = "/REGULAR/TIMESERIES/NOWHERE//1HOUR/Ex1/"
+    with ParallelReader(max_workers=2) as reader:
+        # the record is missing, the worker task fails
+        results, errors = reader.read_ts(dss_files, missing)
+        assert not results and sorted(errors) == sorted(dss_files)
+        # the result of the task cannot be built in this process
+        items = list(
+            reader._imap(
+                dss_files[:1], parallel._read_ts_task, _failing_result,
+                records[0][0], None, False, True,
+            )
+        )
+        assert len(items) == 1 and isinstance(items[0][2], ValueError)
+
+
+if __name__ == "__main__":
+    copy_files()
+    try:
+        for test in [test_same_as_serial, test_shared_memory_block, test_errors]:
+            test()
+            print("Passed %s" % test.__name__)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
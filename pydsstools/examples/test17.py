@@ -0,0 +1,99 @@
+"""
+Test of read_ts(out=..., out_times=...) and TimeSeriesStruct.copy_to
+"""
+
+import os
+import tempfile
+import numpy as np
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import TimeSeriesContainer, UNDEFINED
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test17.dss")
+pathname = "/TEST17/OUT/FLOW//1HOUR/OBS/"
+window = ("01JAN2020 01:00", "01JAN2020 10:00")
+values = np.arange(10, dtype=np.float32)
+values[4] = UNDEFINED
+
+
+def write_record():
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2020 01:00"
+    tsc.numberValues = 10
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    tsc.values = values
+    with Open(dss_file) as fid:
+        fid.put_ts(tsc)
+
+
+def check_row(row):
+    assert np.isnan(row[4])
+    assert np.array_equal(np.delete(row[:10], 4), np.delete(values, 4))
+    # elements after the last value
+    assert np.isnan(row[10:]).all()
+
+
+def test_out_row():
+    data = np.full((2, 12), -1, dtype=np.float32)
+    row = data[1]
+    with Open(dss_file, mode="r") as fid:
+        count = fid.read_ts(pathname, window=window, out=row)
+    assert count == 10
+    # filled in place, the other row is not touched
+    assert row.base is data and np.shares_memory(row, data)
+    check_row(data[1])
+    assert (data[0] == -1).all()
+
+
+def test_out_strided_double():
+    data = np.zeros((12, 3), dtype=np.float64)
+    times = np.empty(12, dtype="datetime64[s]")
+    with Open(dss_file, mode="r") as fid:
+        count = fid.read_ts(pathname, window=window, out=data[:, 1], out_times=times)
+    assert count == 10
+    check_row(data[:, 1])
+    assert (data[:, 0] == 0).all() and (data[:, 2] == 0).all()
+    assert times[0] == np.datetime64("2020-01-01T01:00")
+    assert times[9] == np.datetime64("2020-01-01T10:00")
+
+
+def test_copy_to_int_times():
+    with Open(dss_file, mode="r") as fid:
+        ts = fid.read_ts(pathname, window=window)
+    out = np.empty(10, dtype=np.float32)
+    times = np.zeros(10, dtype=np.int32)
+    assert ts.copy_to(out, times) == 10
+    # times in granularity units, one interval apart
+    assert (np.diff(times) == np.diff(times)[0]).all() and np.diff(times)[0] > 0
+
+
+def test_invalid_out():
+    with Open(dss_file, mode="r") as fid:
+        ts = fid.read_ts(pathname, window=window)
+    for out, times in [
+        (np.empty(5, dtype=np.float32), None),  # too small
+        (np.empty(10, dtype=np.int32), None),  # wrong dtype
+        (np.empty(10, dtype=np.float32), np.empty(5, dtype="datetime64[s]")),
+    ]:
+        try:
+            ts.copy_to(out, times)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("copy_to accepted invalid output array")
+    with Open(dss_file, mode="r") as fid:
+        try:
+            fid.read_ts(pathname, window=window, out=np.empty(5, dtype=np.float64))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("read_ts accepted too small output array")
+
+
+if __name__ == "__main__":
+    write_record()
+    for test in [test_out_row, test_out_strided_double, test_copy_to_int_times, test_invalid_out]:
+        test()
+        print("Passed %s" % test.__name__)
@@ -0,0 +1,75 @@
+"""
+Test of irregular time-series write with numpy datetime64 times
+"""
+
+import os
+import tempfile
+import numpy as np
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import TimeSeriesContainer, ArgumentException
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test18.dss")
+
+
+def make_tsc(pathname, times, values, granularity=60):
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.interval = -1
+    tsc.granularity = granularity
+    tsc.numberValues = len(values)
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.times = np.array(times, dtype="datetime64[s]")
+    tsc.values = np.array(values, dtype=np.float64)
+    return tsc
+
+
+def read_back(pathname, window):
+    with Open(dss_file, mode="r") as fid:
+        series = fid.read_ts(pathname, window=window, regular=False, as_pandas=True)
+    return series.index.values.astype("datetime64[s]"), series.values
+
+
+def test_across_base_day():
+    pathname = "/TEST18/BASE-DAY/FLOW//IR-MONTH/OBS/"
+    # unsorted, the minimum date (base day) is 15JAN2020
+    times = ["2020-01-16T02:00", "2020-01-15T23:00", "2020-01-16T00:30"]
+    tsc = make_tsc(pathname, times, [3.0, 1.0, 2.0])
+    with Open(dss_file) as fid:
+        assert fid.put_ts(tsc) is not None
+    # container is not modified
+    assert tsc.times[0] == np.datetime64("2020-01-16T02:00")
+    out_times, out_values = read_back(pathname, ("15JAN2020 00:00", "17JAN2020 00:00"))
+    assert np.array_equal(out_times, np.sort(np.array(times, dtype="datetime64[s]")))
+    assert np.array_equal(out_values, [1.0, 2.0, 3.0])
+
+
+def test_second_granularity():
+    pathname = "/TEST18/SECONDS/FLOW//IR-DAY/OBS/"
+    times = ["2020-01-15T23:59:59", "2020-01-16T00:00:01", "2020-01-16T00:00:30"]
+    tsc = make_tsc(pathname, times, [1.5, 2.5, 3.5], granularity=1)
+    with Open(dss_file) as fid:
+        assert fid.put_ts(tsc) is not None
+    out_times, out_values = read_back(pathname, ("15JAN2020 23:00", "16JAN2020 01:00"))
+    assert np.array_equal(out_times, np.array(times, dtype="datetime64[s]"))
+    assert np.array_equal(out_values, [1.5, 2.5, 3.5])
+
+
+def test_length_mismatch():
+    pathname = "/TEST18/MISMATCH/FLOW//IR-MONTH/OBS/"
+    tsc = make_tsc(pathname, ["2020-01-15T23:00", "2020-01-16T00:30"], [1.0, 2.0])
+    tsc.times = np.array(["2020-01-15T23:00", "2020-01-16T00:30", "2020-01-16T01:00"],
+                         dtype="datetime64[s]")
+    with Open(dss_file) as fid:
+        try:
+            fid.put_ts(tsc)
+        except ArgumentException:
+            pass
+        else:
+            raise AssertionError("put_ts accepted times and values of different length")
+
+
+if __name__ == "__main__":
+    for test in [test_across_base_day, test_second_granularity, test_length_mismatch]:
+        test()
+        print("Passed %s" % test.__name__)
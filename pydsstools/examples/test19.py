@@ -0,0 +1,73 @@
+"""
+Test of TimeSeriesContainer value buffers
+"""
+
+import os
+import tempfile
+import numpy as np
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import TimeSeriesContainer
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test19.dss")
+window = ("01JAN2020 01:00", "01JAN2020 05:00")
+
+
+def make_tsc(pathname, values):
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2020 01:00"
+    tsc.numberValues = len(values)
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    tsc.values = values
+    return tsc
+
+
+def test_read_only_buffer():
+    values = np.arange(5, dtype=np.float32)
+    values.flags.writeable = False
+    pathname = "/TEST19/READONLY/FLOW//1HOUR/OBS/"
+    with Open(dss_file) as fid:
+        assert fid.put_ts(make_tsc(pathname, values)) is not None
+        ts = fid.read_ts(pathname, window=window)
+    assert np.array_equal(np.asarray(ts.values), values)
+
+
+def test_converted_values():
+    # lists and float64 are converted, reusing the scratch array of the container
+    tsc = make_tsc("/TEST19/CONVERTED/FLOW//1HOUR/OBS/", [1.0, 2.0, 3.0, 4.0, 5.0])
+    with Open(dss_file) as fid:
+        first = fid.put_ts(tsc)
+        # the struct of the first write still points at the converted values
+        tsc.values = np.full(5, 9.0)
+        second = fid.put_ts(tsc)
+        assert list(np.asarray(first.values)) == [1, 2, 3, 4, 5]
+        assert list(np.asarray(second.values)) == [9] * 5
+        del first, second
+        # nothing points at them anymore
+        tsc.values = [7.0] * 5
+        fid.put_ts(tsc)
+        ts = fid.read_ts(tsc.pathname, window=window)
+    assert list(np.asarray(ts.values)) == [7] * 5
+
+
+def test_times_overflow():
+    tsc = TimeSeriesContainer()
+    tsc.pathname = "/TEST19/OVERFLOW/FLOW//IR-MONTH/OBS/"
+    tsc.interval = -1
+    tsc.numberValues = 2
+    tsc.times = np.array([0, 2 ** 40], dtype=np.int64)
+    tsc.values = np.array([1.0, 2.0])
+    try:
+        tsc.setValues()
+    except OverflowError:
+        pass
+    else:
+        raise AssertionError("times out of int32 range were accepted")
+
+
+if __name__ == "__main__":
+    for test in [test_read_only_buffer, test_converted_values, test_times_overflow]:
+        test()
+        print("Passed %s" % test.__name__)
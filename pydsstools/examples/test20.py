@@ -0,0 +1,65 @@
+"""
+Test of double precision paired data
+"""
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from pydsstools.heclib.dss.HecDss import Open
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test20.dss")
+pathname = "/TEST20/DOUBLE/FREQ-FLOW///OBS/"
+rows = 6
+# values that float32 can not hold exactly
+ordinates = np.linspace(0.1, 0.6, rows) + 1e-9
+frame = pd.DataFrame(
+    {"A": np.arange(rows) / 3.0, "B": np.full(rows, 1 + 1e-12), "C": np.sqrt(np.arange(rows) + 2.0)},
+    index=ordinates,
+)
+
+
+def write_record():
+    with Open(dss_file) as fid:
+        fid.put_pd(frame, pathname=pathname)
+
+
+def read_record():
+    with Open(dss_file, mode="r") as fid:
+        return fid.read_pd(pathname, dtype=np.float64)
+
+
+def test_round_trip():
+    df = read_record()
+    with Open(dss_file, mode="r") as fid:
+        assert fid.pd_info(pathname)["dtype"] == "double"
+    assert df.values.dtype == np.float64
+    assert np.array_equal(df.index.values, frame.index.values)
+    assert np.array_equal(df.values, frame.values)
+
+
+def test_put_one_curve():
+    curve = np.arange(rows) / 7.0
+    with Open(dss_file) as fid:
+        fid.put_pd(curve, 2, pathname=pathname)
+    df = read_record()
+    assert np.array_equal(df.values[:, 1], curve)
+    # the other curves keep full precision
+    assert np.array_equal(df.values[:, [0, 2]], frame.values[:, [0, 2]])
+
+
+def test_put_columns():
+    curve = np.arange(rows) / 9.0
+    with Open(dss_file) as fid:
+        assert fid.put_pd_columns(pathname, {3: curve}, window=(1, rows)) == 1
+    df = read_record()
+    assert np.array_equal(df.values[:, 2], curve)
+    assert np.array_equal(df.values[:, 0], frame.values[:, 0])
+    assert np.array_equal(df.index.values, frame.index.values)
+
+
+if __name__ == "__main__":
+    write_record()
+    for test in [test_round_trip, test_put_one_curve, test_put_columns]:
+        test()
+        print("Passed %s" % test.__name__)
@@ -0,0 +1,82 @@
+"""
+Test of Open.read_ts_many
+"""
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import TimeSeriesContainer, UNDEFINED
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test4.dss")
+pathnames = ["/TEST4/LOC%d/FLOW//1HOUR/OBS/" % i for i in range(3)]
+window = ("01JAN2020 01:00", "01JAN2020 10:00")
+
+
+def write_records():
+    with Open(dss_file) as fid:
+        for i, pathname in enumerate(pathnames):
+            tsc = TimeSeriesContainer()
+            tsc.pathname = pathname
+            tsc.startDateTime = "01JAN2020 01:00"
+            tsc.numberValues = 10
+            tsc.units = "cfs"
+            tsc.type = "INST"
+            tsc.interval = 1
+            values = np.arange(10, dtype=np.float32) + 100 * i
+            values[5] = UNDEFINED
+            tsc.values = values
+            fid.put_ts(tsc)
+
+
+def test_read_all():
+    with Open(dss_file, mode="r") as fid:
+        results, errors = fid.read_ts_many(pathnames, window=window)
+    assert not errors, errors
+    assert list(results) == pathnames
+    for i, pathname in enumerate(pathnames):
+        values = np.asarray(results[pathname].values)
+        assert len(values) == 10
+        assert values[0] == 100 * i and values[9] == 100 * i + 9
+
+
+def test_errors_per_pathname():
+    missing = "/TEST4/NOWHERE/FLOW//1HOUR/OBS/"
+    invalid = "not/a/pathname"
+    with Open(dss_file, mode="r") as fid:
+        results, errors = fid.read_ts_many([pathnames[0], missing, invalid, pathnames[1]])
+    # the failed records do not stop the others
+    assert set(results) == {pathnames[0], pathnames[1]}
+    assert set(errors) == {missing, invalid}
+
+
+def test_as_pandas():
+    with Open(dss_file, mode="r") as fid:
+        results, errors = fid.read_ts_many(pathnames, window=window, as_pandas=True)
+    series = results[pathnames[2]]
+    assert isinstance(series, pd.Series)
+    assert isinstance(series.index, pd.DatetimeIndex)
+    assert series.index[0] == pd.Timestamp("2020-01-01 01:00")
+    assert np.isnan(series.iloc[5])
+    assert series.iloc[6] == 206
+
+
+def test_wide():
+    with Open(dss_file, mode="r") as fid:
+        df, errors = fid.read_ts_many(pathnames, window=window, wide=True)
+    assert isinstance(df, pd.DataFrame)
+    assert list(df.columns) == pathnames
+    assert df.shape == (10, 3)
+
+
+if __name__ == "__main__":
+    write_records()
+    for test in [
+        test_read_all,
+        test_errors_per_pathname,
+        test_as_pandas,
+        test_wide,
+    ]:
+        test()
+        print("Passed %s" % test.__name__)
@@ -0,0 +1,67 @@
+"""
+Test of Open.iter_ts chunked reads
+"""
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import TimeSeriesContainer
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test5.dss")
+pathname = "/TEST5/ITER/FLOW//1HOUR/OBS/"
+# three monthly blocks of 1HOUR data
+window = ("01JAN2020 01:00", "31MAR2020 24:00")
+number_values = (31 + 29 + 31) * 24
+
+
+def write_record():
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2020 01:00"
+    tsc.numberValues = number_values
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    tsc.values = np.arange(number_values, dtype=np.float32)
+    with Open(dss_file) as fid:
+        fid.put_ts(tsc)
+
+
+def test_chunks_cover_window():
+    with Open(dss_file, mode="r") as fid:
+        chunks = list(fid.iter_ts(pathname, window))
+    # one chunk per month block
+    assert len(chunks) == 3
+    times = np.concatenate([t for t, _ in chunks])
+    values = np.concatenate([v for _, v in chunks])
+    # the value at the block boundary is not repeated
+    assert len(times) == number_values
+    assert (np.diff(times) > np.timedelta64(0, "s")).all()
+    assert times[0] == np.datetime64("2020-01-01T01:00")
+    assert times[-1] == np.datetime64("2020-04-01T00:00")
+    assert (values == np.arange(number_values)).all()
+
+
+def test_chunk_of_two_blocks():
+    with Open(dss_file, mode="r") as fid:
+        chunks = list(fid.iter_ts(pathname, window, chunk=2, as_pandas=True))
+    assert len(chunks) == 2
+    assert all(isinstance(series, pd.Series) for series in chunks)
+    assert sum(len(series) for series in chunks) == number_values
+
+
+def test_same_as_read_ts():
+    with Open(dss_file, mode="r") as fid:
+        series = pd.concat(list(fid.iter_ts(pathname, window, as_pandas=True)))
+        full = fid.read_ts(pathname, window=window, as_pandas=True)
+    assert series.index.equals(full.index)
+    assert np.array_equal(series.values, full.values)
+
+
+if __name__ == "__main__":
+    write_record()
+    for test in [test_chunks_cover_window, test_chunk_of_two_blocks, test_same_as_read_ts]:
+        test()
+        print("Passed %s" % test.__name__)
@@ -0,0 +1,84 @@
+"""
+Test of the record cache of Open (cache_size)
+"""
+
+import os
+import tempfile
+import time
+import numpy as np
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import TimeSeriesContainer, UNDEFINED
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test6.dss")
+pathname = "/TEST6/CACHE/FLOW//1HOUR/OBS/"
+window = ("01JAN2020 01:00", "01JAN2020 10:00")
+
+
+def make_tsc(offset):
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2020 01:00"
+    tsc.numberValues = 10
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    values = np.arange(10, dtype=np.float32) + offset
+    values[5] = UNDEFINED
+    tsc.values = values
+    return tsc
+
+
+def write_record():
+    with Open(dss_file) as fid:
+        fid.put_ts(make_tsc(0))
+
+
+def test_cache_hit():
+    with Open(dss_file, mode="r", cache_size=1 << 20) as fid:
+        fid.read_ts(pathname, window=window)
+        fid.read_ts(pathname, window=window)
+        info = fid.cache_info()
+    assert info.hits == 1 and info.misses == 1
+
+
+def test_cached_series_are_copies():
+    with Open(dss_file, mode="r", cache_size=1 << 20) as fid:
+        first = fid.read_ts(pathname, window=window, as_pandas=True)
+        first.iloc[0] = -1
+        second = fid.read_ts(pathname, window=window, as_pandas=True)
+        ts = fid.read_ts(pathname, window=window)
+    # nodata is NaN in the series but stays UNDEFINED in the cached struct
+    assert np.isnan(first.iloc[5]) and np.isnan(second.iloc[5])
+    assert second.iloc[0] == 0
+    assert np.asarray(ts.values)[5] == UNDEFINED
+
+
+def test_write_evicts():
+    with Open(dss_file, cache_size=1 << 20) as fid:
+        before = np.asarray(fid.read_ts(pathname, window=window).values).copy()
+        fid.put_ts(make_tsc(100))
+        after = np.asarray(fid.read_ts(pathname, window=window).values)
+        info = fid.cache_info()
+    assert before[0] == 0 and after[0] == 100
+    assert info.hits == 0 and info.entries == 1
+
+
+def test_write_by_other_handle():
+    with Open(dss_file, mode="r", cache_size=1 << 20) as fid:
+        before = np.asarray(fid.read_ts(pathname, window=window).values).copy()
+        # write time of the record is in milliseconds
+        time.sleep(0.01)
+        with Open(dss_file) as other:
+            other.put_ts(make_tsc(200))
+        after = np.asarray(fid.read_ts(pathname, window=window).values)
+        info = fid.cache_info()
+    assert before[0] != 200 and after[0] == 200
+    assert info.hits == 0 and info.misses == 2
+
+
+if __name__ == "__main__":
+    write_record()
+    for test in [test_cache_hit, test_cached_series_are_copies, test_write_evicts,
+                 test_write_by_other_handle]:
+        test()
+        print("Passed %s" % test.__name__)
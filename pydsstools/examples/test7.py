@@ -0,0 +1,68 @@
+"""
+Test of Open.put_series
+"""
+
+import gc
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import UNDEFINED
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test7.dss")
+window = ("01JAN2020 01:00", "01JAN2020 10:00")
+
+
+def make_series():
+    index = pd.date_range("2020-01-01 01:00", periods=10, freq="h")
+    series = pd.Series(np.arange(10, dtype=np.float64), index=index)
+    series.iloc[3] = np.nan
+    return series
+
+
+def test_round_trip():
+    pathname = "/TEST7/SERIES/FLOW//1HOUR/OBS/"
+    series = make_series()
+    with Open(dss_file) as fid:
+        fid.put_series(series, pathname, units="cfs")
+        result = fid.read_ts(pathname, window=window, as_pandas=True)
+    assert result.index.equals(series.index)
+    assert np.isnan(result.iloc[3])
+    assert np.array_equal(result.values[4:], series.values[4:])
+    # the Series is not modified
+    assert np.isnan(series.iloc[3])
+
+
+def test_epart_inferred():
+    pathname = "/TEST7/SERIES/STAGE///OBS/"
+    with Open(dss_file) as fid:
+        fid.put_series(make_series(), pathname)
+        ts = fid.read_ts("/TEST7/SERIES/STAGE//1HOUR/OBS/", window=window)
+    assert ts.numberValues == 10
+
+
+def test_returned_struct():
+    pathname = "/TEST7/RETURNED/FLOW//1HOUR/OBS/"
+    with Open(dss_file) as fid:
+        ts = fid.put_series(make_series(), pathname)
+    # the struct keeps the written values alive
+    gc.collect()
+    values = np.asarray(ts.values)
+    assert len(values) == 10
+    assert values[3] == UNDEFINED and values[9] == 9
+
+
+def test_invalid_series():
+    index = pd.DatetimeIndex(["2020-01-01 01:00", "2020-01-01 02:00", "2020-01-01 04:00"])
+    series = pd.Series([1.0, 2.0, 3.0], index=index)
+    with Open(dss_file) as fid:
+        # irregular spacing and E-part not matching the spacing
+        assert fid.put_series(series, "/TEST7/BAD/FLOW//1HOUR/OBS/") is None
+        assert fid.put_series(make_series(), "/TEST7/BAD/FLOW//1DAY/OBS/") is None
+
+
+if __name__ == "__main__":
+    for test in [test_round_trip, test_epart_inferred, test_returned_struct, test_invalid_series]:
+        test()
+        print("Passed %s" % test.__name__)
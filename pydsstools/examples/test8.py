@@ -0,0 +1,108 @@
+"""
+Test of Open.put_ts_many
+"""
+
+import os
+import logging
+import tempfile
+import numpy as np
+import pandas as pd
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import TimeSeriesContainer
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test8.dss")
+window = ("01JAN2020 01:00", "01JAN2020 10:00")
+
+
+def make_tsc(pathname, offset):
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2020 01:00"
+    tsc.numberValues = 10
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    tsc.values = np.arange(10, dtype=np.float32) + offset
+    return tsc
+
+
+def test_containers_and_series():
+    containers = [make_tsc("/TEST8/LOC%d/FLOW//1HOUR/OBS/" % i, 10 * i) for i in range(3)]
+    index = pd.date_range("2020-01-01 01:00", periods=10, freq="h")
+    series = pd.Series(np.ones(10), index=index, name="/TEST8/SERIES/FLOW//1HOUR/OBS/")
+    with Open(dss_file) as fid:
+        status, errors = fid.put_ts_many(containers + [series])
+        assert not errors, errors
+        assert (status == 0).all() and len(status) == 4
+        values = np.asarray(fid.read_ts(containers[2].pathname, window=window).values)
+        assert values[0] == 20
+        values = np.asarray(fid.read_ts(series.name, window=window).values)
+        assert (values == 1).all()
+    # the start date of the containers is not modified
+    assert all(tsc.startDateTime == "01JAN2020 01:00" for tsc in containers)
+
+
+def test_errors_per_item():
+    good = make_tsc("/TEST8/GOOD/FLOW//1HOUR/OBS/", 0)
+    short = make_tsc("/TEST8/SHORT/FLOW//1HOUR/OBS/", 0)
+    short.numberValues = 20
+    invalid = make_tsc("not/a/pathname", 0)
+    with Open(dss_file) as fid:
+        status, errors = fid.put_ts_many([short, good, invalid])
+        ts = fid.read_ts(good.pathname, window=window)
+    # the failed records do not stop the others
+    assert set(errors) == {0, 2}
+    assert status[1] == 0 and status[0] != 0 and status[2] != 0
+    assert ts.numberValues == 10
+
+
+def put_one(tsc):
+    # outcome of put_ts, True when written
+    with Open(dss_file) as fid:
+        try:
+            return fid.put_ts(tsc) is not None
+        except Exception:
+            return False
+
+
+def test_start_date_as_put_ts():
+    # 24:00 start is normalized the same way by put_ts and put_ts_many
+    one = make_tsc("/TEST8/ONE/FLOW//1HOUR/OBS/", 0)
+    many = make_tsc("/TEST8/MANY/FLOW//1HOUR/OBS/", 0)
+    one.startDateTime = many.startDateTime = "31DEC2019 24:00"
+    assert put_one(one)
+    with Open(dss_file) as fid:
+        status, errors = fid.put_ts_many([many])
+        assert not errors, errors
+        times = [fid.read_ts(tsc.pathname, window=window).nptimes for tsc in (one, many)]
+    assert np.array_equal(times[0], times[1])
+    assert many.startDateTime == "31DEC2019 24:00"
+
+    # start date not parsed is only warned, as in put_ts, and written as it is
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logging.getLogger().addHandler(handler)
+    try:
+        one.startDateTime = many.startDateTime = "2020-13-45"
+        written = put_one(one)
+        with Open(dss_file) as fid:
+            status, errors = fid.put_ts_many([many])
+    finally:
+        logging.getLogger().removeHandler(handler)
+    warnings = [r for r in records if r.levelno == logging.WARNING and "2020-13-45" in r.getMessage()]
+    assert len(warnings) == 2
+    assert written == (0 not in errors)
+    assert many.startDateTime == "2020-13-45"
+
+
+def test_read_only():
+    with Open(dss_file, mode="r") as fid:
+        assert fid.put_ts_many([make_tsc("/TEST8/RO/FLOW//1HOUR/OBS/", 0)]) is None
+
+
+if __name__ == "__main__":
+    for test in [test_containers_and_series, test_errors_per_item, test_start_date_as_put_ts,
+                 test_read_only]:
+        test()
+        print("Passed %s" % test.__name__)
@@ -0,0 +1,74 @@
+"""
+Test of Open.append_ts
+"""
+
+import gc
+import os
+import tempfile
+import numpy as np
+from pydsstools.heclib.dss.HecDss import Open
+from pydsstools.core import TimeSeriesContainer, UNDEFINED
+
+dss_file = os.path.join(tempfile.mkdtemp(), "test9.dss")
+pathname = "/TEST9/APPEND/FLOW//1HOUR/OBS/"
+window = ("01JAN2020 01:00", "02JAN2020 24:00")
+
+
+def write_record():
+    tsc = TimeSeriesContainer()
+    tsc.pathname = pathname
+    tsc.startDateTime = "01JAN2020 01:00"
+    tsc.numberValues = 10
+    tsc.units = "cfs"
+    tsc.type = "INST"
+    tsc.interval = 1
+    tsc.values = np.arange(10, dtype=np.float32)
+    with Open(dss_file) as fid:
+        fid.put_ts(tsc)
+
+
+def test_append_after_last_value():
+    with Open(dss_file) as fid:
+        fid.append_ts(pathname, [10.0, 11.0, np.nan])
+        series = fid.read_ts(pathname, window=window, as_pandas=True).dropna()
+    assert series.index[-1] == np.datetime64("2020-01-01T12:00")
+    assert series.iloc[-1] == 11 and len(series) == 12
+
+
+def test_append_at_start():
+    with Open(dss_file) as fid:
+        # gap after the last value at 12:00
+        assert fid.append_ts(pathname, [20.0, 21.0], start="01JAN2020 20:00") is None
+        ts = fid.append_ts(pathname, [20.0, 21.0], start="01JAN2020 13:00")
+        series = fid.read_ts(pathname, window=window, as_pandas=True)
+    # the returned struct keeps the written values alive
+    gc.collect()
+    assert list(np.asarray(ts.values)) == [20, 21]
+    assert series[np.datetime64("2020-01-01T14:00")] == 21
+    assert series.dropna().index[-1] == np.datetime64("2020-01-01T14:00")
+
+
+def test_invalid_start():
+    with Open(dss_file) as fid:
+        # before the last value, not on the interval, and gap of one interval
+        for start in ["31DEC2019 05:00", "01JAN2020 14:00", "01JAN2020 14:30", "01JAN2020 16:00"]:
+            assert fid.append_ts(pathname, [1.0], start=start) is None
+        assert fid.append_ts(pathname, [1.0], start="10JAN2020 01:00") is None
+        # start is required for new record
+        assert fid.append_ts("/TEST9/NEW/FLOW//1HOUR/OBS/", [1.0]) is None
+
+
+def test_new_record():
+    new = "/TEST9/NEW/FLOW//1HOUR/OBS/"
+    with Open(dss_file) as fid:
+        fid.append_ts(new, [1.0, 2.0], start="01JAN2020 01:00")
+        ts = fid.read_ts(new, window=window)
+    values = np.asarray(ts.values)
+    assert values[0] == 1 and values[1] == 2 and values[2] == UNDEFINED
+
+
+if __name__ == "__main__":
+    write_record()
+    for test in [test_append_after_last_value, test_append_at_start, test_invalid_start, test_new_record]:
+        test()
+        print("Passed %s" % test.__name__)
@@ -4,10 +4,11 @@ Open class object for HEC-DSS file
 
 __all__ = ["Open"]
 
+import os
 import logging
 from copy import copy
 from array import array
-from datetime import datetime
+from datetime import datetime, timedelta
 import numpy as np
 import numpy.ma as ma
 import pandas as pd
@@ -58,15 +59,244 @@ from ...core import (
     PairedDataContainer,
     HecTime,
     DssPathName,
+    DssStatusException,
+    DssPathException,
+    ArgumentException,
     dss_info,
+    getRegularDatetime64,
+    prepare_grid_data,
 )
 from ...heclib.utils import compute_grid_stats, UNDEFINED
+from .cache import RecordCache, CacheInfo
 
 DateLike = TypeVar("DateLike", str, datetime, HecTime)
 DateWindow: TypeAlias = Tuple[DateLike, DateLike]
 PathType: TypeAlias = Union[str, Path, PathLike]
 
 
+def _format_window(window: DateWindow) -> Tuple[str, str, str, str]:
+    """Returns start date, start time, end date and end time strings of the time window
+    as expected by the heclib time-series retrieve functions."""
+    dates = []
+    for date, name in zip(window, ("startdate", "enddate")):
+        if isinstance(date, HecTime):
+            date = date.python_datetime
+        elif isinstance(date, str):
+            date = HecTime.getPyDateTimeFromString(date)
+        elif not isinstance(date, datetime):
+            raise ArgumentException("%s is not string or datetime object" % name)
+        dates.append(date.strftime("%d%b%Y"))
+        dates.append(date.strftime("%H:%M:%S"))
+    return tuple(dates)
+
+
+def _is_datetime64(times: Any) -> bool:
+    """True for numpy datetime64 array or timezone naive pandas DatetimeIndex/Series"""
+    dtype = getattr(times, "dtype", None)
+    return isinstance(dtype, np.dtype) and dtype.kind == "M"
+
+
+def _record_key(pathname: str) -> str:
+    """Pathname without D-part in upper case, same for all the blocks of a record"""
+    parts = str(pathname).upper().split("/")
+    if len(parts) == 8:
+        parts[4] = ""
+    return "/".join(parts)
+
+
+def _dpart_is_empty(pathname: str) -> bool:
+    """True when the date (D) part of the pathname is blank"""
+    parts = pathname.split("/")
+    if len(parts) != 8:
+        # let DssPathName report the invalid pathname
+        parts = [""] + DssPathName(pathname).getParts() + [""]
+    return not parts[4].strip()
+
+
+# DSS-7 block size of time-series records and the E-parts (upper case) stored in them
+_TS_BLOCK_EPARTS = {
+    "DAY": (
+        "1SECOND", "2SECOND", "3SECOND", "4SECOND", "5SECOND", "6SECOND", "10SECOND",
+        "15SECOND", "20SECOND", "30SECOND", "1MINUTE", "2MINUTE", "3MINUTE", "4MINUTE",
+        "5MINUTE", "6MINUTE", "10MINUTE", "12MINUTE", "IR-DAY",
+    ),
+    "MONTH": (
+        "15MINUTE", "20MINUTE", "30MINUTE", "1HOUR", "2HOUR", "3HOUR", "4HOUR",
+        "6HOUR", "8HOUR", "12HOUR", "IR-MONTH",
+    ),
+    "YEAR": ("1DAY", "IR-YEAR"),
+    "DECADE": ("1WEEK", "TRI-MONTH", "SEMI-MONTH", "1MONTH", "IR-DECADE"),
+    "CENTURY": ("1YEAR", "IR-CENTURY"),
+}
+_TS_BLOCK_SIZES = {
+    epart: block for block, eparts in _TS_BLOCK_EPARTS.items() for epart in eparts
+}
+
+
+# Interval seconds (as in TimeSeriesStruct.interval) of the regular time-series E-parts
+_TS_INTERVAL_SECONDS = {
+    "1Second": 1, "2Second": 2, "3Second": 3, "4Second": 4, "5Second": 5,
+    "6Second": 6, "10Second": 10, "15Second": 15, "20Second": 20, "30Second": 30,
+    "1Minute": 60, "2Minute": 120, "3Minute": 180, "4Minute": 240, "5Minute": 300,
+    "6Minute": 360, "10Minute": 600, "12Minute": 720, "15Minute": 900,
+    "20Minute": 1200, "30Minute": 1800, "1Hour": 3600, "2Hour": 7200,
+    "3Hour": 10800, "4Hour": 14400, "6Hour": 21600, "8Hour": 28800,
+    "12Hour": 43200, "1Day": 86400, "1Week": 604800, "Tri-Month": 864000,
+    "Semi-Month": 1296000, "1Month": 2592000, "1Year": 31536000,
+}
+
+
+def _infer_interval(
+    times: np.ndarray, memo: Optional[Dict] = None
+) -> Optional[Tuple[str, int]]:
+    """Returns (E-part, interval seconds) for regularly spaced datetime64[s] times,
+    None if the spacing is not a DSS interval. memo dict keeps the expected times
+    for reuse by series with the same start, interval and length."""
+    step = int((times[1] - times[0]).astype(np.int64))
+    days = step // 86400
+    for epart, seconds in _TS_INTERVAL_SECONDS.items():
+        if seconds <= 604800:
+            matched = step == seconds
+        elif epart == "Tri-Month":
+            matched = 8 <= days <= 11
+        elif epart == "Semi-Month":
+            matched = 13 <= days <= 16
+        elif epart == "1Month":
+            matched = 28 <= days <= 31
+        else:
+            matched = 365 <= days <= 366
+        if matched:
+            break
+    else:
+        return None
+
+    key = (times[0], seconds, len(times))
+    expected = memo.get(key) if memo is not None else None
+    if expected is None:
+        # calendar aware times
+        expected = getRegularDatetime64(times[0], seconds, len(times))
+        if memo is not None:
+            memo[key] = expected
+    if np.array_equal(expected, times):
+        return epart, seconds
+    return None
+
+
+def _series_to_container(
+    series: "pd.Series",
+    pathname: str,
+    units: str = "",
+    type: str = "INST",
+    timezone: str = "",
+    memo: Optional[Dict] = None,
+) -> TimeSeriesContainer:
+    """Returns TimeSeriesContainer of regular time-series for the Series,
+    raises ArgumentException when the Series can not be written as regular time-series."""
+    index = series.index
+    if not _is_datetime64(index) or not len(index):
+        raise ArgumentException("Series index must be non-empty timezone naive DatetimeIndex")
+
+    parts = str(pathname).split("/")
+    if len(parts) != 8:
+        raise ArgumentException("Invalid pathname %s" % pathname)
+    epart = parts[5].strip()
+
+    times = np.asarray(index, dtype="datetime64[s]")
+    if len(times) > 1:
+        result = _infer_interval(times, memo)
+        if result is None:
+            raise ArgumentException("Series index is not regularly spaced with DSS interval")
+        inferred, interval = result
+        if not epart:
+            epart = parts[5] = inferred
+        elif epart.upper() != inferred.upper():
+            raise ArgumentException(
+                "E-part %s does not match %s interval of series" % (epart, inferred)
+            )
+    else:
+        intervals = {key.upper(): val for key, val in _TS_INTERVAL_SECONDS.items()}
+        interval = intervals.get(epart.upper())
+        if interval is None:
+            raise ArgumentException("Single value series needs pathname with valid E-part")
+
+    # the only copy of the values, modified in place
+    values = np.array(series.values, dtype=np.float32)
+    values[np.isnan(values)] = UNDEFINED
+
+    tsc = TimeSeriesContainer()
+    tsc.pathname = "/".join(parts)
+    tsc.startDateTime = times[0].item().strftime("%d%b%Y %H:%M:%S")
+    tsc.numberValues = len(values)
+    tsc.interval = interval
+    tsc.units = units
+    tsc.type = type
+    tsc.timezone = timezone
+    tsc.values = values
+    return tsc
+
+
+def _regular_start_date(start: str, granularity: int) -> str:
+    """Start date of regular time-series in the format written to the file. Start date
+    that can not be parsed is returned as it is, with warning."""
+    try:
+        sdate = HecTime(start, granularity)
+    except:
+        logging.warning(
+            "Start datetime of regular time-series ({}) may be incorrect".format(start)
+        )
+        return start
+    return sdate._toString(end_of_day=False)
+
+
+def _next_block_start(date: datetime, block: str, count: int = 1) -> datetime:
+    """Start of the count-th DSS block after the block containing date"""
+    if block == "DAY":
+        start = datetime(date.year, date.month, date.day)
+        return start + timedelta(days=count)
+    if block == "MONTH":
+        months = date.year * 12 + date.month - 1 + count
+        return datetime(months // 12, months % 12 + 1, 1)
+    years = {"YEAR": 1, "DECADE": 10, "CENTURY": 100}[block]
+    return datetime((date.year // years + count) * years, 1, 1)
+
+
+def _ts_block_pathnames(
+    pathname: str, dates: Optional[Tuple[str, str, str, str]]
+) -> Optional[List[str]]:
+    """Pathnames of the DSS blocks covered by the time-series read of the pathname and
+    formatted window, None when they are not known without catalog (blank D-part)"""
+    if dates is None:
+        return None if _dpart_is_empty(pathname) else [pathname]
+    parts = pathname.split("/")
+    block = _TS_BLOCK_SIZES.get(parts[5].strip().upper()) if len(parts) == 8 else None
+    if block is None:
+        return None
+    start = HecTime.getPyDateTimeFromString("%s %s" % dates[:2])
+    end = HecTime.getPyDateTimeFromString("%s %s" % dates[2:])
+    # first day of the block containing start
+    date = _next_block_start(start, block, 0)
+    paths = []
+    while date <= end:
+        parts[4] = date.strftime("%d%b%Y")
+        paths.append("/".join(parts))
+        date = _next_block_start(date, block)
+    return paths
+
+
+def _grid_array_to_write(data: np.ndarray, nodata: float, flipud: bool) -> np.ndarray:
+    """C-contiguous float32 copy of the grid array with nodata, NaN and masked cells set
+    to nodata and rows flipped, made in one pass. Float32 and float64 arrays of any strides
+    are read as they are, other types are converted to float64 first."""
+    mask = None
+    if isinstance(data, ma.core.MaskedArray):
+        mask = ma.getmask(data)
+        mask = None if mask is ma.nomask else np.broadcast_to(mask, data.shape).view(np.uint8)
+        data = data.data
+    if data.dtype != np.float32 and data.dtype != np.float64:
+        data = data.astype(np.float64)
+    return prepare_grid_data(data, mask, nodata, nodata, bool(flipud))
+
+
 class Open(_Open):
     """Open a DSS file and create a dataset object that supports input/output operations.
 
@@ -74,6 +304,13 @@ class Open(_Open):
     enabling manipulation of time series, paired-data and gridded records
     contained within the file.
 
+    The heclib read/write calls release the GIL, so other python threads keep running
+    during the file I/O. The record reads/writes of DSS-7 files on separate Open objects
+    run in parallel (e.g., one Open object per thread of ThreadPoolExecutor); opening,
+    closing and the calls on DSS-6 files are serialized because heclib has process wide
+    state. ParallelReader uses worker processes instead. One Open object must not be used
+    by several threads at the same time, unless it is opened with threadsafe=True.
+
     """
 
     # @validate_call
@@ -82,6 +319,8 @@ class Open(_Open):
         dss_path: PathType,
         version: Optional[Literal[6, 7]] = None,
         mode: Literal["rw", "r"] = "rw",
+        cache_size: int = 0,
+        threadsafe: bool = False,
     ) -> None:
         """
         Parameter
@@ -97,13 +336,30 @@ class Open(_Open):
             Optional string specifying the mode in which the DSS file is opened.
             Defaults to 'rw', which allows both reading from and writing to the file.
             Use 'r' to open the file in read-only mode.
+        cache_size:
+            Maximum bytes of time-series data kept in the record cache. Defaults to 0, no cache.
+            Repeated read_ts/read_ts_many calls with the same pathname, window and flags return
+            the cached TimeSeriesStruct without reading the file, as long as the record was not
+            written since. Once the file changes, the last write times of the blocks covered
+            by the cached read are queried; reads of blank D-part without window are read again.
+            Writes and deletes through this object evict the record right away.
+            The returned struct is shared by these calls and must not be modified; as_pandas
+            returns a copy of its data.
+        threadsafe:
+            If True, the object can be shared by several threads. The heclib calls on the file
+            are made holding an internal lock of the object, i.e., they are serialized, and
+            read_status/write_status are stored per thread. Defaults to False, no lock of the
+            object; the process wide heclib lock is taken by the calls that need it in both cases.
 
         Returns
         --------
         None
         """
-        super().__init__(dss_path, version)
+        super().__init__(dss_path, version, threadsafe)
         self.mode = mode
+        self._cache = RecordCache(cache_size) if cache_size > 0 else None
+        # pathname -> (record last write time, paired data header)
+        self._pd_headers = {}
 
     # @validate_call
     def read_ts(
@@ -113,7 +369,10 @@ class Open(_Open):
         trim_missing: bool = False,
         regular: bool = True,
         window_flag: Literal[0, 1, 1, 3] = 0,
-    ) -> TimeSeriesStruct:
+        as_pandas: bool = False,
+        out: Optional[np.ndarray] = None,
+        out_times: Optional[np.ndarray] = None,
+    ) -> Union[TimeSeriesStruct, "pd.Series", int]:
         """Read time-series record
 
         Parameter
@@ -136,68 +395,326 @@ class Open(_Open):
                         2 - Retrieve one value after end of time window
                         3 - Retrieve one value before and one value after time window
 
+        as_pandas: bool, default False
+            If True, returns pandas Series with DatetimeIndex where missing values are NaN.
+            The Series wraps the data read from the file without copying (see TimeSeriesStruct.to_series),
+            except for records served from the record cache, which are copied.
+
+        out: 1-D float32 or float64 array, optional
+            Preallocated array, e.g., a row of (n_series, n_steps) array, filled with the values.
+            Missing values and elements after the last value are NaN. Values are read as doubles
+            when out is float64 array.
+
+        out_times: 1-D int32 or datetime64 array, optional
+            Preallocated array filled with the times when out is given (see TimeSeriesStruct.copy_to).
+
         Returns
         --------
-            TimeSeriesStruct
+            TimeSeriesStruct or pandas Series, or number of values copied when out is given
 
         Examples
         ---------
             >>> ts = fid.read_ts(pathname,window=('10MAR2006 24:00:00', '09APR2006 24:00:00'))
             >>> ts = fid.read_ts(pathname,regular=False)
+            >>> series = fid.read_ts(pathname,as_pandas=True)
+            >>> data = np.empty((len(pathnames), 744), dtype=np.float32)
+            >>> for i, pathname in enumerate(pathnames):
+            ...     fid.read_ts(pathname, window=window, out=data[i])
 
         """
-        retrieve_flag = 0  # adhere to window
+        retrieve_flag = self._ts_retrieve_flag(regular, trim_missing, window_flag)
+        if retrieve_flag is None:
+            logging.error("Invalid window_flag for irregular dss record")
+            return
 
-        if regular:
-            retrieve_flag = -1 if trim_missing else retrieve_flag
+        # heclib converts float data to double when doubles are retrieved
+        retrieve_doubles = 2 if out is not None and out.dtype == np.float64 else 1
 
-        else:
-            if window_flag in [0, 1, 2, 3]:
-                retrieve_flag = window_flag
-            else:
-                logging.error("Invalid window_flag for irregular dss record")
+        dates = None
+        if window:
+            try:
+                dates = _format_window(window)
+            except ArgumentException as err:
+                logging.error(str(err))
                 return
 
-        if not window:
-            pathobj = DssPathName(pathname)
-            retrieve_all = 0
-            if (
-                not pathobj.getDPart().strip()
-            ):  # if date part is empty, retrieve all data ignoring date
-                retrieve_all = 1
+        ts = self._read_ts_struct(str(pathname), dates, retrieve_flag, retrieve_doubles)
+        if out is not None:
+            return ts.copy_to(out, out_times)
+        return self._ts_to_series(ts) if as_pandas else ts
+
+    def _ts_to_series(self, ts: TimeSeriesStruct) -> "pd.Series":
+        # Struct read for this call is wrapped without copy, the cached struct is
+        # shared by other reads and must not be modified
+        return ts.to_series(copy=self._cache is not None)
+
+    def _read_ts_struct(
+        self,
+        pathname: str,
+        dates: Optional[Tuple[str, str, str, str]],
+        retrieve_flag: int,
+        retrieve_doubles: int = 1,
+    ) -> TimeSeriesStruct:
+        # Reads time-series struct, from the record cache when it is enabled
+        if self._cache is None:
+            return self._retrieve_ts(pathname, dates, retrieve_flag, retrieve_doubles)
+
+        key = (pathname, dates, retrieve_flag, retrieve_doubles)
+        with self._lock:
+            # stamp before reading, so that writes during the read invalidate the entry
+            stamp = self._file_stamp()
+            ts = self._cache.get(
+                key, lambda entry: self._cache_entry_valid(pathname, dates, entry, stamp)
+            )
+            if ts is None:
+                ts = self._retrieve_ts(pathname, dates, retrieve_flag, retrieve_doubles)
+                num = ts.numberValues
+                if num:
+                    nbytes = ts.values.nbytes + (4 * num if ts.interval <= 0 else 0)
+                    self._cache.put(key, ts, nbytes, stamp, ts.lastWrittenTime)
+        return ts
+
+    def _retrieve_ts(self, pathname, dates, retrieve_flag, retrieve_doubles):
+        if dates is None:
+            # if date part is empty, retrieve all data ignoring date
+            retrieve_all = 1 if _dpart_is_empty(pathname) else 0
             return super().read_path(
-                pathname, retrieve_flag, boolRetrieveAllTimes=retrieve_all
+                pathname, retrieve_flag, retrieve_doubles, boolRetrieveAllTimes=retrieve_all
             )
+        return super().read_window(pathname, *dates, retrieve_flag, retrieve_doubles)
 
-        startdate, enddate = window
-        if isinstance(startdate, str):
-            startdate = HecTime.getPyDateTimeFromString(startdate)
-        elif not isinstance(startdate, datetime):
-            logging.error("startdate is not string or datetime object")
-            return
+    def _file_stamp(self) -> Tuple[int, int]:
+        st = os.stat(self.filename)
+        return st.st_mtime_ns, st.st_size
 
-        if isinstance(enddate, str):
-            enddate = HecTime.getPyDateTimeFromString(enddate)
-        elif not isinstance(enddate, datetime):
-            logging.error("enddate is not string or datetime object")
-            return
+    def _cache_entry_valid(
+        self,
+        pathname: str,
+        dates: Optional[Tuple[str, str, str, str]],
+        entry,
+        stamp: Tuple[int, int],
+    ) -> bool:
+        # Unchanged file means unchanged record. Otherwise, the record is unchanged
+        # when none of the blocks read was written after it was read. Only the
+        # pathnames of those blocks are queried, no more than the read itself.
+        if entry.stamp == stamp:
+            return True
+        if entry.write_time <= 0:
+            return False
+        block_paths = _ts_block_pathnames(pathname, dates)
+        if block_paths is None:
+            return False
+        for block_path in block_paths:
+            try:
+                write_time = dss_info(self, block_path).lastWriteTimeMillis
+            except BaseException:
+                # block not in the file, created later if the read is repeated
+                write_time = 0
+            if write_time > entry.write_time:
+                return False
+        entry.stamp = stamp
+        return True
+
+    def _cache_evict(self, pathname: str) -> None:
+        # Drops the cached reads (any D-part, window and flags) of the record written
+        # or deleted through this handle, and its memoized paired data header. The file
+        # stamp and the record write time can miss quick rewrites.
+        self._pd_headers.pop(str(pathname), None)
+        if self._cache is not None:
+            record = _record_key(pathname)
+            with self._lock:
+                self._cache.discard_where(lambda key: _record_key(key[0]) == record)
+
+    def _store_ts(self, tsc: "TimeSeriesContainer", storage_flag: int = 0):
+        # all the time-series writes of this class go through here
+        try:
+            return super().put(tsc, storage_flag)
+        finally:
+            self._cache_evict(tsc.pathname)
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """Returns hits, misses, evictions, entries, nbytes and max_bytes of the record
+        cache as named tuple, None when the cache is not enabled.
+        """
+        if self._cache is not None:
+            return self._cache.info()
+
+    def cache_clear(self) -> None:
+        """Removes all records from the record cache"""
+        if self._cache is not None:
+            with self._lock:
+                self._cache.clear()
+
+    @staticmethod
+    def _ts_retrieve_flag(
+        regular: bool, trim_missing: bool, window_flag: int
+    ) -> Optional[int]:
+        # retrieveFlag argument of heclib ztsRetrieve, None if invalid
+        if regular:
+            return -1 if trim_missing else 0
+        if window_flag in [0, 1, 2, 3]:
+            return window_flag
+        return None
+
+    # @validate_call
+    def read_ts_many(
+        self,
+        pathnames: Iterable[str],
+        window: Optional[DateWindow] = None,
+        trim_missing: bool = False,
+        regular: bool = True,
+        window_flag: Literal[0, 1, 1, 3] = 0,
+        as_pandas: bool = False,
+        wide: bool = False,
+    ) -> Tuple[Union[Dict[str, Any], "pd.DataFrame"], Dict[str, Exception]]:
+        """Read many time-series records using the same time window
+
+        The time window is parsed and formatted only once and reused for every record.
+        Failure to read a record does not stop reading the remaining records.
+
+        Parameter
+        ---------
+        pathnames:
+            iterable of dss record pathnames
+
+        window, trim_missing, regular, window_flag, as_pandas:
+            same as read_ts
+
+        wide: bool, default False
+            If True, returns single DataFrame with one column per pathname aligned on
+            the time index. Applies only when all the records have the same interval,
+            otherwise dict of Series is returned.
+
+        Returns
+        --------
+            tuple of (results, errors)
+            results: dict of pathname -> TimeSeriesStruct (or Series), or DataFrame if wide
+            errors: dict of pathname -> exception for the records that could not be read
+
+        Examples
+        ---------
+            >>> data, errors = fid.read_ts_many(pathnames, window=('01JAN2000 01:00', '01FEB2000 24:00'))
+            >>> df, errors = fid.read_ts_many(pathnames, window=window, wide=True)
+
+        """
+        retrieve_flag = self._ts_retrieve_flag(regular, trim_missing, window_flag)
+        if retrieve_flag is None:
+            raise ArgumentException("Invalid window_flag for irregular dss record")
+
+        dates = _format_window(window) if window else None
+        as_pandas = as_pandas or wide
+
+        results = {}
+        errors = {}
+        intervals = set()
+        for pathname in pathnames:
+            try:
+                ts = self._read_ts_struct(pathname, dates, retrieve_flag)
+            except (Exception, DssPathException) as err:
+                # DssPathException (invalid pathname) is not subclass of Exception
+                errors[pathname] = err
+                continue
+
+            if ts.numberValues is None:
+                errors[pathname] = DssStatusException(-1, "No data found for %s" % pathname)
+                continue
+
+            intervals.add(ts.interval)
+            results[pathname] = self._ts_to_series(ts) if as_pandas else ts
+
+        if wide and results:
+            if len(intervals) == 1:
+                results = pd.concat(results, axis=1)
+            else:
+                logging.warning(
+                    "Time-series intervals are not same, returning dict instead of DataFrame"
+                )
+        return results, errors
+
+    def iter_ts(
+        self,
+        pathname: str,
+        window: DateWindow,
+        chunk: int = 1,
+        as_pandas: bool = False,
+    ) -> Iterator[Union[Tuple[np.ndarray, np.ndarray], "pd.Series"]]:
+        """Read time-series record in chunks aligned with the DSS record blocks
+
+        Only one chunk is held in memory at a time. The block size is implied by
+        the E-part of the pathname, e.g., day for 1MINUTE, month for 1HOUR, year for 1DAY,
+        decade for 1MONTH and century for 1YEAR data.
+
+        Parameter
+        ---------
+        pathname:
+            dss record pathname
 
-        sday = startdate.strftime("%d%b%Y")
-        stime = startdate.strftime("%H:%M:%S")
-        eday = enddate.strftime("%d%b%Y")
-        etime = enddate.strftime("%H:%M:%S")
+        window:
+            tuple of start and end dates
 
-        return super().read_window(pathname, sday, stime, eday, etime, retrieve_flag)
+        chunk: int, default 1
+            number of blocks read at a time
+
+        as_pandas: bool, default False
+            If True, yields pandas Series instead of tuple of times and values
+
+        Yields
+        --------
+            tuple of (datetime64 times, values) or pandas Series. Missing values are NaN.
+
+        Examples
+        ---------
+            >>> for times, values in fid.iter_ts(pathname, window=('01JAN1990 00:00', '31DEC2019 24:00')):
+            ...     total += np.nansum(values)
+
+        """
+        if chunk < 1:
+            raise ArgumentException("chunk must be positive integer")
+        epart = DssPathName(pathname).getEPart().strip().upper()
+        block = _TS_BLOCK_SIZES.get(epart)
+        if block is None:
+            raise ArgumentException("Unsupported time-series E-part %s" % epart)
+
+        sday, stime, eday, etime = _format_window(window)
+        start = HecTime.getPyDateTimeFromString("%s %s" % (sday, stime))
+        end = HecTime.getPyDateTimeFromString("%s %s" % (eday, etime))
+
+        last_time = None
+        chunk_start = start
+        while chunk_start <= end:
+            # block ends at 24:00 of the last day, i.e., start of next block
+            chunk_end = min(_next_block_start(chunk_start, block, chunk), end)
+            dates = _format_window((chunk_start, chunk_end))
+            ts = super().read_window(pathname, *dates, 0)
+            series = ts.to_series(copy=True)
+            # free heclib struct before reading next chunk
+            del ts
+            chunk_start = chunk_end + timedelta(seconds=1)
+
+            if last_time is not None:
+                # value at the chunk boundary is not repeated
+                series = series[series.index > last_time]
+            if not len(series):
+                continue
+            last_time = series.index[-1]
+            if as_pandas:
+                yield series
+            else:
+                yield series.index.values, series.values
 
     # @validate_call
     def put_ts(
         self, tsc: "TimeSeriesContainer", prevent_overflow: Optional[bool] = True
-    ) -> None:
+    ) -> Optional[TimeSeriesStruct]:
         """Write time-series
 
         Parameter
         ---------
             tsc: TimeSeriesContainer
+                  For irregular time-series, times can be numpy datetime64 array or pandas
+                  DatetimeIndex, which are converted and sorted without python loop.
+                  ArgumentException is raised when these times, values and numberValues
+                  differ in length.
 
             prevent_overflow: bool, default True, applies to irregular time-series only
                   times are int32 values with origin (or Julian Base date) at 01Jan1900 00:00:00,
@@ -208,7 +725,7 @@ class Open(_Open):
 
         Returns
         --------
-            None
+            TimeSeriesStruct of the written data, None when the data is not valid
 
         Usage
         ---------
@@ -229,19 +746,12 @@ class Open(_Open):
                 )
                 return
             # check start datetime format
-            sdate = tsc.startDateTime
-            try:
-                sdate = HecTime(sdate, tsc.granularity)
-            except:
-                logging.warning(
-                    "Start datetime of regular time-series ({}) may be incorrect".format(
-                        tsc.startDateTime
-                    )
-                )
-            else:
-                sdate = sdate._toString(end_of_day=False)
-                tsc.startDateTime = sdate
-            super().put(tsc)
+            tsc.startDateTime = _regular_start_date(tsc.startDateTime, tsc.granularity)
+            return self._store_ts(tsc)
+
+        elif _is_datetime64(tsc.times):
+            # Irregular time-series with numpy datetime64 or pandas DatetimeIndex times
+            return self._put_irregular_arrays(tsc)
 
         else:
             # Irregular time-series
@@ -300,11 +810,288 @@ class Open(_Open):
             try:
                 tsc.times = [t for t, v in key_val]
                 tsc.values = [v for t, v in key_val]
-                super().put(tsc)
+                return self._store_ts(tsc)
             finally:
                 tsc.times = times_copy
                 tsc.values = values_copy
 
+    def put_series(
+        self,
+        series: "pd.Series",
+        pathname: str,
+        units: str = "",
+        type: str = "INST",
+        timezone: str = "",
+    ) -> Optional[TimeSeriesStruct]:
+        """Write pandas Series with DatetimeIndex as regular time-series
+
+        The interval is inferred from the index and the spacing of all the times is
+        checked in one vectorized step. The values are copied once into float32 array
+        where NaN is replaced by the DSS missing value.
+
+        Parameter
+        ---------
+        series: pandas Series
+            values with timezone naive DatetimeIndex of regularly spaced times
+
+        pathname:
+            dss record pathname. The E-part is set to the inferred interval when it is
+            empty, otherwise it must be the same as the inferred interval.
+
+        units, type, timezone:
+            units, data type (e.g., INST, PER-AVER, PER-CUM) and timezone of the data
+
+        Returns
+        --------
+            TimeSeriesStruct of the written data, None when writing fails
+
+        Examples
+        ---------
+            >>> series = pd.Series(values, index=pd.date_range("2000-01-01 01:00", periods=744, freq="h"))
+            >>> fid.put_series(series, "/REGULAR/TIMESERIES/FLOW//1HOUR/Ex1/", units="cfs")
+
+        """
+        if self.mode != "rw":
+            logging.error(
+                "Open the dss file in 'rw' mode to be able to write data on it."
+            )
+            return
+
+        try:
+            tsc = _series_to_container(series, pathname, units, type, timezone)
+        except ArgumentException as err:
+            logging.error(str(err))
+            return
+        return self._store_ts(tsc)
+
+    def put_ts_many(
+        self,
+        items: Iterable[Union["TimeSeriesContainer", "pd.Series"]],
+        units: str = "",
+        type: str = "INST",
+        storage_flag: int = 0,
+    ) -> Optional[Tuple[np.ndarray, Dict[int, BaseException]]]:
+        """Write many time-series
+
+        Writing does not stop at invalid data or failed writes; the status and the
+        exception of each failed record are returned instead. heclib stores one record
+        per call, so each record is still written with its own store call; the start
+        dates of regular time-series and the expected times of Series are
+        parsed/computed once for the records sharing them. As in put_ts, start date
+        that can not be parsed is only warned and written as it is.
+
+        Parameter
+        ---------
+        items:
+            TimeSeriesContainer objects, or pandas Series named by the pathname as
+            returned by read_ts(as_pandas=True)
+
+        units, type:
+            units and data type of the Series items
+
+        storage_flag: int, default 0
+            storage flag of heclib ztsStore for regular time-series,
+            0 - always replace data, 1 - only replace missing data,
+            2 - write regardless, even if all missing data
+
+        Returns
+        --------
+            tuple of (status, errors), None when the file is not opened in 'rw' mode.
+
+            status: int32 array of the status of each record in the order of items,
+            0 for success, negative (or heclib error code) for failure.
+
+            errors: dict of item index -> exception for the records that could not be written
+
+        Examples
+        ---------
+            >>> status, errors = fid.put_ts_many(containers)
+            >>> for i, err in errors.items():
+            ...     print(containers[i].pathname, err)
+
+        """
+        if self.mode != "rw":
+            logging.error(
+                "Open the dss file in 'rw' mode to be able to write data on it."
+            )
+            return
+
+        start_dates = {}
+        memo = {}
+        status = []
+        errors = {}
+        for i, item in enumerate(items):
+            tsc = item
+            start_date = None
+            try:
+                if isinstance(item, pd.Series):
+                    tsc = _series_to_container(item, item.name, units, type, memo=memo)
+                elif item.interval > 0:
+                    if not len(tsc.values) == tsc.numberValues:
+                        raise ArgumentException(
+                            "numberValues not equal to length of values for %s" % tsc.pathname
+                        )
+                    key = (tsc.startDateTime, tsc.granularity)
+                    start = start_dates.get(key)
+                    if start is None:
+                        start = _regular_start_date(tsc.startDateTime, tsc.granularity)
+                        start_dates[key] = start
+                    # parsed start date, restored below
+                    start_date = tsc.startDateTime
+                    tsc.startDateTime = start
+                else:
+                    # irregular time-series
+                    if self.put_ts(item) is None:
+                        raise ArgumentException("Invalid irregular time-series %s" % item.pathname)
+                    status.append(self.write_status)
+                    continue
+                self._store_ts(tsc, storage_flag)
+                status.append(self.write_status)
+            except (Exception, DssPathException) as err:
+                errors[i] = err
+                if isinstance(err, DssStatusException) and err.status < 0:
+                    status.append(err.status)
+                else:
+                    status.append(-1)
+            finally:
+                if start_date is not None:
+                    tsc.startDateTime = start_date
+        return np.array(status, dtype=np.int32), errors
+
+    def append_ts(
+        self,
+        pathname: str,
+        values: npt.ArrayLike,
+        start: Optional[DateLike] = None,
+        units: str = "",
+        type: str = "INST",
+    ) -> Optional[TimeSeriesStruct]:
+        """Append values to the end of regular time-series record
+
+        The last date with data is taken from the catalog, so only the last day of the
+        old data is read, to find its last valid value, and only the blocks with the new
+        values are written.
+
+        Parameter
+        ---------
+        pathname:
+            dss record pathname, D-part is ignored
+
+        values:
+            values to append, NaN is written as missing value
+
+        start: optional
+            date and time of the first value, required for new record. For existing
+            record, the values always start one interval after its last valid value;
+            start that is not exactly that date is rejected.
+
+        units, type:
+            units and data type of the values
+
+        Returns
+        --------
+            TimeSeriesStruct of the written data, None when appending fails
+
+        Examples
+        ---------
+            >>> fid.append_ts("/REGULAR/TIMESERIES/FLOW//15MINUTE/OBS/", [1.2, 1.3, 1.1])
+
+        """
+        if self.mode != "rw":
+            logging.error(
+                "Open the dss file in 'rw' mode to be able to write data on it."
+            )
+            return
+
+        parts = str(pathname).split("/")
+        intervals = {key.upper(): val for key, val in _TS_INTERVAL_SECONDS.items()}
+        interval = intervals.get(parts[5].strip().upper()) if len(parts) == 8 else None
+        if interval is None:
+            logging.error("%s is not a regular time-series pathname" % pathname)
+            return
+
+        if isinstance(start, HecTime):
+            start = start.python_datetime
+        elif isinstance(start, str):
+            start = HecTime.getPyDateTimeFromString(start)
+
+        parts[4] = "*"
+        catalog = getPathnameCatalog(self, "/".join(parts), includeDates=True)
+        end_dates = catalog.getEndDates()
+        parts[4] = ""
+        pathname = "/".join(parts)
+        julian_base = datetime(1899, 12, 31)
+
+        if not end_dates and start is None:
+            logging.error("%s does not exist, start is required" % pathname)
+            return
+
+        if end_dates:
+            last_day = julian_base + timedelta(days=int(max(end_dates)))
+            # last day is the only data read, 24:00 of the day is included
+            window = (last_day + timedelta(seconds=1), last_day + timedelta(days=1))
+            ts = self._retrieve_ts(pathname, _format_window(window), -1, 1)
+            if not ts.numberValues:
+                logging.error("Could not find last value of %s" % pathname)
+                return
+            last, next_start = getRegularDatetime64(ts.nptimes[-1], interval, 2).tolist()
+            if start is None:
+                start = next_start
+            elif start != next_start:
+                logging.error(
+                    "start must be %s, one interval after the last value (%s) of %s"
+                    % (next_start, last, pathname)
+                )
+                return
+
+        values = np.array(values, dtype=np.float32, ndmin=1)
+        values[np.isnan(values)] = UNDEFINED
+        tsc = TimeSeriesContainer()
+        tsc.pathname = pathname
+        tsc.startDateTime = start.strftime("%d%b%Y %H:%M:%S")
+        tsc.numberValues = len(values)
+        tsc.interval = interval
+        tsc.units = units
+        tsc.type = type
+        tsc.values = values
+        return self._store_ts(tsc)
+
+    def _put_irregular_arrays(self, tsc: "TimeSeriesContainer") -> Optional[TimeSeriesStruct]:
+        # Vectorized version of the irregular time-series write in put_ts.
+        # The minimum date is the julian base date and the times are int32 offsets
+        # from it in granularity units, sorted together with float64 values.
+        times = np.asarray(tsc.times, dtype="datetime64[s]")
+        values = np.asarray(tsc.values, dtype=np.float64)
+        if not (tsc.numberValues == len(times) == len(values)):
+            raise ArgumentException(
+                "times, values and numberValues of %s do not have the same length" % tsc.pathname
+            )
+        if not len(times) or np.isnat(times).any():
+            logging.error("times for irregular time-series must be non-empty and not NaT")
+            return
+
+        granularity = tsc.granularity if tsc.granularity > 0 else 60
+        base_day = times.min().astype("datetime64[D]")
+        offsets = (times - base_day).astype(np.int64) // granularity
+        if offsets.max() > np.iinfo(np.int32).max:
+            logging.error(
+                "times overflow int32 for granularity of %d seconds, "
+                "write the time-series in smaller groups" % granularity
+            )
+            return
+
+        order = np.argsort(offsets, kind="stable")
+        times_copy, values_copy, base_copy = tsc.times, tsc.values, tsc._startDateBase
+        try:
+            tsc.times = offsets[order].astype(np.int32)
+            tsc.values = values[order]
+            tsc._startDateBase = base_day.item().strftime("%d%b%Y")
+            return self._store_ts(tsc)
+        finally:
+            tsc.times = times_copy
+            tsc.values = values_copy
+            tsc._startDateBase = base_copy
+
     # @validate_call
     def read_pd(
         self,
@@ -312,7 +1099,9 @@ class Open(_Open):
         window: Optional[DateWindow] = None,
         dtype: Optional["np.dtype"] = None,
         dataframe: Optional[bool] = True,
-    ) -> pd.DataFrame:
+        as_arrays: bool = False,
+        copy: bool = True,
+    ) -> Union[pd.DataFrame, PairedDataStruct, Tuple["np.ndarray", "np.ndarray", List[str]]]:
         """Read paired data as pandas dataframe
 
         Parameter
@@ -327,11 +1116,21 @@ class Open(_Open):
                     0 can be used to specify last row or curve. Negative number works like indexing of python list.
 
             dtype: numpy dtype, default None
-                  Data type of returned DataFrame
+                  Data type of returned DataFrame or arrays. If float64, the data is read as
+                  doubles (no precision is lost for double records) and no conversion is made.
 
             dataframe: boolean, default True
                   Returns dataframe object if True, otherwise ruturns paired data structure
 
+            as_arrays: boolean, default False
+                  If True, returns tuple of (ordinates, curves, labels) where ordinates is 1-D array
+                  and curves is 2-D Fortran ordered array of shape (ordinates, curves). Both arrays
+                  view the data read from the file without copying (see PairedDataStruct.get_arrays).
+
+            copy: boolean, default True
+                  If False, the DataFrame columns view the data read from the file, no copy is made
+                  unless dtype conversion is required. If True, the values are copied once.
+
         Returns
         --------
             DataFrame object
@@ -365,38 +1164,98 @@ class Open(_Open):
                 return
             window = (start_ord, end_ord, start_curve, end_curve)
 
-        pds = super().read_pd(pathname, window)
+        doubles = dtype is not None and np.dtype(dtype) == np.float64
+        pds = super().read_pd(pathname, window, 2 if doubles else 1)
+        if as_arrays:
+            return pds.get_arrays()
         if dataframe:
-            x, curves, label_list = pds.get_data()
-            tb = np.asarray(curves).T
-            # The row in curves array contains curve data
-            # Transpose causes the curve data to be in columns (for DataFrame purpose)
-            if label_list:
-                label_list = [x.strip() for x in label_list]
-            else:
-                for i in range(tb.shape[1]):
-                    label_list.append(" ")
-            if not len(label_list) == tb.shape[1]:
-                logging.warn(
-                    "Number of labels is not equal to number of curves. This issue can occur with preallocated paired data."
-                )
-                label_list = [str(i + 1) for i in range(curves.shape[1])]
-
-            indx = list(x[0])
-            df = pd.DataFrame(
-                data=tb, index=indx, columns=label_list, dtype=dtype, copy=True
-            )
-            df.index.name = "X"
+            # tb columns are curves, Fortran ordered view of the struct data
+            x, tb, label_list = pds.get_arrays()
+            label_list = self._pd_column_labels(label_list, tb.shape[1])
+
+            if dtype is not None and np.dtype(dtype) != tb.dtype:
+                # the conversion is the only copy
+                tb = tb.astype(dtype, order="F")
+            elif copy:
+                tb = tb.copy(order="F")
+            indx = pd.Index(x.astype(np.float64), name="X")
+            df = pd.DataFrame(data=tb, index=indx, columns=label_list, copy=False)
             return df
         else:
             return pds
 
+    @staticmethod
+    def _pd_column_labels(label_list: List[str], curve_no: int) -> List[str]:
+        if label_list:
+            label_list = [x.strip() for x in label_list]
+        else:
+            label_list = [" "] * curve_no
+        if not len(label_list) == curve_no:
+            logging.warn(
+                "Number of labels is not equal to number of curves. This issue can occur with preallocated paired data."
+            )
+            label_list = [str(i + 1) for i in range(curve_no)]
+        return label_list
+
     # @validate_call
     def read_pd_labels(self, pathname: PathType):
-        _df = self.read_pd(pathname, window=(1, 1, 1, 0))
-        df = pd.DataFrame(data=_df.columns, columns=["label"])
+        header = self.pd_header(pathname)
+        df = pd.DataFrame(data=header["labels"], columns=["label"])
         return df
 
+    def pd_header(self, pathname: PathType, memo: bool = True) -> Dict[str, Any]:
+        """Read labels, shape, units and types of paired data record without its values
+
+        Only the first ordinate of the curves is retrieved, no curve values are copied.
+
+        Parameter
+        ---------
+            pathname: string, dss record pathname
+
+            memo: bool, default True
+                  Keep the header in memory of this handle. The next calls for the same
+                  pathname only check the record last write time and return the kept header
+                  when the record was not written since.
+
+        Returns
+        --------
+            dict with keys labels, curve_no, data_no, label_size, dtype, independent_units,
+            independent_type, dependent_units, dependent_type and last_write_time
+            (milliseconds since 1970)
+
+        Usage
+        ---------
+            >>> fid.pd_header(pathname)["labels"]
+        """
+        pathname = str(pathname)
+        write_time = 0
+        if memo:
+            write_time = dss_info(self, pathname).lastWriteTimeMillis
+            item = self._pd_headers.get(pathname)
+            if item is not None and write_time > 0 and item[0] == write_time:
+                return dict(item[1], labels=list(item[1]["labels"]))
+
+        # first ordinate, all curves
+        pds = super().read_pd(pathname, (1, 1, 0, 0))
+        curve_no = pds.numberCurves
+        labels_length = pds.labelsLength
+        header = {
+            "labels": self._pd_column_labels(pds.labels, curve_no),
+            "curve_no": curve_no,
+            "data_no": pds.numberOrdinates,
+            "label_size": int((labels_length - curve_no) / curve_no) if curve_no else 0,
+            "dtype": {200: "float32", 205: "double"}.get(pds.dataType, "unknown"),
+            "independent_units": pds.independent_units,
+            "independent_type": pds.independent_type,
+            "dependent_units": pds.dependent_units,
+            "dependent_type": pds.dependent_type,
+            "last_write_time": pds.lastWrittenTime,
+        }
+        if memo and write_time > 0:
+            self._pd_headers[pathname] = (write_time, header)
+            return dict(header, labels=list(header["labels"]))
+        return header
+
     # @validate_call
     def put_pd(
         self,
@@ -409,9 +1268,12 @@ class Open(_Open):
         Parameter
         ---------
             pdc_df_array: PairedDataContainer, pandas dataframe or numpy array
+                          float64 curves of PairedDataContainer or dataframe are written
+                          as double precision record without conversion to float32.
 
             curve_index: curve or column number, default None
-                         Data in specified curve is changed.
+                         Data in specified curve is changed. The data is written as
+                         doubles to double precision record, as float32 otherwise.
 
             window: tuple consisting of starting and ending row numbers or ordinates
                     Used only when curve_index is specified
@@ -473,10 +1335,12 @@ class Open(_Open):
                     logging.error("Ordinate indices of window out of bounds")
                     return
 
+            # double records keep float64 precision of the curve
+            dtype = np.float64 if size_info["dtype"] == "double" else np.float32
             if isinstance(pdc_df_array, (array, list, tuple)):
-                pdc_df_array = np.array(pdc_df_array, np.float32)
+                pdc_df_array = np.array(pdc_df_array, dtype)
             elif isinstance(pdc_df_array, np.ndarray):
-                pass
+                pdc_df_array = pdc_df_array.astype(dtype, copy=False)
             else:
                 raise BaseException("Unsupported data provided")
 
@@ -487,10 +1351,130 @@ class Open(_Open):
                 return
             pdc = PairedDataContainer(pathname=pathname, labels_list=labels_list)
             pdc.curves = pdc_df_array
-            super().put_one_pd(pdc, curve_index, (start_ord, end_ord), max_label_size)
+            try:
+                super().put_one_pd(
+                    pdc, curve_index, (start_ord, end_ord), max_label_size
+                )
+            finally:
+                self._cache_evict(pathname)
             return
 
-        super().put_pd(pdc)
+        try:
+            super().put_pd(pdc)
+        finally:
+            self._cache_evict(pdc.pathname)
+
+    def put_pd_columns(
+        self,
+        pathname: str,
+        columns: Mapping[int, Union["np.ndarray", Sequence[float]]],
+        window: Optional[Tuple[int, int]] = None,
+        labels: Optional[Mapping[int, str]] = None,
+    ) -> Optional[int]:
+        """Write many curves of preallocated or existing paired data record
+
+        All the curves are validated against one read of the record size. Curves with
+        consecutive indices are written together with one store call, split where the
+        curves with new labels start or end. Values are written as doubles to double
+        precision record.
+
+        Parameter
+        ---------
+            pathname: string, dss record pathname
+
+            columns: dict of curve index (1 based) -> values
+                     1-D values are values of the curve. 2-D values of shape (ordinates, n)
+                     are values of n curves starting from the curve index, e.g.,
+                     {1: df.values} writes first df.shape[1] curves.
+
+            window: tuple of starting and ending ordinate (row) numbers, default None
+                    Same as put_pd, all ordinates if None.
+
+            labels: dict of curve index -> label, default None
+                    New labels of the written curves. Labels of the curves not in labels
+                    are kept.
+
+        Returns
+        --------
+            Number of store calls, None if nothing is written
+
+        Usage
+        ---------
+            >>> fid.put_pd_columns(pathname, {2: curve2, 5: curve5, 10: arr_10_to_20}, window=(1, 50))
+        """
+        if self.mode != "rw":
+            logging.error(
+                "Open the dss file in 'rw' mode to be able to write data on it."
+            )
+            return
+
+        size_info = self.pd_info(pathname)
+        total_ordinates = size_info["data_no"]
+        total_curves = size_info["curve_no"]
+        max_label_size = size_info["label_size"]
+
+        start_ord, end_ord = (1, total_ordinates)
+        if window:
+            start_ord, end_ord = window
+            if end_ord <= 0:
+                end_ord = total_ordinates + end_ord
+            if not (
+                start_ord >= 1 and end_ord <= total_ordinates and end_ord >= start_ord
+            ):
+                logging.error("Ordinate indices of window out of bounds")
+                return
+        num_ord = end_ord - start_ord + 1
+
+        # curve index -> 1-D values, float64 for double precision record
+        dtype = np.float64 if size_info["dtype"] == "double" else np.float32
+        curves = {}
+        for curve_index, values in columns.items():
+            values = np.asarray(values, dtype=dtype)
+            if values.ndim == 1:
+                values = values.reshape(-1, 1)
+            if values.ndim != 2 or values.shape[0] != num_ord:
+                logging.error("Incorrect size of array provided for curve %s" % curve_index)
+                return
+            for j in range(values.shape[1]):
+                index = int(curve_index) + j
+                if not (index >= 1 and index <= total_curves):
+                    logging.error("Curve index out of bounds.")
+                    return
+                if index in curves:
+                    logging.error("Curve %d is provided more than once" % index)
+                    return
+                curves[index] = values[:, j]
+        if not curves:
+            return
+
+        # consecutive curve indices, a run either has new labels for all its curves
+        # or keeps the labels of all its curves
+        labels = labels or {}
+        indices = sorted(curves)
+        runs = []
+        first = indices[0]
+        for prev, index in zip(indices, indices[1:]):
+            if index != prev + 1 or (prev in labels) != (index in labels):
+                runs.append((first, prev))
+                first = index
+        runs.append((first, indices[-1]))
+
+        for first, last in runs:
+            block = np.empty((last - first + 1, num_ord), dtype=dtype)
+            for i in range(first, last + 1):
+                block[i - first] = curves[i]
+            labels_list = []
+            if first in labels:
+                labels_list = [labels[i] for i in range(first, last + 1)]
+            pdc = PairedDataContainer(pathname=pathname, labels_list=labels_list)
+            pdc.curves = block
+            try:
+                super().put_pd_curves(
+                    pdc, first, last, (start_ord, end_ord), max_label_size
+                )
+            finally:
+                self._cache_evict(pathname)
+        return len(runs)
 
     # @validate_call
     def preallocate_pd(
@@ -515,7 +1499,10 @@ class Open(_Open):
             if not pdc.labels_list:
                 pdc.labels_list = [str(i + 1) for i in range(pdc.curve_no)]
         label_size = max(10, kwargs.get("label_size", 10))
-        super().prealloc_pd(pdc, label_size)
+        try:
+            super().prealloc_pd(pdc, label_size)
+        finally:
+            self._cache_evict(pdc.pathname)
 
     # @validate_call
     def read_grid(
@@ -722,16 +1709,11 @@ class Open(_Open):
                     pathobj.setEPart(etime)
                     pathname = pathobj.text()
 
-            _data = data
-            inplace = False
-            if not isinstance(data, ma.core.MaskedArray):
-                # change nodata values to np.nan
-                # copy occured here, so inplace modification of the copied array is ok.
-                inplace = True
-                _data = np.where(data == nodata, np.nan, data)
+            # the only copy of the grid, nodata cells are skipped by the statistics
+            _data = _grid_array_to_write(data, nodata, flipud)
 
             if compute_stats:
-                stats = compute_grid_stats(_data, compute_stats)
+                stats = compute_grid_stats(_data, compute_stats, nodata=nodata)
                 stats["range_vals"][0] = UNDEFINED
                 gridinfo.max_val = stats["max_val"]
                 gridinfo.min_val = stats["min_val"]
@@ -801,28 +1783,6 @@ class Open(_Open):
                     gridinfo.coords_cell0 = (0.0, 0.0)
                     gridinfo.lower_left_cell = (0.0, 0.0)
 
-            # Check the data array
-            if isinstance(_data, ma.core.MaskedArray):
-                mask = _data.mask
-                _data = _data._data
-            else:
-                mask = np.isnan(data)
-
-            # _data = array, mask = mask of array
-            if _data.dtype != np.float32:
-                _data = _data.astype(np.float32, casting="unsafe", copy=True)
-                inplace = True
-
-            # fill np.nan with nodata value
-            if inplace:
-                _data[mask] = nodata
-            else:
-                _data = _data.astype(np.float32, casting="unsafe", copy=True)
-                _data[mask] = nodata
-
-            if flipud:
-                _data = np.flipud(_data)
-
         if not _data.flags["C_CONTIGUOUS"]:
             _data = np.ascontiguousarray(_data)
 
@@ -933,14 +1893,10 @@ class Open(_Open):
                     pathobj.setEPart(etime)
                     pathname = pathobj.text()
 
-            _data = data
-            inplace = False
-            if not isinstance(data, ma.core.MaskedArray):
-                inplace = True
-                _data = np.where(data == nodata, np.nan, data)
+            _data = _grid_array_to_write(data, nodata, flipud)
 
             if compute_stats:
-                stats = compute_grid_stats(_data, compute_stats)
+                stats = compute_grid_stats(_data, compute_stats, nodata=nodata)
                 stats["range_vals"][0] = UNDEFINED
                 gridinfo.max_val = stats["max_val"]
                 gridinfo.min_val = stats["min_val"]
@@ -948,25 +1904,6 @@ class Open(_Open):
                 gridinfo.range_vals = stats["range_vals"]
                 gridinfo.range_counts = stats["range_counts"]
 
-            if isinstance(_data, ma.core.MaskedArray):
-                mask = _data.mask
-                _data = _data._data
-            else:
-                mask = np.isnan(data)
-
-            if _data.dtype != np.float32:
-                _data = _data.astype(np.float32, casting="unsafe", copy=True)
-                inplace = True
-
-            if inplace:
-                _data[mask] = nodata
-            else:
-                _data = _data.astype(np.float32, casting="unsafe", copy=True)
-                _data[mask] = nodata
-
-            if flipud:
-                _data = np.flipud(_data)
-
             if gridinfo.coords_cell0 is None or gridinfo.lower_left_cell is None:
                 logging.info(
                     "Updating coords_cell0 and lower_left_cell because either or both were not specified."
@@ -1040,6 +1977,7 @@ class Open(_Open):
             # overwriting with exact data is pointless
             return
         self.copyRecordsTo(dss_fid, pathname_in, pathname_out)
+        dss_fid._cache_evict(pathname_out or pathname_in)
 
     # @validate_call
     def deletePathname(self, pathname: PathType) -> None:
@@ -1053,6 +1991,7 @@ class Open(_Open):
         pathlist = self.getPathnameList(pathname)
         for pth in pathlist:
             status = deletePathname(self, pth)
+            self._cache_evict(pth)
 
     # @validate_call
     def getPathnameList(
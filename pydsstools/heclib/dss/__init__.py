@@ -1 +1 @@
-__all__ = ["HecDss"]
+__all__ = ["HecDss", "parallel", "writer", "aio", "pool", "rating"]
@@ -0,0 +1,152 @@
+"""
+asyncio interface to HecDss.Open
+"""
+
+__all__ = ["AsyncOpen"]
+
+import os
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from .HecDss import Open, PathType
+from ...core import ArgumentException
+
+
+class _FileWorker:
+    # One thread and one Open handle per (file, version, mode), shared by AsyncOpen objects.
+    # heclib calls of a handle must be serialized; the single thread does that.
+    def __init__(self, dss_path, version, mode):
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="AsyncOpen-%s" % os.path.basename(dss_path)
+        )
+        self.fid = self.executor.submit(Open, dss_path, version, mode).result()
+        self.refs = 0
+
+    def close(self):
+        self.executor.submit(self.fid.close).result()
+        self.executor.shutdown(wait=True)
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def _acquire_worker(dss_path, version, mode):
+    key = (os.path.abspath(dss_path), version, mode)
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            worker = _FileWorker(dss_path, version, mode)
+            _workers[key] = worker
+        worker.refs += 1
+        return key, worker
+
+
+def _release_worker(key):
+    with _workers_lock:
+        worker = _workers[key]
+        worker.refs -= 1
+        if worker.refs > 0:
+            return
+        del _workers[key]
+    worker.close()
+
+
+def _coroutine(name):
+    async def method(self, *args, **kwargs):
+        return await self._call(name, *args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = "Coroutine version of Open.%s, see Open.%s" % (name, name)
+    return method
+
+
+class AsyncOpen:
+    """Open a DSS file for use in asyncio code.
+
+    The methods are coroutines running the same Open methods in a thread, so the
+    event loop is not blocked by heclib calls. All the AsyncOpen objects of the same
+    file, version and mode share one handle and one thread, which serializes the calls
+    to it.
+    max_pending limits the number of calls queued by this object at a time. The limit
+    is per object, not per file: each AsyncOpen object of the same file can queue up to
+    its own max_pending calls in the shared thread.
+
+    Parameter
+    ---------
+        dss_path, version, mode: same as Open
+        max_pending: int, default 8
+            maximum number of calls of this object waiting for/running in the file thread,
+            calls of the other objects of the file are not counted
+
+    Examples
+    ---------
+        >>> async with AsyncOpen("example.dss") as fid:
+        ...     ts = await fid.read_ts(pathname, window=window)
+        ...     results = await asyncio.gather(*[fid.read_ts(p) for p in pathnames])
+    """
+
+    def __init__(
+        self,
+        dss_path: PathType,
+        version: Optional[int] = None,
+        mode: str = "rw",
+        max_pending: int = 8,
+    ) -> None:
+        if max_pending < 1:
+            raise ArgumentException("max_pending must be positive")
+        self.dss_path = str(dss_path)
+        self.version = version
+        self.mode = mode
+        self.max_pending = max_pending
+        self._key = None
+        self._worker = None
+        self._semaphore = None
+
+    async def open(self) -> "AsyncOpen":
+        if self._worker is None:
+            loop = asyncio.get_running_loop()
+            self._key, self._worker = await loop.run_in_executor(
+                None, _acquire_worker, self.dss_path, self.version, self.mode
+            )
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        return self
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            key = self._key
+            self._key = self._worker = None
+            await asyncio.get_running_loop().run_in_executor(None, _release_worker, key)
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _call(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        if self._worker is None:
+            raise RuntimeError("AsyncOpen is not opened, use 'async with' or await open()")
+        worker = self._worker
+        async with self._semaphore:
+            func = partial(getattr(worker.fid, name), *args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(worker.executor, func)
+
+    read_ts = _coroutine("read_ts")
+    read_ts_many = _coroutine("read_ts_many")
+    read_grid = _coroutine("read_grid")
+    read_pd = _coroutine("read_pd")
+    read_pd_labels = _coroutine("read_pd_labels")
+    getPathnameList = _coroutine("getPathnameList")
+    getPathnameDict = _coroutine("getPathnameDict")
+    put_ts = _coroutine("put_ts")
+    put_ts_many = _coroutine("put_ts_many")
+    put_series = _coroutine("put_series")
+    append_ts = _coroutine("append_ts")
+    put_pd = _coroutine("put_pd")
+    put_grid = _coroutine("put_grid")
+    put_grid0 = _coroutine("put_grid0")
+    deletePathname = _coroutine("deletePathname")
@@ -0,0 +1,94 @@
+"""
+Byte bounded LRU cache of records read from DSS file
+"""
+
+__all__ = ["RecordCache", "CacheInfo"]
+
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable, Optional
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "entries", "nbytes", "max_bytes"]
+)
+
+
+class _CacheEntry:
+    __slots__ = ("value", "nbytes", "stamp", "write_time")
+
+    def __init__(self, value, nbytes, stamp, write_time):
+        self.value = value
+        self.nbytes = nbytes
+        # file (mtime, size) when the entry was last known to be valid
+        self.stamp = stamp
+        # last write time of the record (milliseconds since 1970) when it was read
+        self.write_time = write_time
+
+
+class RecordCache:
+    """Least recently used cache bounded by the total bytes of the cached records.
+
+    Entries are validated by the caller with a function receiving the entry. The
+    entry is dropped and counted as a miss when the function returns False.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(
+        self, key: Hashable, validate: Callable[[_CacheEntry], bool]
+    ) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if validate(entry):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            self.discard(key)
+        self.misses += 1
+
+    def put(
+        self, key: Hashable, value: Any, nbytes: int, stamp: Any, write_time: int
+    ) -> None:
+        self.discard(key)
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key] = _CacheEntry(value, nbytes, stamp, write_time)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self.nbytes -= entry.nbytes
+            self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry.nbytes
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Removes the entries whose key satisfies predicate, returns their number"""
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            self.discard(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self._entries),
+            self.nbytes,
+            self.max_bytes,
+        )
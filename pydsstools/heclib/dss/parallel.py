@@ -0,0 +1,330 @@
+"""
+Read the same records from many DSS files using a pool of worker processes
+"""
+
+__all__ = ["ParallelReader"]
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import get_context, util
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional, Union, Tuple, Dict, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .HecDss import Open, DateWindow, PathType, _format_window
+from ...core import DssStatusException, ArgumentException
+
+# Worker side
+# Each worker process keeps its own read-only handles, one per file, so that
+# repeated requests for the same file do not reopen it.
+_worker_handles = OrderedDict()
+_worker_max_handles = 64
+# Shared memory blocks created by the worker, kept open until the parent has
+# copied the data out. On Windows, a block is destroyed when its last handle is
+# closed, i.e., before the parent can attach if the worker closed it first.
+_worker_blocks = {}
+# bytes before the data in the block, the first byte is set by the parent once
+# the data is copied out
+_BLOCK_HEADER = 8
+
+
+def _close_worker_handles():
+    while _worker_handles:
+        _, fid = _worker_handles.popitem(last=False)
+        try:
+            fid.close()
+        except Exception:
+            pass
+
+
+def _close_worker_blocks(force=False):
+    # closes the blocks released by the parent, all of them when force is True
+    for name in list(_worker_blocks):
+        shm = _worker_blocks[name]
+        if force or shm.buf[0]:
+            del _worker_blocks[name]
+            shm.close()
+
+
+def _init_worker(max_handles):
+    global _worker_max_handles
+    _worker_max_handles = max_handles
+    # atexit handlers are not called in multiprocessing workers, Finalize is
+    util.Finalize(None, _close_worker_handles, exitpriority=10)
+    util.Finalize(None, _close_worker_blocks, args=(True,), exitpriority=10)
+
+
+def _get_handle(dss_file):
+    fid = _worker_handles.get(dss_file)
+    if fid is None:
+        fid = Open(dss_file, mode="r")
+        _worker_handles[dss_file] = fid
+        while len(_worker_handles) > _worker_max_handles:
+            _, old = _worker_handles.popitem(last=False)
+            old.close()
+    else:
+        _worker_handles.move_to_end(dss_file)
+    return fid
+
+
+def _to_shared_memory(*arrays):
+    """Copies arrays one after another into new shared memory block.
+    Returns name of the block or None when arrays are empty. The block stays
+    open in this worker until the parent releases it (_from_shared_memory)."""
+    _close_worker_blocks()
+    size = sum(arr.nbytes for arr in arrays)
+    if size == 0:
+        return None
+    shm = SharedMemory(create=True, size=_BLOCK_HEADER + size)
+    try:
+        shm.buf[0] = 0
+        offset = _BLOCK_HEADER
+        for arr in arrays:
+            np.ndarray(arr.shape, arr.dtype, buffer=shm.buf, offset=offset)[...] = arr
+            offset += arr.nbytes
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    _worker_blocks[shm.name] = shm
+    return shm.name
+
+
+def _read_ts_task(dss_file, pathname, window, trim_missing, regular):
+    fid = _get_handle(dss_file)
+    results, errors = fid.read_ts_many(
+        [pathname], window=window, trim_missing=trim_missing, regular=regular
+    )
+    if errors:
+        raise errors[pathname]
+    ts = results[pathname]
+    # missing values are replaced by NaN in place, only one copy into shared memory
+    series = ts.to_series(copy=False)
+    times = series.index.values
+    values = series.values
+    name = _to_shared_memory(times, values)
+    return name, len(values), times.dtype.str, values.dtype.str
+
+
+def _read_grid_task(dss_file, pathname):
+    fid = _get_handle(dss_file)
+    ds = fid.read_grid(pathname)
+    if ds is None:
+        raise DssStatusException(-1, "Could not read grid %s" % pathname)
+    data = np.ma.getdata(ds.read())
+    name = _to_shared_memory(data)
+    return name, data.shape, data.dtype.str, ds.nullValue(), ds.gridinfo
+
+
+# Parent side
+def _from_shared_memory(name, layout):
+    """Copies out arrays of given (shape, dtype) layout from shared memory block
+    and releases the block."""
+    if name is None:
+        return [np.empty(shape, dtype) for shape, dtype in layout]
+    shm = SharedMemory(name=name)
+    try:
+        arrays = []
+        offset = _BLOCK_HEADER
+        for shape, dtype in layout:
+            arr = np.ndarray(shape, dtype, buffer=shm.buf, offset=offset).copy()
+            offset += arr.nbytes
+            arrays.append(arr)
+        return arrays
+    finally:
+        # the worker closes its handle at its next task
+        shm.buf[0] = 1
+        shm.close()
+        shm.unlink()
+
+
+def _ts_result(pathname, result):
+    name, num, times_dtype, dtype = result
+    times, values = _from_shared_memory(name, [((num,), times_dtype), ((num,), dtype)])
+    index = pd.DatetimeIndex(times)
+    return pd.Series(values, index=index, name=pathname, copy=False)
+
+
+def _grid_result(pathname, result):
+    name, shape, dtype, nodata, gridinfo = result
+    (data,) = _from_shared_memory(name, [(shape, dtype)])
+    return np.ma.masked_values(data, nodata, copy=False), gridinfo
+
+
+class ParallelReader:
+    """Reads the same record from many DSS files using a pool of worker processes.
+
+    Each worker process opens the files it is asked to read in read-only mode and
+    keeps the handles open for the following requests. The data read by a worker
+    is passed back to this process through a shared memory block, not pickled.
+    The number of requests submitted to the pool at any time is limited to
+    max_in_flight, so the memory used stays flat however many files are read.
+
+    Parameter
+    ---------
+        max_workers: int, default os.cpu_count()
+            number of worker processes
+
+        max_in_flight: int, default 2 * max_workers
+            maximum number of read requests submitted to the pool at a time
+
+        max_handles: int, default 64
+            maximum number of dss files each worker keeps open
+
+        mp_context: str, optional
+            multiprocessing start method, e.g., 'spawn', 'fork'
+
+    Examples
+    ---------
+        >>> with ParallelReader(max_workers=4) as reader:
+        ...     df, errors = reader.read_ts(files, pathname, window=window)
+
+        >>> with ParallelReader() as reader:
+        ...     for dss_file, series, error in reader.iter_ts(files, pathname):
+        ...         pass
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        max_handles: int = 64,
+        mp_context: Optional[str] = None,
+    ) -> None:
+        max_workers = max_workers or os.cpu_count() or 1
+        max_in_flight = max_in_flight or 2 * max_workers
+        if max_in_flight < 1 or max_handles < 1:
+            raise ArgumentException("max_in_flight and max_handles must be positive")
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=get_context(mp_context) if mp_context else None,
+            initializer=_init_worker,
+            initargs=(max_handles,),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Shuts down the worker processes, closing the dss files they opened"""
+        self._executor.shutdown(wait=True)
+
+    def _imap(self, files, task, make_result, pathname, *args):
+        pending = {}
+        files = iter(files)
+        try:
+            while True:
+                for dss_file in files:
+                    dss_file = str(dss_file)
+                    future = self._executor.submit(task, dss_file, pathname, *args)
+                    pending[future] = dss_file
+                    if len(pending) >= self.max_in_flight:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    dss_file = pending.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        try:
+                            # the block is released even when the result cannot be built
+                            result = make_result(pathname, future.result())
+                        except Exception as err:
+                            error = err
+                    if error is None:
+                        yield dss_file, result, None
+                    else:
+                        yield dss_file, None, error
+        finally:
+            # generator closed early, release shared memory of unconsumed results
+            for future in pending:
+                if not future.cancel() and future.exception() is None:
+                    _from_shared_memory(future.result()[0], [])
+
+    def iter_ts(
+        self,
+        files: Iterable[PathType],
+        pathname: str,
+        window: Optional[DateWindow] = None,
+        trim_missing: bool = False,
+        regular: bool = True,
+    ) -> Iterator[Tuple[str, Optional[pd.Series], Optional[Exception]]]:
+        """Reads time-series record from each file and yields (file, series, error)
+        in the order the reads complete. Missing values are NaN in the series.
+
+        window, trim_missing, regular are same as Open.read_ts
+        """
+        if window:
+            # parsed once here, the workers receive plain strings
+            sday, stime, eday, etime = _format_window(window)
+            window = ("%s %s" % (sday, stime), "%s %s" % (eday, etime))
+        return self._imap(
+            files, _read_ts_task, _ts_result, pathname, window, trim_missing, regular
+        )
+
+    def read_ts(
+        self,
+        files: Iterable[PathType],
+        pathname: str,
+        window: Optional[DateWindow] = None,
+        trim_missing: bool = False,
+        regular: bool = True,
+        wide: bool = False,
+    ) -> Tuple[Union[Dict[str, pd.Series], pd.DataFrame], Dict[str, Exception]]:
+        """Reads time-series record from each file
+
+        Returns
+        --------
+            tuple of (results, errors)
+            results: dict of file -> Series, or DataFrame with one column per file if wide
+            errors: dict of file -> exception for the files that could not be read
+        """
+        results = {}
+        errors = {}
+        for dss_file, series, error in self.iter_ts(
+            files, pathname, window, trim_missing, regular
+        ):
+            if error is None:
+                results[dss_file] = series
+            else:
+                errors[dss_file] = error
+        if wide and results:
+            results = pd.concat(results, axis=1)
+        return results, errors
+
+    def iter_grid(
+        self, files: Iterable[PathType], pathname: str
+    ) -> Iterator[Tuple[str, Optional[Tuple[Any, Any]], Optional[Exception]]]:
+        """Reads grid record from each file and yields (file, (data, gridinfo), error)
+        in the order the reads complete. data is masked array same as SpatialGridStruct.read
+        """
+        return self._imap(files, _read_grid_task, _grid_result, pathname)
+
+    def read_grid(
+        self, files: Iterable[PathType], pathname: str
+    ) -> Tuple[Dict[str, Tuple[Any, Any]], Dict[str, Exception]]:
+        """Reads grid record from each file
+
+        Returns
+        --------
+            tuple of (results, errors)
+            results: dict of file -> (masked array, gridinfo)
+            errors: dict of file -> exception for the files that could not be read
+        """
+        results = {}
+        errors = {}
+        for dss_file, result, error in self.iter_grid(files, pathname):
+            if error is None:
+                results[dss_file] = result
+            else:
+                errors[dss_file] = error
+        return results, errors
@@ -0,0 +1,273 @@
+"""
+Process-wide pool of open DSS file handles
+"""
+
+__all__ = ["DssHandlePool", "PoolInfo", "default_pool"]
+
+import os
+import atexit
+import threading
+from time import monotonic
+from contextlib import contextmanager
+from collections import OrderedDict, namedtuple
+from typing import Iterator, Optional
+
+from .HecDss import Open, PathType
+from ...core import ArgumentException
+
+PoolInfo = namedtuple(
+    "PoolInfo", ["hits", "misses", "reopens", "evictions", "handles", "in_use", "max_handles"]
+)
+
+
+def _file_stamp(dss_path):
+    try:
+        st = os.stat(dss_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _PoolEntry:
+    __slots__ = ("fid", "refs", "last_used", "stamp", "stale")
+
+    def __init__(self, fid, stamp):
+        self.fid = fid
+        self.refs = 0
+        self.last_used = monotonic()
+        # file (mtime, size) after the last use of the handle by this process
+        self.stamp = stamp
+        # removed from the pool while in use, closed when the last user releases it
+        self.stale = False
+
+
+class DssHandlePool:
+    """Keeps recently used Open objects alive so that opening the same file again
+    does not pay for zopen and zclose.
+
+    Handles are keyed by (absolute path, mode, version), read-only and read-write
+    handles of a file are separate. A handle is shared by all the users that acquired
+    it and is opened with threadsafe=True by default. Handles not in use are closed
+    when more than max_handles are open (least recently used first) or when they are
+    not used for idle_timeout seconds.
+
+    A handle is replaced by a new one when the file modification time or size differs
+    from the one seen when the handle was opened or last released, i.e., the file was
+    written by another process or handle. Read-only handles are checked on every
+    acquire; a changed handle still in use is removed from the pool and closed when
+    its last user releases it. Read-write handles are checked only when they are not
+    in use, because the writes of their own users change the file too; the changes of
+    others are noticed after all the users release the handle.
+
+    The pooled handles must be returned with release (or the open context manager),
+    not closed.
+
+    Parameter
+    ---------
+        max_handles: int, default 32
+            maximum number of open handles, handles in use are never closed
+        idle_timeout: float, default 300
+            seconds after which unused handle is closed, None to keep it open
+        threadsafe: bool, default True
+            passed to Open
+
+    Examples
+    ---------
+        >>> pool = DssHandlePool(max_handles=8)
+        >>> with pool.open("example.dss", mode="r") as fid:
+        ...     ts = fid.read_ts(pathname)
+
+        >>> with default_pool().open("example.dss") as fid:
+        ...     fid.put_ts(tsc)
+    """
+
+    def __init__(
+        self,
+        max_handles: int = 32,
+        idle_timeout: Optional[float] = 300.0,
+        threadsafe: bool = True,
+    ) -> None:
+        if max_handles < 1:
+            raise ArgumentException("max_handles must be positive")
+        self.max_handles = max_handles
+        self.idle_timeout = idle_timeout
+        self.threadsafe = threadsafe
+        self._entries = OrderedDict()
+        # handle id -> (key, entry), includes stale entries still in use
+        self._acquired = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reopens = 0
+        self.evictions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def acquire(
+        self, dss_path: PathType, mode: str = "r", version: Optional[int] = None
+    ) -> Open:
+        """Returns open handle of the file, opening it when the pool does not have one.
+        Every acquire must be followed by release of the handle.
+        """
+        dss_path = os.path.abspath(str(dss_path))
+        key = (dss_path, mode, version)
+        to_close = []
+        with self._lock:
+            entry = self._lookup(key, to_close)
+            if entry is not None:
+                self.hits += 1
+                self._checkout(key, entry, to_close)
+        if entry is not None:
+            self._close_all(to_close)
+            return entry.fid
+
+        # zopen can be slow, the pool is not locked meanwhile
+        try:
+            fid = Open(dss_path, version=version, mode=mode, threadsafe=self.threadsafe)
+        except BaseException:
+            self._close_all(to_close)
+            raise
+        stamp = _file_stamp(dss_path)
+
+        with self._lock:
+            self.misses += 1
+            entry = self._lookup(key, to_close)
+            if entry is None:
+                entry = _PoolEntry(fid, stamp)
+                self._entries[key] = entry
+            else:
+                # opened by another thread meanwhile
+                to_close.append(fid)
+            self._checkout(key, entry, to_close)
+        self._close_all(to_close)
+        return entry.fid
+
+    def _lookup(self, key, to_close):
+        # Returns the usable entry of key, None if the file must be (re)opened.
+        # Must be called holding the pool lock.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.stamp != _file_stamp(key[0]) and (entry.refs == 0 or key[1] == "r"):
+            # written by another process (or other handle) since our last use
+            self.reopens += 1
+            del self._entries[key]
+            if entry.refs:
+                entry.stale = True
+            else:
+                to_close.append(entry.fid)
+            return None
+        return entry
+
+    def _checkout(self, key, entry, to_close):
+        # Counts new user of the entry, must be called holding the pool lock.
+        # Adds the evicted handles to to_close.
+        self._entries.move_to_end(key)
+        entry.refs += 1
+        entry.last_used = monotonic()
+        self._acquired[id(entry.fid)] = (key, entry)
+        to_close.extend(self._evict())
+
+    def release(self, fid: Open) -> None:
+        """Returns handle obtained from acquire to the pool"""
+        to_close = []
+        with self._lock:
+            item = self._acquired.get(id(fid))
+            if item is None:
+                raise ArgumentException("Handle does not belong to this pool")
+            key, entry = item
+            entry.refs -= 1
+            entry.last_used = monotonic()
+            if entry.refs == 0:
+                del self._acquired[id(fid)]
+                if entry.stale:
+                    to_close.append(entry.fid)
+                else:
+                    # changes made through this handle do not cause reopen
+                    entry.stamp = _file_stamp(key[0])
+            to_close.extend(self._evict())
+        self._close_all(to_close)
+
+    @contextmanager
+    def open(
+        self, dss_path: PathType, mode: str = "r", version: Optional[int] = None
+    ) -> Iterator[Open]:
+        """Context manager that acquires the handle and releases it on exit"""
+        fid = self.acquire(dss_path, mode, version)
+        try:
+            yield fid
+        finally:
+            self.release(fid)
+
+    def _evict(self):
+        # Removes idle entries over the size limit and timed out entries.
+        # Returns handles to close outside the pool lock.
+        to_close = []
+        now = monotonic()
+        for key in list(self._entries):
+            entry = self._entries[key]
+            if entry.refs:
+                continue
+            timed_out = self.idle_timeout is not None and now - entry.last_used > self.idle_timeout
+            if timed_out or len(self._entries) > self.max_handles:
+                del self._entries[key]
+                self.evictions += 1
+                to_close.append(entry.fid)
+        return to_close
+
+    @staticmethod
+    def _close_all(handles):
+        for fid in handles:
+            fid.close()
+
+    def prune(self) -> None:
+        """Closes the handles not used for idle_timeout seconds"""
+        with self._lock:
+            to_close = self._evict()
+        self._close_all(to_close)
+
+    def close(self) -> None:
+        """Closes the handles not in use and forgets the others, which are closed
+        when they are released"""
+        with self._lock:
+            to_close = []
+            for entry in self._entries.values():
+                if entry.refs:
+                    entry.stale = True
+                else:
+                    to_close.append(entry.fid)
+            self._entries.clear()
+        self._close_all(to_close)
+
+    def info(self) -> PoolInfo:
+        with self._lock:
+            return PoolInfo(
+                self.hits,
+                self.misses,
+                self.reopens,
+                self.evictions,
+                len(self._entries),
+                len(self._acquired),
+                self.max_handles,
+            )
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool() -> DssHandlePool:
+    """Returns the process-wide DssHandlePool, created with default settings on first call"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DssHandlePool()
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,294 @@
+"""
+Rating curves (stage-discharge, elevation-storage, ...) stored as paired data
+"""
+
+__all__ = ["RatingTable"]
+
+import logging
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .HecDss import Open, PathType, DateWindow
+from ...core import PairedDataStruct, TimeSeriesContainer, ArgumentException, UNDEFINED
+
+# curve values at or below are DSS missing values
+_MISSING = -3.0e38
+
+
+class RatingTable:
+    """Paired data curves prepared for repeated application to arrays of values.
+
+    The ordinates and curves are copied once into float64 arrays and validated when
+    the table is created: the ordinates must be strictly increasing (decreasing
+    ordinates are reversed) and, for log-log interpolation, positive. Missing curve
+    values (UNDEFINED) are NaN in the table and give NaN where they are used. All the values
+    of an array are interpolated together with numpy operations, there is no python
+    work per value.
+
+    A family of curves (e.g., one curve per gate opening) is interpolated between
+    the two curves bracketing the family parameter of each value. The parameters of
+    the curves are given by params, or parsed from the curve labels.
+
+    Values outside the ordinates range give NaN, unless extrapolate is True, in which
+    case the first or last segment of the curve is extended. NaN gives NaN.
+
+    Parameter
+    ---------
+        x: 1-D array of ordinates (independent values)
+        curves: 1-D array of one curve, or 2-D array of shape (ordinates, curves)
+        labels: list of curve labels, optional
+        params: family parameter of each curve, optional. Must be strictly increasing.
+        log: bool, default False
+            log-log interpolation if True, linear otherwise
+        extrapolate: bool, default False
+
+    Examples
+    ---------
+        >>> with Open("ratings.dss") as fid:
+        ...     rating = RatingTable.from_dss(fid, "/RIVER/GAGE/STAGE-FLOW///RATING/")
+        >>> flow = rating.apply(stage)
+
+        >>> gates = RatingTable.from_dss(fid, pathname, params="labels")
+        >>> flow = gates.apply(stage, param=opening)   # opening: scalar or array like stage
+    """
+
+    def __init__(
+        self,
+        x: Sequence[float],
+        curves: Union[np.ndarray, Sequence[float]],
+        labels: Optional[Sequence[str]] = None,
+        params: Optional[Sequence[float]] = None,
+        log: bool = False,
+        extrapolate: bool = False,
+        independent_units: str = "",
+        dependent_units: str = "",
+    ) -> None:
+        x = np.array(x, dtype=np.float64)
+        curves = np.array(curves, dtype=np.float64)
+        # DSS missing values, e.g., unused rows of preallocated paired data
+        x[x <= _MISSING] = np.nan
+        curves[curves <= _MISSING] = np.nan
+        if curves.ndim == 1:
+            curves = curves.reshape(-1, 1)
+        if x.ndim != 1 or curves.ndim != 2 or curves.shape[0] != len(x):
+            raise ArgumentException("curves must have one row per ordinate")
+        if len(x) < 2:
+            raise ArgumentException("Rating table needs at least two ordinates")
+        if not np.isfinite(x).all():
+            raise ArgumentException("Ordinates must be finite")
+        steps = np.diff(x)
+        if (steps < 0).all():
+            x = x[::-1].copy()
+            curves = curves[::-1].copy()
+        elif not (steps > 0).all():
+            raise ArgumentException("Ordinates must be strictly increasing or decreasing")
+
+        self.log = log
+        self.extrapolate = extrapolate
+        self.labels = list(labels) if labels else [str(i + 1) for i in range(curves.shape[1])]
+        self.independent_units = independent_units
+        self.dependent_units = dependent_units
+        # curve values (missing values skipped) increasing/decreasing with ordinates,
+        # needed for inverse
+        self.increasing = np.zeros(curves.shape[1], dtype=bool)
+        self.decreasing = np.zeros(curves.shape[1], dtype=bool)
+        for i in range(curves.shape[1]):
+            y = curves[:, i]
+            steps = np.diff(y[np.isfinite(y)])
+            if len(steps):
+                self.increasing[i] = (steps > 0).all()
+                self.decreasing[i] = (steps < 0).all()
+
+        if params is not None:
+            params = np.array(params, dtype=np.float64)
+            if params.shape != (curves.shape[1],) or not (np.diff(params) > 0).all():
+                raise ArgumentException("params must be strictly increasing, one per curve")
+        self.params = params
+
+        if log:
+            if (x <= 0).any() or (curves[np.isfinite(curves)] <= 0).any():
+                raise ArgumentException("log interpolation needs positive ordinates and curves")
+            x = np.log(x)
+            curves = np.log(curves)
+        self._x = x
+        # rows are curves, so that values of a curve are contiguous
+        self._curves = np.ascontiguousarray(curves.T)
+
+    @classmethod
+    def from_struct(
+        cls, pds: PairedDataStruct, params: Union[None, str, Sequence[float]] = None, **kwargs
+    ) -> "RatingTable":
+        """Creates table from PairedDataStruct. params="labels" parses the family
+        parameters from the curve labels. Other keyword arguments are same as RatingTable."""
+        x, curves, labels = pds.get_arrays()
+        labels = [label.strip() for label in labels] if labels else None
+        if isinstance(params, str):
+            if params != "labels" or not labels:
+                raise ArgumentException("params must be sequence of numbers or 'labels'")
+            try:
+                params = [float(label) for label in labels]
+            except ValueError:
+                raise ArgumentException("Curve labels are not numbers: %s" % labels)
+        kwargs.setdefault("independent_units", pds.independent_units)
+        kwargs.setdefault("dependent_units", pds.dependent_units)
+        return cls(x, curves, labels=labels, params=params, **kwargs)
+
+    @classmethod
+    def from_dss(
+        cls, fid: Open, pathname: PathType, params: Union[None, str, Sequence[float]] = None, **kwargs
+    ) -> "RatingTable":
+        """Reads paired data record and creates table, see from_struct"""
+        pds = fid.read_pd(pathname, dataframe=False)
+        if pds is None:
+            raise ArgumentException("Could not read paired data %s" % pathname)
+        return cls.from_struct(pds, params=params, **kwargs)
+
+    @property
+    def curve_no(self) -> int:
+        return self._curves.shape[0]
+
+    def _segments(self, xp, v):
+        # left ordinate index and position (0 to 1 inside the segment) of each value
+        k = np.searchsorted(xp, v, side="right") - 1
+        np.clip(k, 0, len(xp) - 2, out=k)
+        x0 = xp[k]
+        t = (v - x0) / (xp[k + 1] - x0)
+        if not self.extrapolate:
+            t[(t < 0) | (t > 1)] = np.nan
+        return k, t
+
+    def _curve_index(self, curve):
+        if isinstance(curve, str):
+            try:
+                return self.labels.index(curve)
+            except ValueError:
+                raise ArgumentException("No curve with label %s" % curve)
+        if not -self.curve_no <= curve < self.curve_no:
+            raise ArgumentException("Curve index %d out of range" % curve)
+        return curve % self.curve_no
+
+    def apply(
+        self,
+        values: Union[np.ndarray, Sequence[float]],
+        curve: Union[int, str] = 0,
+        param: Union[None, float, np.ndarray] = None,
+    ) -> np.ndarray:
+        """Returns float64 array of the curve values at the given values
+
+        Parameter
+        ---------
+            values: array of independent values, any shape
+            curve: index (0 based) or label of the curve, default first curve.
+                   Not used when param is given.
+            param: family parameter, scalar or array of the same shape as values.
+                   The result is interpolated between the curves with the closest parameters.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            v = np.log(values) if self.log else values
+            k, t = self._segments(self._x, v.ravel())
+            if param is None:
+                y = self._curves[self._curve_index(curve)]
+                out = y[k] + t * (y[k + 1] - y[k])
+            else:
+                out = self._apply_family(k, t, param, v.size)
+            if self.log:
+                np.exp(out, out=out)
+        return out.reshape(values.shape)
+
+    def _apply_family(self, k, t, param, size):
+        if self.params is None:
+            raise ArgumentException("Table has no family parameters, create it with params")
+        if len(self.params) < 2:
+            raise ArgumentException("Family interpolation needs at least two curves")
+        param = np.asarray(param, dtype=np.float64)
+        param = np.full(size, param) if param.ndim == 0 else param.ravel()
+        if param.size != size:
+            raise ArgumentException("param must be scalar or have the same shape as values")
+        j, w = self._segments(self.params, param)
+        ys = self._curves
+        lower = ys[j, k] + t * (ys[j, k + 1] - ys[j, k])
+        upper = ys[j + 1, k] + t * (ys[j + 1, k + 1] - ys[j + 1, k])
+        return lower + w * (upper - lower)
+
+    def inverse(
+        self, values: Union[np.ndarray, Sequence[float]], curve: Union[int, str] = 0
+    ) -> np.ndarray:
+        """Returns float64 array of the ordinates at which the curve has the given values,
+        e.g., stage for discharge. The curve must be strictly monotonic, its missing
+        values are skipped."""
+        index = self._curve_index(curve)
+        y = self._curves[index]
+        xp = self._x
+        valid = np.isfinite(y)
+        if not valid.all():
+            y = y[valid]
+            xp = xp[valid]
+        if self.decreasing[index]:
+            y = y[::-1]
+            xp = xp[::-1]
+        elif not self.increasing[index]:
+            raise ArgumentException("Curve %s is not strictly monotonic" % self.labels[index])
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            v = np.log(values) if self.log else values
+            k, t = self._segments(y, v.ravel())
+            out = xp[k] + t * (xp[k + 1] - xp[k])
+            if self.log:
+                np.exp(out, out=out)
+        return out.reshape(values.shape)
+
+    def apply_ts(
+        self,
+        fid: Open,
+        pathname: PathType,
+        out_pathname: str,
+        window: Optional[DateWindow] = None,
+        regular: bool = True,
+        curve: Union[int, str] = 0,
+        param: Union[None, float, np.ndarray] = None,
+        units: Optional[str] = None,
+        type: Optional[str] = None,
+    ):
+        """Reads time-series record, applies the curve to its values and writes the result
+        to out_pathname in the same file. Missing values stay missing.
+
+        Parameter
+        ---------
+            pathname, window, regular: same as Open.read_ts
+            curve, param: same as apply
+            units: units of the result, default dependent units of the paired data
+            type: data type of the result, default type of the read time-series
+
+        Returns
+        --------
+            written TimeSeriesStruct, None on failure
+        """
+        ts = fid.read_ts(pathname, window=window, regular=regular)
+        if ts is None:
+            return
+        series = ts.to_series(copy=True)
+        if not len(series):
+            logging.error("No values to apply the rating to in %s" % pathname)
+            return
+        result = self.apply(series.values, curve=curve, param=param)
+        units = self.dependent_units if units is None else units
+        type = ts.type if type is None else type
+        if regular:
+            return fid.put_series(
+                pd.Series(result, index=series.index, copy=False), out_pathname, units, type
+            )
+
+        values = result.astype(np.float32)
+        values[np.isnan(values)] = UNDEFINED
+        tsc = TimeSeriesContainer()
+        tsc.pathname = out_pathname
+        tsc.interval = -1
+        tsc.times = series.index
+        tsc.values = values
+        tsc.numberValues = len(values)
+        tsc.units = units
+        tsc.type = type
+        return fid.put_ts(tsc)
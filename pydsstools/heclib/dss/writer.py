@@ -0,0 +1,305 @@
+"""
+Background writer serializing writes of many producers into one DSS file
+"""
+
+__all__ = ["DssWriter"]
+
+import queue
+import atexit
+import asyncio
+import logging
+import threading
+from time import perf_counter
+from concurrent.futures import Future
+from typing import Any, Optional, Dict
+
+from .HecDss import Open, PathType
+from ...core import DssStatusException
+
+_STOP = object()
+
+
+class _Job:
+    __slots__ = ("method", "args", "kwargs", "future", "submitted")
+
+    def __init__(self, method, args, kwargs):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.submitted = perf_counter()
+
+
+class DssWriter:
+    """Writes records to a DSS file from a dedicated thread.
+
+    The writer thread opens the file in 'rw' mode and is the only user of the handle.
+    Producers (any number of threads or asyncio tasks) submit jobs to a bounded queue
+    and get a concurrent.futures.Future, or await the job with the async methods.
+    Consecutive put_ts jobs found in the queue are written together with put_ts_many.
+
+    put_ts jobs return 0 on success and raise the exception of the failed write.
+    put_pd, put_grid and put_series jobs return the value returned by the Open method.
+    The queued jobs are written before the interpreter exits if close is not called.
+
+    Parameter
+    ---------
+        dss_path: path of the dss file
+        version: 6 or 7, same as Open
+        max_queue: int, default 1000
+            maximum number of queued jobs, submitting blocks when the queue is full
+        batch_size: int, default 256
+            maximum number of put_ts jobs written in one put_ts_many call
+
+    Examples
+    ---------
+        >>> with DssWriter("ingest.dss") as writer:
+        ...     future = writer.submit_ts(tsc)   # non-blocking
+        ...     writer.put_ts(tsc2)              # blocks until written
+        ...     print(writer.stats())
+
+        >>> await writer.aput_ts(tsc)            # in asyncio task
+    """
+
+    def __init__(
+        self,
+        dss_path: PathType,
+        version: Optional[int] = None,
+        max_queue: int = 1000,
+        batch_size: int = 256,
+    ) -> None:
+        self.dss_path = str(dss_path)
+        self.batch_size = max(1, batch_size)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        # closed check and enqueue of a job are atomic, no job is queued after _STOP
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._written = 0
+        self._failed = 0
+        self._batches = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._latency_last = 0.0
+
+        self._ready = threading.Event()
+        self._open_error = None
+        self._thread = threading.Thread(
+            target=self._run, args=(version,), name="DssWriter", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._open_error is not None:
+            raise self._open_error
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # Writer thread
+    def _run(self, version):
+        try:
+            fid = Open(self.dss_path, version=version, mode="rw")
+        except BaseException as err:
+            self._open_error = err
+            self._ready.set()
+            return
+        self._ready.set()
+
+        pending = None
+        try:
+            while True:
+                job = pending if pending is not None else self._queue.get()
+                pending = None
+                if job is _STOP:
+                    self._queue.task_done()
+                    break
+                if job.method == "put_ts" and not job.kwargs:
+                    # collect consecutive put_ts jobs already queued
+                    batch = [job]
+                    while len(batch) < self.batch_size:
+                        try:
+                            nxt = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if nxt is not _STOP and nxt.method == "put_ts" and not nxt.kwargs:
+                            batch.append(nxt)
+                        else:
+                            pending = nxt
+                            break
+                    self._write_ts_batch(fid, batch)
+                else:
+                    self._write_one(fid, job)
+        finally:
+            fid.close()
+            if pending is not None and pending is not _STOP:
+                self._finish(pending, error=RuntimeError("DssWriter is closed"))
+            self._fail_queued()
+            with self._submit_lock:
+                self._closed = True
+            self._fail_queued()
+
+    def _fail_queued(self):
+        # jobs left in the queue when the writer thread stops
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is _STOP:
+                self._queue.task_done()
+            else:
+                self._finish(job, error=RuntimeError("DssWriter is closed"))
+
+    def _write_ts_batch(self, fid, batch):
+        try:
+            status, errors = fid.put_ts_many([job.args[0] for job in batch])
+        except BaseException as err:
+            status = None
+            error = err
+        with self._lock:
+            self._batches += 1
+        for i, job in enumerate(batch):
+            if status is None:
+                self._finish(job, error=error)
+            elif status[i] == 0:
+                self._finish(job, result=0)
+            else:
+                error_i = errors.get(i)
+                if error_i is None:
+                    error_i = DssStatusException(
+                        int(status[i]), "Failed to write %s" % job.args[0].pathname
+                    )
+                self._finish(job, error=error_i)
+
+    def _write_one(self, fid, job):
+        with self._lock:
+            self._batches += 1
+        try:
+            result = getattr(fid, job.method)(*job.args, **job.kwargs)
+        except BaseException as err:
+            self._finish(job, error=err)
+        else:
+            if job.method == "put_ts":
+                if result is None:
+                    self._finish(job, error=DssStatusException(-1, "Failed to write time-series"))
+                else:
+                    self._finish(job, result=0)
+            else:
+                self._finish(job, result=result)
+
+    def _finish(self, job, result=None, error=None):
+        latency = perf_counter() - job.submitted
+        with self._lock:
+            if error is None:
+                self._written += 1
+            else:
+                self._failed += 1
+            self._latency_sum += latency
+            self._latency_max = max(self._latency_max, latency)
+            self._latency_last = latency
+        if error is None:
+            job.future.set_result(result)
+        else:
+            logging.debug("DssWriter job %s failed: %s", job.method, error)
+            job.future.set_exception(error)
+        self._queue.task_done()
+
+    # Producer API
+    def _new_job(self, method, args, kwargs):
+        if self._closed:
+            raise RuntimeError("DssWriter is closed")
+        if not method.startswith("put_"):
+            raise ValueError("Only put_* methods can be submitted")
+        return _Job(method, args, kwargs)
+
+    def _enqueue(self, job):
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("DssWriter is closed")
+            self._queue.put(job)
+
+    def _try_enqueue(self, job):
+        # non-blocking _enqueue, False when the lock is taken or the queue is full
+        if not self._submit_lock.acquire(blocking=False):
+            return False
+        try:
+            if self._closed:
+                raise RuntimeError("DssWriter is closed")
+            self._queue.put_nowait(job)
+            return True
+        except queue.Full:
+            return False
+        finally:
+            self._submit_lock.release()
+
+    def submit(self, method: str, *args: Any, **kwargs: Any) -> Future:
+        """Queues call of the Open write method (put_ts, put_pd, put_grid, put_grid0,
+        put_series, ...) and returns Future of its result. Blocks while the queue is full.
+        """
+        job = self._new_job(method, args, kwargs)
+        self._enqueue(job)
+        return job.future
+
+    def submit_ts(self, tsc: Any) -> Future:
+        return self.submit("put_ts", tsc)
+
+    def put_ts(self, tsc: Any, timeout: Optional[float] = None) -> int:
+        return self.submit("put_ts", tsc).result(timeout)
+
+    def put_pd(self, *args: Any, **kwargs: Any) -> Any:
+        return self.submit("put_pd", *args, **kwargs).result()
+
+    def put_grid(self, *args: Any, **kwargs: Any) -> Any:
+        return self.submit("put_grid", *args, **kwargs).result()
+
+    async def asubmit(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Awaitable version of submit, waits for the result without blocking event loop"""
+        job = self._new_job(method, args, kwargs)
+        if not self._try_enqueue(job):
+            # wait for space in the queue outside the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self._enqueue, job)
+        return await asyncio.wrap_future(job.future)
+
+    async def aput_ts(self, tsc: Any) -> int:
+        return await self.asubmit("put_ts", tsc)
+
+    async def aput_pd(self, *args: Any, **kwargs: Any) -> Any:
+        return await self.asubmit("put_pd", *args, **kwargs)
+
+    async def aput_grid(self, *args: Any, **kwargs: Any) -> Any:
+        return await self.asubmit("put_grid", *args, **kwargs)
+
+    def flush(self) -> None:
+        """Blocks until all the queued jobs are written"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Writes the queued jobs, stops the writer thread and closes the file"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread.is_alive():
+                self._queue.put(_STOP)
+        atexit.unregister(self.close)
+        self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns queue depth, number of written/failed jobs, number of write calls
+        (batches) and job latency (seconds from submit to written)"""
+        with self._lock:
+            done = self._written + self._failed
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "written": self._written,
+                "failed": self._failed,
+                "batches": self._batches,
+                "latency_mean": self._latency_sum / done if done else 0.0,
+                "latency_max": self._latency_max,
+                "latency_last": self._latency_last,
+            }
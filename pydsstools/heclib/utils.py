@@ -15,6 +15,7 @@ from ..core import (
 from ..core import GRID_TYPE, GRID_DATA_TYPE, GRID_COMPRESSION_METHODS
 from ..core import Open as _Open
 from ..core import UNDEFINED, SHG_WKT, HRAP_WKT
+from ..core import grid_stats
 import atexit
 from affine import Affine
 
@@ -129,9 +130,13 @@ grid_data_type_names = tuple(GRID_DATA_TYPE.keys())
 grid_type_names = tuple(GRID_TYPE.keys())
 
 
-def compute_grid_stats(data, compute_range=True):
+def compute_grid_stats(data, compute_range=True, nodata=None):
     """Compute statistical value for numpy array data for Spatial grid
 
+    The masked, nodata and NaN cells are skipped without copying the data. min, max,
+    mean and the counts of explicit range values are computed in one pass over the
+    cells, the default range values depend on min and max and need a second pass.
+
     Parameter
     ---------
         # data: numpy array or masked array
@@ -139,6 +144,7 @@ def compute_grid_stats(data, compute_range=True):
             # boolean - True, False
             # string - quartiles, quarters, TODO
             # list/tuple - list of values (max 19 excluding nodata) to compute equal to greater than cell counts
+        # nodata: value of cells without data, optional
     """
     logging.info("Computing grid statistics")
     result = {
@@ -154,34 +160,41 @@ def compute_grid_stats(data, compute_range=True):
         logging.info("Empty Grid Array!")
         return
 
+    mask = None
     if isinstance(data, ma.core.MaskedArray):
-        data = data[~data.mask]
-        data = data._data
-    elif isinstance(data, np.ndarray):
-        data = data[~np.isnan(data)]
-    else:
+        if data.mask is not ma.nomask:
+            mask = np.ravel(data.mask)
+        data = data.data
+    elif not isinstance(data, np.ndarray):
         raise Exception("Invalid data. Numpy or Masked Array expected.")
+    # view of the data unless it is not contiguous float32 array
+    data = np.ravel(np.ascontiguousarray(data, dtype=np.float32))
 
-    min_value = data.min()
-    max_value = data.max()
-    mean_value = data.mean()
+    explicit_range = isinstance(compute_range, (list, tuple))
+    range_values = []
+    if explicit_range:
+        range_values = sorted([x for x in compute_range if not np.isnan(x)])
+
+    count, min_value, max_value, mean_value, counts = grid_stats(
+        data, mask, nodata, range_values
+    )
+    if count == 0:
+        logging.info("Grid has no valid cells!")
 
     result.update(
         [("min_val", min_value), ("max_val", max_value), ("mean_val", mean_value)]
     )
-    # print(result)
 
-    range_values = []
-    if isinstance(compute_range, (list, tuple)):
-        range_values = sorted(
-            [
-                x
-                for x in compute_range
-                if not (np.isnan(x) or x < min_value or x > max_value)
-            ]
-        )
-
-    elif compute_range or isinstance(compute_range, str):
+    if explicit_range:
+        selected = [
+            (x, n)
+            for x, n in zip(range_values, counts.tolist())
+            if not (x < min_value or x > max_value)
+        ]
+        range_values = [x for x, _ in selected]
+        counts = [n for _, n in selected]
+
+    elif count and (compute_range or isinstance(compute_range, str)):
         # default range
         if min_value < 0 and max_value > 0:
             range_values = np.linspace(min_value, max_value, 10)
@@ -192,18 +205,16 @@ def compute_grid_stats(data, compute_range=True):
             q2 = 0.5 * (min_value + max_value)
             q3 = 0.75 * (min_value + max_value)
             range_values = [q0, q1, q2, q3]
-        range_values = [round(x, 2) for x in range_values]
+        range_values = [round(x, 2) for x in range_values][0:19]
+        counts = grid_stats(data, mask, nodata, range_values, stats=False)[4].tolist()
     else:
-        pass
+        range_values = []
+        counts = []
 
     range_values = range_values[0:19]
     range_values.insert(0, np.nan)
     range_counts = [total_cells]  # assuming no data is very small negative number
-    # print(type(data),'data=',data,'\n')
-    # print(range_values,range_counts)
-    for val in range_values[1:]:
-        count = (data >= val).sum()
-        range_counts.append(count)
+    range_counts.extend(counts[0:19])
 
     result.update([("range_vals", range_values), ("range_counts", range_counts)])
     logging.info(result)
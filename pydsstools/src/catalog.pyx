@@ -70,6 +70,39 @@ cdef class CatalogStruct:
 
         return typeList
 
+    cpdef list getLastWriteTimes(self):
+        """Returns last write time of each record, milliseconds since 1970"""
+        cdef:
+            list timeList = []
+            int num = self.numberPathnames()
+            int i 
+
+        if num and self.cts[0].lastWriteTimeRecord:
+            for i in range(0,num):
+                timeList.append(self.cts[0].lastWriteTimeRecord[i])
+
+        return timeList
+
+    cpdef list getStartDates(self):
+        """Returns julian date of the first data of each record, empty list when
+           the catalog is created without includeDates"""
+        cdef:
+            int num = self.numberPathnames()
+
+        if num and self.cts[0].startDates:
+            return [self.cts[0].startDates[i] for i in range(num)]
+        return []
+
+    cpdef list getEndDates(self):
+        """Returns julian date of the last data of each record, empty list when
+           the catalog is created without includeDates"""
+        cdef:
+            int num = self.numberPathnames()
+
+        if num and self.cts[0].endDates:
+            return [self.cts[0].endDates[i] for i in range(num)]
+        return []
+
     cpdef int numberPathnames(self):
         cdef int num = 0
         if self.cts:
@@ -85,7 +118,8 @@ cdef class CatalogStruct:
             zstructFree(self.cts)
 
 cpdef CatalogStruct getPathnameCatalog(Open fid,str pathWithWild, bint sort=0,
-                                       int statusWanted=0, int typeWantedStart=0, int typeWantedEnd=0):
+                                       int statusWanted=0, int typeWantedStart=0, int typeWantedEnd=0,
+                                       bint includeDates=0):
     cdef:
         long long *ifltab = fid.ifltab
         char *pathname = pathWithWild
@@ -99,8 +133,11 @@ cpdef CatalogStruct getPathnameCatalog(Open fid,str pathWithWild, bint sort=0,
     cts[0].statusWanted = statusWanted 
     cts[0].typeWantedStart = typeWantedStart 
     cts[0].typeWantedEnd = typeWantedEnd  
+    cts[0].boolIncludeDates = includeDates
 
-    negative_or_numberPathnames = zcatalog(ifltab,pathname,cts,sort)
+    with fid._lock, fid._io_lock:
+        with nogil:
+            negative_or_numberPathnames = zcatalog(ifltab,pathname,cts,sort)
     if negative_or_numberPathnames < 0: 
        logging.warning('Error with retrieving catalog, CODE = %d' % negative_or_numberPathnames) 
     #print('zcatalog return = %d'% negative_or_numberPathnames) 
@@ -113,6 +150,7 @@ cpdef int deletePathname(Open fid,str pathname):
         const char *path_name = pathname
         int status
 
-    status = zdelete(ifltab,path_name)
+    with fid._lock, _heclib_lock:
+        status = zdelete(ifltab,path_name)
     return status
 
@@ -63,7 +63,7 @@ cdef extern from "heclib.h":
     int zdelete(long long *ifltab, const char* pathname)
     # 
     int zcheck(long long *ifltab, const char* pathname)
-    int zcatalog(long long *ifltab, const char *pathWithWild, zStructCatalog *catStruct, int boolSorted)
+    int zcatalog(long long *ifltab, const char *pathWithWild, zStructCatalog *catStruct, int boolSorted) nogil
     int zcatalogFile(long long *ifltab, const char *catalogFilename, int boolSorted, const char *pathWithWildChars)
     int zcatalogToFile(long long *ifltab, int catalogHandle, int fortranUnit, int boolSorted)
     int zdataType (long long *ifltab, const char* pathname)
@@ -96,7 +96,7 @@ cdef extern from "heclib.h":
                 int *userHeader, int *userHeaderArraySize, int *userHeaderNumber,              # &0 ...
                 int *values, int *valuesSize, int *valuesNumber,                               # dataCompressed, &numberDataCompressed, &numberOfCompressed
                 int *readPlan,                                                                 # &0 
-                int *recordFound)                                                              # &found
+                int *recordFound) nogil                                                        # &found
 
     # most of these parameters are in ZStructTransfer.h
     void zwritex(long long *ifltab, 
@@ -108,7 +108,7 @@ cdef extern from "heclib.h":
                  int *dataType,                                                                 
                  int *plan,
                  int *status, 
-                 int *recordFound)                                                              # exists or not
+                 int *recordFound) nogil                                                        # exists or not
 
     ctypedef struct zStructTimeSeries:
         int *times
@@ -128,6 +128,8 @@ cdef extern from "heclib.h":
         char *pathnameInternal
         int boolRetrieveAllTimes
         char *timeZoneName
+        long long lastWrittenTime
+        long long fileLastWrittenTime
 
     zStructTimeSeries *zstructTsNewRegFloats(const char* pathname, 
                                                    float *floatValues, 
@@ -145,10 +147,10 @@ cdef extern from "heclib.h":
                                                       const char *units, 
                                                       const char *type)
 
-    int ztsStore(long long *ifltab, zStructTimeSeries *tss,int storageFlag)
+    int ztsStore(long long *ifltab, zStructTimeSeries *tss,int storageFlag) nogil
     int ztsRetrieve(long long *ifltab, zStructTimeSeries *tss, 
                           int retrieveFlag, int boolRetrieveDoubles, 
-                          int boolRetrieveQualityNotes) # preferred
+                          int boolRetrieveQualityNotes) nogil # preferred
     zStructTimeSeries *zstructTsNew(const char* pathname) # low-level 
     zStructTimeSeries *zstructTsNewTimes(const char* pathname,
                                       const char* startDate, 
@@ -197,7 +199,7 @@ cdef extern from "heclib.h":
         #char allocated[zSTRUCT_length]
 
     zStructPairedData* zstructPdNew(const char* pathname)
-    int zpdRetrieve(long long *ifltab, zStructPairedData *pds, int retrieveSizeFlag)
+    int zpdRetrieve(long long *ifltab, zStructPairedData *pds, int retrieveSizeFlag) nogil
 
     zStructPairedData* zstructPdNewFloats(const char* pathname, float *floatOrdinates, 
                                           float *floatValues, int numberOrdinates, 
@@ -211,7 +213,7 @@ cdef extern from "heclib.h":
                                            const char *typeIndependent, 
                                            const char *unitsDependent, 
                                            const char *typeDependent)
-    int zpdStore(long long *ifltab, zStructPairedData *pds, int storageFlag)
+    int zpdStore(long long *ifltab, zStructPairedData *pds, int storageFlag) nogil
     int zgetRecordSize(long long *ifltab, zStructRecordSize *recordSize)
     zStructRecordSize* zstructRecordSizeNew(const char* pathname)
 
@@ -421,8 +423,8 @@ cdef extern from "heclib.h":
     cdef enum:
         dataType
     zStructSpatialGrid* zstructSpatialGridNew(const char* pathname)
-    int zspatialGridRetrieve(long long *ifltab, zStructSpatialGrid *gdStruct, int boolRetrieveData)
-    int zspatialGridStore(long long *ifltab, zStructSpatialGrid *gdStruct)
+    int zspatialGridRetrieve(long long *ifltab, zStructSpatialGrid *gdStruct, int boolRetrieveData) nogil
+    int zspatialGridStore(long long *ifltab, zStructSpatialGrid *gdStruct) nogil
     int compress_zlib(void* array, int size, void **buffer)
     int uncompress_zlib(const void* buffer, int size, void* data, int dataSize)
     int zspatialGridRetrieveVersion(long long *ifltab, const char *cpath, int* gridStructVersion)
@@ -10,15 +10,18 @@ from cpython.mem cimport PyMem_Malloc, PyMem_Realloc, PyMem_Free
 from cpython.unicode cimport PyUnicode_AsUTF8AndSize
 from cpython.exc   cimport PyErr_NoMemory
 from cpython.bytes cimport PyBytes_AS_STRING
+from cpython.object cimport PyObject
 from libc.stdint cimport int16_t, int32_t,SIZE_MAX
 from libc.stddef  cimport size_t
 from libc.stdlib cimport malloc,calloc, free
 from libc.string cimport strlen, memcpy
-from libc.math cimport floor,ceil
+from libc.math cimport floor,ceil,NAN,INFINITY,isnan
 #from _chelper cimport *
 from checlib cimport *
 import logging
 import sys
+import threading
+from contextlib import nullcontext
 from datetime import datetime,timedelta
 from dateutil import parser
 from dateutil.relativedelta import relativedelta
@@ -28,4 +31,6 @@ import numpy as np
 np.seterr(over='raise')
 cimport numpy as np
 cimport numpy as cnp
+np.import_array()
+import pandas as pd
 import re
\ No newline at end of file
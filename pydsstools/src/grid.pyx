@@ -647,7 +647,8 @@ cdef int save_grid7(long long *ifltab, const char* pathname, float[:,::1] data,
     zsgs[0]._numberEqualOrExceedingRangeLimit  = <int *>range_counts
     zsgs[0]._data  = <void *>&data[0,0]
 
-    status = zspatialGridStore(ifltab,zsgs)
+    with nogil:
+        status = zspatialGridStore(ifltab,zsgs)
     return status 
 
 cdef int save_grid0(long long *ifltab, const char* pathname, float[:,::1] data, object gridinfo):
@@ -665,6 +666,7 @@ cdef int save_grid0(long long *ifltab, const char* pathname, float[:,::1] data,
         int comp_buffer_len = 0
         int comp_status
         int[::1] info_flat
+        int *info_ptr
         int info_len 
         int grid_type
         float base
@@ -784,17 +786,19 @@ cdef int save_grid0(long long *ifltab, const char* pathname, float[:,::1] data,
     # zwritex is C API
     # zwritex_ is fortran API. Using this may have required the string as Hollerith representation.   
     # not sure why &grid_type is needed in zwritex
-    zwritex(ifltab,
-            pathname, &path_len,
-            &info_flat[0],&info_len,
-            dummy_header,&zero,
-            dummy_header,&zero,
-            <int *>comp_buffer,&comp_buffer_len,
-            &grid_type,
-            &plan,
-            status,
-            exists,
-            )
+    info_ptr = &info_flat[0]
+    with nogil:
+        zwritex(ifltab,
+                pathname, &path_len,
+                info_ptr,&info_len,
+                dummy_header,&zero,
+                dummy_header,&zero,
+                <int *>comp_buffer,&comp_buffer_len,
+                &grid_type,
+                &plan,
+                status,
+                exists,
+                )
 
     logging.info("Grid data written to file with status code = {}".format(status[0]))
     return status[0]
@@ -859,6 +863,8 @@ cdef np.ndarray read_grid0(long long *ifltab, const char *pathname, object ginfo
         int comp_data_len
         np.ndarray comp_data
         int[::1] comp_data_mv
+        int *info_ptr
+        int *comp_ptr
         int16_t[::1] comp_data16
         int16_t[::1] comp_data16_mv
         int comp_method
@@ -892,15 +898,18 @@ cdef np.ndarray read_grid0(long long *ifltab, const char *pathname, object ginfo
     comp_data_mv = comp_data
 
     # fill grid meta into info_flat,get compressed data
-    zreadx(ifltab,
-           pathname,
-           &info_flat_mv[0], &flat_size, &flat_size,
-           dummy_header, &zero, dummy_header,
-           dummy_header, &zero, dummy_header,
-           &comp_data_mv[0], &comp_data_len, &comp_data_len,
-           &plan,
-           &found
-    )
+    info_ptr = &info_flat_mv[0]
+    comp_ptr = &comp_data_mv[0]
+    with nogil:
+        zreadx(ifltab,
+               pathname,
+               info_ptr, &flat_size, &flat_size,
+               dummy_header, &zero, dummy_header,
+               dummy_header, &zero, dummy_header,
+               comp_ptr, &comp_data_len, &comp_data_len,
+               &plan,
+               &found
+        )
     if found == 0:
         return None
 
@@ -1015,6 +1024,8 @@ cdef int read_grid0_as_grid100(long long *ifltab, zStructSpatialGrid *zsgs, obje
         int comp_data_len
         np.ndarray comp_data
         int[::1] comp_data_mv
+        int *info_ptr
+        int *comp_ptr
         int16_t[::1] comp_data16
         int16_t[::1] comp_data16_mv
         int comp_method
@@ -1053,15 +1064,18 @@ cdef int read_grid0_as_grid100(long long *ifltab, zStructSpatialGrid *zsgs, obje
     # fill grid meta into info_flat,get compressed data
     # I don't think isError API function catches error from this low level call
     # It needs to be handled separately
-    zreadx(ifltab,
-           pathname,
-           &info_flat_mv[0], &flat_size, &flat_size,
-           dummy_header, &zero, dummy_header,
-           dummy_header, &zero, dummy_header,
-           &comp_data_mv[0], &comp_data_len, &comp_data_len,
-           &plan,
-           &found
-    )
+    info_ptr = &info_flat_mv[0]
+    comp_ptr = &comp_data_mv[0]
+    with nogil:
+        zreadx(ifltab,
+               pathname,
+               info_ptr, &flat_size, &flat_size,
+               dummy_header, &zero, dummy_header,
+               dummy_header, &zero, dummy_header,
+               comp_ptr, &comp_data_len, &comp_data_len,
+               &plan,
+               &found
+        )
     if found == 0:
         logging.error('The pathname does not corresponds to valid ver0 grid data')
         return 0
@@ -1244,4 +1258,178 @@ cdef int read_grid0_as_grid100(long long *ifltab, zStructSpatialGrid *zsgs, obje
         
         zsgs[0]._data = <void*>out_data
 
-    return 0
\ No newline at end of file
+    return 0
+
+cdef enum:
+    GRID_PASS_MAX_THRESHOLDS = 32
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _grid_pass(const float *data, const unsigned char *mask, Py_ssize_t size,
+                     float nodata, bint use_nodata, bint do_stats,
+                     const float *thresholds, Py_ssize_t nthresholds,
+                     Py_ssize_t *count, double *vmin, double *vmax, double *vsum,
+                     long long *counts) nogil:
+    # One pass over the cells skipping masked, nodata and NaN cells.
+    # counts[b] is the number of cells >= thresholds[b], nthresholds <= GRID_PASS_MAX_THRESHOLDS.
+    # The skip test is used as 0/1 value instead of branch (mask/nodata cells are often
+    # scattered), thresholds, counts and partial sums are local to keep dependency chains short.
+    cdef:
+        Py_ssize_t i, b
+        Py_ssize_t n = 0
+        float v
+        bint ok
+        float lo[2]
+        float hi[2]
+        double total[4]
+        float thr[GRID_PASS_MAX_THRESHOLDS]
+        Py_ssize_t ge[GRID_PASS_MAX_THRESHOLDS]
+
+    lo[0] = lo[1] = INFINITY
+    hi[0] = hi[1] = -INFINITY
+    total[0] = total[1] = total[2] = total[3] = 0
+    for b in range(nthresholds):
+        thr[b] = thresholds[b]
+        ge[b] = 0
+
+    for i in range(size):
+        v = data[i]
+        ok = v == v
+        if mask != NULL:
+            ok = ok & (mask[i] == 0)
+        if use_nodata:
+            ok = ok & (v != nodata)
+        n += ok
+        if do_stats:
+            lo[i & 1] = v if (ok & (v < lo[i & 1])) else lo[i & 1]
+            hi[i & 1] = v if (ok & (v > hi[i & 1])) else hi[i & 1]
+            total[i & 3] += v if ok else 0.0
+        for b in range(nthresholds):
+            ge[b] += ok & (v >= thr[b])
+
+    count[0] = n
+    for b in range(nthresholds):
+        counts[b] = ge[b]
+    if do_stats:
+        vmin[0] = lo[0] if lo[0] < lo[1] else lo[1]
+        vmax[0] = hi[0] if hi[0] > hi[1] else hi[1]
+        vsum[0] = (total[0] + total[1]) + (total[2] + total[3])
+
+def grid_stats(const float[::1] data, const unsigned char[::1] mask=None,
+               nodata=None, thresholds=None, bint stats=True):
+    """Computes statistics of float32 grid cells in one pass without copying the data
+
+    Masked cells (non-zero mask), cells equal to nodata and NaN cells are skipped.
+
+    Parameter
+    ---------
+        data: 1-D contiguous float32 array (e.g., raveled grid)
+        mask: 1-D uint8 or bool array of the same size, optional
+        nodata: float, optional
+        thresholds: sequence of values, optional
+        stats: bool, default True. If False, only count and threshold counts are computed.
+
+    Returns
+    -------
+        tuple (count, min, max, mean, counts)
+        count: number of valid cells, min, max and mean are NaN when it is 0
+        counts: int64 array with number of valid cells >= each threshold
+    """
+    cdef:
+        Py_ssize_t size = data.shape[0]
+        Py_ssize_t count = 0
+        Py_ssize_t nthr
+        double vmin = NAN, vmax = NAN, vsum = 0
+        float _nodata = 0
+        bint use_nodata = nodata is not None
+        const float *data_ptr = NULL
+        const unsigned char *mask_ptr = NULL
+        Py_ssize_t start, chunk
+        bint first = stats
+        float[::1] thr
+        long long[::1] counts
+
+    if mask is not None:
+        if mask.shape[0] != size:
+            raise ValueError("mask and data must have the same size")
+        if size:
+            mask_ptr = &mask[0]
+    if use_nodata:
+        _nodata = nodata
+    if size:
+        data_ptr = &data[0]
+
+    # compared as float32 like numpy comparison of float32 array and python float
+    if thresholds is None:
+        thresholds = []
+    thr = np.array(thresholds,dtype=np.float32).ravel()
+    nthr = thr.shape[0]
+    counts = np.zeros(nthr + 1,dtype=np.int64)
+
+    # the first pass computes the statistics too
+    start = 0
+    while True:
+        chunk = min(nthr - start,GRID_PASS_MAX_THRESHOLDS)
+        with nogil:
+            _grid_pass(data_ptr,mask_ptr,size,_nodata,use_nodata,stats,
+                       &thr[start] if chunk else NULL,chunk,
+                       &count,&vmin,&vmax,&vsum,&counts[start])
+        stats = False
+        start += chunk
+        if start >= nthr:
+            break
+
+    result = np.asarray(counts)[:nthr]
+    if not first or count == 0:
+        return count,NAN,NAN,NAN,result
+    return count,vmin,vmax,vsum/count,result
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def prepare_grid_data(const cython.floating[:, :] data, const unsigned char[:, :] mask=None,
+                      nodata=None, float fill=UNDEFINED_FLOAT, bint flipud=False):
+    """Returns C-contiguous float32 copy of 2-D grid ready to be saved
+
+    Masked cells (non-zero mask), cells equal to nodata and NaN cells are set to fill,
+    the rows are reversed when flipud is True and the values are cast to float32 in
+    one pass into the returned array. data can have any strides, e.g., a slice.
+
+    Parameter
+    ---------
+        data: 2-D float32 or float64 array
+        mask: 2-D uint8 or bool array of the same shape, optional
+        nodata: float, optional. Compared with the cells in data precision.
+        fill: float32 value of the nodata cells in the output
+        flipud: bool, default False
+    """
+    cdef:
+        Py_ssize_t rows = data.shape[0]
+        Py_ssize_t cols = data.shape[1]
+        Py_ssize_t i, j, src
+        cython.floating v
+        cython.floating _nodata = 0
+        bint use_nodata = nodata is not None
+        bint use_mask = mask is not None
+        bint skip
+        float[:, ::1] out
+
+    if use_mask and (mask.shape[0] != rows or mask.shape[1] != cols):
+        raise ValueError("mask and data must have the same shape")
+    if use_nodata:
+        _nodata = nodata
+
+    result = np.empty((rows, cols), dtype=np.float32)
+    out = result
+    with nogil:
+        for i in range(rows):
+            src = rows - 1 - i if flipud else i
+            for j in range(cols):
+                v = data[src, j]
+                skip = v != v
+                if use_nodata:
+                    skip = skip | (v == _nodata)
+                if use_mask:
+                    skip = skip | (mask[src, j] != 0)
+                out[i, j] = fill if skip else <float>v
+    return result
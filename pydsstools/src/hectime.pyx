@@ -124,6 +124,85 @@ def getDateTimeStringTuple(dateValue,granularity=60,julianBaseDate=0):
 
     return (datestr,timestr)
 
+cdef inline int _readDigits(str text,Py_ssize_t *pos,Py_ssize_t max_digits,int *value):
+    # Reads up to max_digits ascii digits at pos into value and advances pos.
+    # Returns number of digits read.
+    cdef:
+        Py_ssize_t n = len(text)
+        int count = 0
+        Py_UCS4 c
+    value[0] = 0
+    while pos[0] < n and count < max_digits:
+        c = text[pos[0]]
+        if c < 48 or c > 57: # not 0-9
+            break
+        value[0] = value[0]*10 + (<int>c - 48)
+        pos[0] += 1
+        count += 1
+    return count
+
+cdef object _parseDssDateTime(str dateString):
+    # Parses DSS date formats without dateutil, returns None for any other format
+    #   DDMMMYYYY, DDMMMYYYY HHMM, DDMMMYYYY:HHMM, DDMMMYYYY HHMMSS,
+    #   DDMMMYYYY HH:MM, DDMMMYYYY HH:MM:SS (24:00 is 00:00 of next day)
+    cdef:
+        str text = dateString.strip()
+        Py_ssize_t n = len(text)
+        Py_ssize_t pos = 0
+        int day,month,year,value
+        int hour = 0, minute = 0, second = 0
+        int count
+        Py_UCS4 sep
+
+    if not _readDigits(text,&pos,2,&day) or pos + 3 > n:
+        return None
+    month = SHORT_MONTH_NAMES.get(text[pos:pos+3].capitalize(),0)
+    if not month:
+        return None
+    pos += 3
+    if _readDigits(text,&pos,4,&year) != 4:
+        return None
+
+    if pos < n:
+        sep = text[pos]
+        if sep == u':':
+            pos += 1
+        elif sep == u' ':
+            while pos < n and text[pos] == sep:
+                pos += 1
+        else:
+            return None
+        count = _readDigits(text,&pos,6,&value)
+        if count == 4 and pos == n:
+            hour = value // 100
+            minute = value % 100
+        elif count == 6 and pos == n:
+            hour = value // 10000
+            minute = (value // 100) % 100
+            second = value % 100
+        elif (count == 1 or count == 2) and pos < n and text[pos] == u':':
+            hour = value
+            pos += 1
+            if _readDigits(text,&pos,2,&minute) != 2:
+                return None
+            if pos < n:
+                if text[pos] != u':':
+                    return None
+                pos += 1
+                if _readDigits(text,&pos,2,&second) != 2:
+                    return None
+            if pos != n:
+                return None
+        else:
+            return None
+
+    try:
+        if hour == 24:
+            return datetime(year,month,day,23,minute,second) + timedelta(hours=1)
+        return datetime(year,month,day,hour,minute,second)
+    except ValueError:
+        return None
+
 def getPyDateTimeFromString(dateString,parserinfo=None,fmt=None):
     # Returns python datetime object from string
     if not fmt is None:
@@ -132,6 +211,11 @@ def getPyDateTimeFromString(dateString,parserinfo=None,fmt=None):
             return datetime_obj
         except:
             pass
+    elif parserinfo is None and isinstance(dateString,str):
+        # DSS date formats are parsed directly, dateutil for the rest
+        datetime_obj = _parseDssDateTime(dateString)
+        if not datetime_obj is None:
+            return datetime_obj
 
     try:
         datetime_obj = parser.parse(dateString,parserinfo)
@@ -194,6 +278,113 @@ def getPyDateTimeFromValue(dateValue,granularity=60,julianBaseDate=0):
         return datetime_obj
 
 
+# Days from HEC julian origin (31DEC1899 00:00) to numpy/unix epoch (01JAN1970 00:00)
+cdef long long JULIAN_EPOCH_OFFSET = 25568
+cdef long long SECONDS_IN_DAY = 86400
+
+# Regular intervals (seconds) that are calendar based in HEC-DSS
+cdef int YEAR_INTERVAL = 365*24*60*60
+cdef int MONTH_INTERVAL = 30*24*60*60
+cdef int SEMI_MONTH_INTERVAL = 15*24*60*60
+cdef int TRI_MONTH_INTERVAL = 10*24*60*60
+
+
+def getDatetime64FromJulian(julianDate,seconds=0):
+    """Returns numpy datetime64[s] from julian days (since 31DEC1899) and seconds
+       past midnight. Both arguments can be scalar or array.
+    """
+    julian = np.asarray(julianDate,dtype=np.int64)
+    secs = np.asarray(seconds,dtype=np.int64)
+    return ((julian - JULIAN_EPOCH_OFFSET)*SECONDS_IN_DAY + secs).astype('M8[s]')
+
+def getDatetime64FromValues(times,granularity=60,julianBaseDate=0):
+    """Returns numpy datetime64[s] array from integer time values of irregular
+       time-series. Vectorized version of getPyDateTimeFromValue.
+
+    Parameter
+    ---------
+        times: integer array of time values (e.g., TimeSeriesStruct.times)
+        granularity: number of seconds in each unit of time value
+        julianBaseDate: julian days added to the time values
+    """
+    if granularity <= 0:
+        granularity = 60
+    values = np.asarray(times,dtype=np.int64)
+    base = (<long long>julianBaseDate - JULIAN_EPOCH_OFFSET)*SECONDS_IN_DAY
+    return (values*granularity + base).astype('M8[s]')
+
+def _add_months(start,months):
+    # Calendar aware month addition for datetime64[s] start and array of months.
+    # Day of month is clipped to the month length and month end dates stay at month end.
+    month0 = start.astype('M8[M]')
+    day0 = start.astype('M8[D]')
+    tod = start - day0.astype('M8[s]')
+    dom = (day0 - month0.astype('M8[D]')).astype(np.int64)
+    dim0 = ((month0 + 1).astype('M8[D]') - month0.astype('M8[D]')).astype(np.int64)
+
+    new_months = month0 + months
+    first = new_months.astype('M8[D]')
+    dim = ((new_months + 1).astype('M8[D]') - first).astype(np.int64)
+    if dom == dim0 - 1:
+        day = dim - 1
+    else:
+        day = np.minimum(dom,dim - 1)
+    return (first + day).astype('M8[s]') + tod
+
+def _add_month_periods(start,steps,offsets):
+    # Semi-month and tri-month intervals. offsets are days from the beginning of
+    # the month where each period starts, e.g., (0,15) for semi-month. HEC-DSS
+    # stamps these at 24:00 of the 15th (or 10th, 20th) and of the month end.
+    cdef int periods = len(offsets)
+    offsets = np.asarray(offsets,dtype=np.int64)
+    month0 = start.astype('M8[M]')
+    day0 = start.astype('M8[D]')
+    tod = start - day0.astype('M8[s]')
+    dom = (day0 - month0.astype('M8[D]')).astype(np.int64)
+    j0 = int(np.searchsorted(offsets,dom,side='right')) - 1
+    extra_days = dom - offsets[j0]
+
+    total = steps + j0
+    first = (month0 + total // periods).astype('M8[D]')
+    return (first + offsets[total % periods] + extra_days).astype('M8[s]') + tod
+
+def getRegularDatetime64(start,int interval,int count):
+    """Returns numpy datetime64[s] array of regular time-series times.
+
+    Parameter
+    ---------
+        start: datetime64, datetime or string, time of the first value
+        interval: time interval in seconds (as in TimeSeriesStruct.interval)
+        count: number of values
+
+    Notes
+    -----
+        Month, semi-month, tri-month and year intervals are calendar aware,
+        e.g., 31JAN2000 2400 is followed by 29FEB2000 2400 for monthly data.
+    """
+    if interval <= 0:
+        raise ValueError('Regular time-series interval must be positive')
+
+    if isinstance(start,str):
+        start = getPyDateTimeFromString(start)
+    start = np.datetime64(start,'s')
+    steps = np.arange(count,dtype=np.int64)
+
+    if interval % YEAR_INTERVAL == 0:
+        return _add_months(start,steps*(12*(interval // YEAR_INTERVAL)))
+
+    elif interval % MONTH_INTERVAL == 0:
+        return _add_months(start,steps*(interval // MONTH_INTERVAL))
+
+    elif interval == SEMI_MONTH_INTERVAL:
+        return _add_month_periods(start,steps,(0,15))
+
+    elif interval == TRI_MONTH_INTERVAL:
+        return _add_month_periods(start,steps,(0,10,20))
+
+    return start + steps*np.timedelta64(interval,'s')
+
+
 def getDateTimeValueTuple(dateValue,granularity=60,julianBaseDate=0):
     """
     Returns:
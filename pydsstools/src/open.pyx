@@ -1,5 +1,15 @@
 # TODO: Improve error check and messaging
 
+# lock of Open objects not opened in threadsafe mode, entering it does nothing
+_NO_LOCK = nullcontext()
+
+# heclib keeps process wide state (last error, messaging, open file table, DSS-6
+# Fortran common blocks). The lock is taken by zopen/zclose, the calls of DSS-6
+# handles and the other non-reentrant calls, and to read the last error. The
+# record reads/writes of DSS-7 handles run without it. It is always taken after
+# the lock of the handle.
+_heclib_lock = threading.RLock()
+
 cdef class Open:
     """Returns file handle to a dss file that can be used to read from or write
        to that file.  
@@ -13,25 +23,62 @@ cdef class Open:
             # If empty or any other number is specified, the version is selected 
               automatically. If the file does not exist, new file is created 
               using version 7 dss library.  
+
+    Thread safety
+    -------------
+        # heclib keeps process wide state (last error, messaging, open file table
+          and the Fortran common blocks of DSS-6). zopen, zclose, the calls of
+          DSS-6 handles and the other calls that use this state are serialized
+          by a module level lock.
+        # The record reads and writes of DSS-7 handles (ztsRetrieve, ztsStore,
+          zpdRetrieve, zpdStore, zspatialGridRetrieve, zcatalog) run without the
+          module level lock and without holding the GIL, so threads that each
+          own an Open object read or write separate files in parallel.
+        # The last error of heclib is shared by all the handles. It is checked
+          after these DSS-7 calls only when the call returns error status, as it
+          can belong to a call running in another thread.
+        # By default, one Open object must not be used from several threads at
+          the same time. heclib modifies ifltab during every call. The lock of
+          the handle is a no-op context then.
+        # With threadsafe=True, every heclib call on the handle is made holding
+          an internal lock, so several threads can share one Open object. The
+          calls on the handle are serialized. read_status and write_status are 
+          then stored per thread, each thread sees the status of its own calls.
+        # DssLastError is not per-thread. The heclib last error is shared by 
+          all the handles in the process.
     """
     cdef:
         long long ifltab[500]
         readonly int version
         readonly str filename
         readonly int file_status
-        readonly int read_status
-        readonly int write_status
-
-    def __init__(self,dssFilename,version=None):
-        if version == 6:
-            self.file_status = zopen6(self.ifltab, dssFilename)
-        elif version == 7:
-            self.file_status = zopen7(self.ifltab, dssFilename)
+        readonly bint threadsafe
+        readonly object _lock
+        readonly object _io_lock
+        int _read_status
+        int _write_status
+        object _local
+
+    def __init__(self,dssFilename,version=None,bint threadsafe=False):
+        self.threadsafe = threadsafe
+        if threadsafe:
+            self._lock = threading.RLock()
+            self._local = threading.local()
         else:
-            self.file_status = hec_dss_zopen(self.ifltab, dssFilename)
-        isError(self.file_status)
+            self._lock = _NO_LOCK
+            self._local = None
+        with _heclib_lock:
+            if version == 6:
+                self.file_status = zopen6(self.ifltab, dssFilename)
+            elif version == 7:
+                self.file_status = zopen7(self.ifltab, dssFilename)
+            else:
+                self.file_status = hec_dss_zopen(self.ifltab, dssFilename)
+            isError(self.file_status)
         self.version = zgetVersion(self.ifltab)
         self.filename = dssFilename
+        # lock of the record reads/writes in addition to the lock of the handle
+        self._io_lock = _heclib_lock if self.version == 6 else _NO_LOCK
 
     def __enter__(self):
         return self
@@ -41,12 +88,46 @@ cdef class Open:
 
     def close(self):
         if self.ifltab != NULL:
-            zclose(self.ifltab)
+            with self._lock, _heclib_lock:
+                zclose(self.ifltab)
 
     def __version__(self):
         return    
         #return zgetFullVersion(self.ifltab)        
 
+    property read_status:
+        def __get__(self):
+            if self._local is not None:
+                return getattr(self._local,'read_status',0)
+            return self._read_status
+
+    property write_status:
+        def __get__(self):
+            if self._local is not None:
+                return getattr(self._local,'write_status',0)
+            return self._write_status
+
+    cdef void _set_read_status(self,int status) except *:
+        if self._local is not None:
+            self._local.read_status = status
+        else:
+            self._read_status = status
+
+    cdef int _check_io_status(self,int status) except *:
+        # Status check of the record reads/writes. The heclib last error of a DSS-7
+        # handle can belong to a call on another handle running at the same time,
+        # so it is read only when the call itself failed.
+        if self._io_lock is _heclib_lock or status < 0:
+            with _heclib_lock:
+                isError(status)
+        return status
+
+    cdef void _set_write_status(self,int status) except *:
+        if self._local is not None:
+            self._local.write_status = status
+        else:
+            self._write_status = status
+
     def get_status(self):
         return (self.file_status,self.read_status,self.write_status)
 
@@ -89,16 +170,20 @@ cdef class Open:
         """
         cdef:
             zStructTimeSeries *ztss=NULL 
+            long long *ifltab = self.ifltab
+            int status
         ztss = zstructTsNew(pathname)
 
         if boolRetrieveAllTimes: 
             ztss[0].boolRetrieveAllTimes = 1
 
-        self.read_status = ztsRetrieve(self.ifltab,ztss,retrieveFlag,
-                                       boolRetrieveDoubles,
-                                       boolRetrieveQualityNotes)
-        
-        isError(self.read_status)
+        with self._lock, self._io_lock:
+            with nogil:
+                status = ztsRetrieve(ifltab,ztss,retrieveFlag,
+                                     boolRetrieveDoubles,
+                                     boolRetrieveQualityNotes)
+            self._set_read_status(status)
+            self._check_io_status(status)
 
         if boolRetrieveDoubles == 1:
             ztss[0].doubleValues = NULL
@@ -118,12 +203,16 @@ cdef class Open:
 
         cdef:
             zStructTimeSeries *ztss=NULL 
+            long long *ifltab = self.ifltab
+            int status
         ztss = zstructTsNewTimes(pathname,startDate,startTime,endDate,endTime)
-        self.read_status = ztsRetrieve(self.ifltab,ztss,retrieveFlag,
-                                       boolRetrieveDoubles,
-                                       boolRetrieveQualityNotes)
-        
-        isError(self.read_status)
+        with self._lock, self._io_lock:
+            with nogil:
+                status = ztsRetrieve(ifltab,ztss,retrieveFlag,
+                                     boolRetrieveDoubles,
+                                     boolRetrieveQualityNotes)
+            self._set_read_status(status)
+            self._check_io_status(status)
 
         if boolRetrieveDoubles == 1:
             ztss[0].doubleValues = NULL
@@ -137,6 +226,7 @@ cdef class Open:
         cdef:
             TimeSeriesStruct ts_st
             zStructTimeSeries *tss
+            long long *ifltab = self.ifltab
             int status
         tsc.setValues()
         ts_st = createNewTimeSeries(tsc)
@@ -144,8 +234,11 @@ cdef class Open:
         if tss == NULL:
             logging.error("Failed to write time-series")
             return
-        self.write_status = ztsStore(self.ifltab,tss,storageFlag)
-        isError(self.write_status) 
+        with self._lock, self._io_lock:
+            with nogil:
+                status = ztsStore(ifltab,tss,storageFlag)
+            self._set_write_status(status)
+            self._check_io_status(status) 
         return ts_st
 
     cpdef int copyRecordsFrom(self,Open copyFrom,str pathnameFrom,str pathnameTo="") except *:
@@ -163,11 +256,13 @@ cdef class Open:
         return status
 
 
-    cpdef PairedDataStruct read_pd(self,char *pathname, tuple window = None):
+    cpdef PairedDataStruct read_pd(self,char *pathname, tuple window = None, int retrieveSizeFlag = 1):
         # Read paired data from the given pathname
+        # retrieveSizeFlag: 1 -> retrieve as float, 2 -> retrieve as double
         cdef:
             zStructPairedData *zpds=NULL 
-            int retrieveSizeFlag = 1 # retrieve as float
+            long long *ifltab = self.ifltab
+            int status
             int data_no, curve_no
             int start_ord, end_ord, start_curve, end_curve
 
@@ -184,9 +279,11 @@ cdef class Open:
             zpds[0].startingCurve = start_curve
             zpds[0].endingCurve = end_curve
 
-        self.read_status = zpdRetrieve(self.ifltab,zpds,retrieveSizeFlag)
-
-        isError(self.read_status)
+        with self._lock, self._io_lock:
+            with nogil:
+                status = zpdRetrieve(ifltab,zpds,retrieveSizeFlag)
+            self._set_read_status(status)
+            self._check_io_status(status)
 
         pd_st = createPDS(zpds)
         return pd_st 
@@ -200,61 +297,86 @@ cdef class Open:
         cdef:
             PairedDataStruct pd_st
             zStructPairedData *zpds
+            long long *ifltab = self.ifltab
             int status
         pdc.setValues(mode=0,label_size = label_size)
         pd_st = preallocNewPairedData(pdc)
         zpds = pd_st.zpds
-        self.write_status = zpdStore(self.ifltab,zpds,10)
-        isError(self.write_status)
-        pdc.curves_ptr = NULL
-        pdc.curves_mv = None
+        with self._lock, self._io_lock:
+            with nogil:
+                status = zpdStore(ifltab,zpds,10)
+            self._set_write_status(status)
+            self._check_io_status(status)
+        pdc.clearData()
 
     cpdef int put_one_pd(self, PairedDataContainer pdc,int i,tuple window = None, int label_size = 0) except *:
         # i = ith curve no to save in the file, 1 >= i <= curve_no
+        self.put_pd_curves(pdc,i,i,window,label_size)
+
+    cpdef int put_pd_curves(self, PairedDataContainer pdc,int start_curve,int end_curve,tuple window = None, int label_size = 0) except *:
+        # Saves curves start_curve to end_curve (1 based, inclusive) of preallocated/existing
+        # pd with one zpdStore call. Each row of pdc.curves is a curve.
+        # label_size = label size of the record, labels are not changed if pdc has no labels_list
         # TODO: Error check
         cdef:
             PairedDataStruct pd_st
             zStructPairedData *zpds
+            long long *ifltab = self.ifltab
+            int status
             int start_ord,end_ord
 
-        if label_size > 0:
+        if pdc.labels_list and label_size <= 0:
             label_size = self.pd_info(pdc.pathname)['label_size']
+            if label_size <= 0:
+                logging.warning('{} has no space for labels, labels are not written'.format(pdc.pathname))
         pdc.setValues(mode = 1,label_size = label_size)
-        data_no_user = pdc.curves_mv.shape[1]
 
         if not window:
-            pd_st = createOnePairedData(self.ifltab,pdc,i)
+            pd_st = createOnePairedData(self.ifltab,pdc,start_curve,0,0,end_curve)
         else:
             start_ord,end_ord = window
-            pd_st = createOnePairedData(self.ifltab,pdc,i,start_ord,end_ord)
+            pd_st = createOnePairedData(self.ifltab,pdc,start_curve,start_ord,end_ord,end_curve)
 
         zpds = pd_st.zpds
-        self.write_status = zpdStore(self.ifltab,zpds,11)
-        isError(self.write_status)
-        pdc.curves_ptr = NULL
-        pdc.curves_mv = None
+        with self._lock, self._io_lock:
+            with nogil:
+                status = zpdStore(ifltab,zpds,11)
+            self._set_write_status(status)
+            self._check_io_status(status)
+        pdc.clearData()
 
     cpdef int put_pd(self, PairedDataContainer pdc) except *:
         # TODO: Error check
         cdef:
             PairedDataStruct pd_st
             zStructPairedData *zpds
+            long long *ifltab = self.ifltab
             int status
         pdc.setValues(mode=-1)
-        pd_st = createNewFloatPairedData(pdc)
+        if pdc.doubles:
+            pd_st = createNewDoublePairedData(pdc)
+        else:
+            pd_st = createNewFloatPairedData(pdc)
         zpds = pd_st.zpds
-        self.write_status = zpdStore(self.ifltab,zpds,0)
-        isError(self.write_status)
-        pdc.curves_ptr = NULL
-        pdc.curves_mv = None
+        with self._lock, self._io_lock:
+            with nogil:
+                status = zpdStore(ifltab,zpds,0)
+            self._set_write_status(status)
+            self._check_io_status(status)
+        pdc.clearData()
 
     cpdef void read_grid100(self,const char *pathname, SpatialGridStruct sg_st, bint retrieve_data) except *:
         cdef:
             zStructSpatialGrid *zsgs = NULL
+            long long *ifltab = self.ifltab
+            int status
         zsgs = zstructSpatialGridNew(pathname)
         #self.read_status = RetrieveGriddedData_wrap(self.ifltab,zsgs,retrieve_data)
-        self.read_status = zspatialGridRetrieve(self.ifltab,zsgs,retrieve_data)
-        isError(self.read_status)
+        with self._lock, self._io_lock:
+            with nogil:
+                status = zspatialGridRetrieve(ifltab,zsgs,retrieve_data)
+            self._set_read_status(status)
+            self._check_io_status(status)
         updateSGS(sg_st,zsgs)
 
     cpdef void read_grid0(self,const char *pathname,SpatialGridStruct sg_st, object ginfo6, bint retrieve_data) except *:
@@ -262,35 +384,41 @@ cdef class Open:
             int status
             zStructSpatialGrid *zsgs = NULL
         zsgs = zstructSpatialGridNew(pathname)
-        status = read_grid0_as_grid100(self.ifltab,zsgs,ginfo6,retrieve_data)
+        with self._lock, _heclib_lock:
+            status = read_grid0_as_grid100(self.ifltab,zsgs,ginfo6,retrieve_data)
         print("status = ",status)
         updateSGS(sg_st,zsgs)
 
     cpdef np.ndarray _read_grid0_array(self,const char *pathname, object ginfo6, bint retrieve_data):
         cdef:
              np.ndarray data
-        data =  read_grid0(self.ifltab,pathname,ginfo6,retrieve_data)
+        with self._lock, _heclib_lock:
+            data =  read_grid0(self.ifltab,pathname,ginfo6,retrieve_data)
         return data   
 
     def _get_gridver(self,const char *pathname):
-        ver = get_gridver_from_path(self.ifltab,pathname)
+        with self._lock, _heclib_lock:
+            ver = get_gridver_from_path(self.ifltab,pathname)
         if ver == -1:
             return
         return ver
 
     def _get_gridtype(self,const char *pathname):
-        grid_type = get_gridtype_from_path(self.ifltab,pathname)
+        with self._lock, _heclib_lock:
+            grid_type = get_gridtype_from_path(self.ifltab,pathname)
         if grid_type == -1:
             return
         return grid_type    
 
     cpdef int put_grid(self,str pathname, float[:,::1] data, object gridinfo7) except *:
         # TODO: Error check
-        save_grid7(self.ifltab,pathname, data, gridinfo7)
+        with self._lock, _heclib_lock:
+            save_grid7(self.ifltab,pathname, data, gridinfo7)
 
     cpdef int put_grid0(self,str pathname,  float[:,::1] data, object gridinfo6) except *:
         # TODO: Error check
-        save_grid0(self.ifltab,pathname, data, gridinfo6)
+        with self._lock, _heclib_lock:
+            save_grid0(self.ifltab,pathname, data, gridinfo6)
 
     cpdef dict dss_info(self, str pathname):
         return dss_info(self,pathname)
@@ -306,7 +434,8 @@ cdef class Open:
 
     cpdef int _record_type_code(self,str pathname):
         cdef int typecode
-        typecode = zdataType(self.ifltab,pathname)
+        with self._lock, _heclib_lock:
+            typecode = zdataType(self.ifltab,pathname)
         return typecode
 
     cpdef str _record_type(self,str pathname):
@@ -314,7 +443,8 @@ cdef class Open:
             int typecode
             str dtype
 
-        typecode = zdataType(self.ifltab,pathname)
+        with self._lock, _heclib_lock:
+            typecode = zdataType(self.ifltab,pathname)
 
         if typecode >= 100 and typecode < 200:
             dtype = 'TS'
@@ -332,4 +462,5 @@ cdef class Open:
 
     def __dealloc__(self):
         if self.ifltab != NULL:
-            zclose(self.ifltab)
+            with _heclib_lock:
+                zclose(self.ifltab)
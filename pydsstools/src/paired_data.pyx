@@ -102,19 +102,74 @@ cdef class PairedDataStruct:
         cdef:
             int rows = self.curve_no()
             int cols = self.data_no()
+            bint doubles = self.zpds[0].floatValues == NULL and self.zpds[0].doubleValues != NULL
+            Py_ssize_t itemsize = sizeof(double) if doubles else sizeof(float)
+            str fmt = 'd' if doubles else 'f'
             view.array ca_view_x = view.array(shape=(1,cols), 
-                                            itemsize=sizeof(float),format='f',
+                                            itemsize=itemsize,format=fmt,
                                             allocate_buffer=False)
 
             view.array ca_view_curves = view.array(shape=(rows,cols),
-                                            itemsize=sizeof(float),format='f',
+                                            itemsize=itemsize,format=fmt,
                                             allocate_buffer=False)
 
-        ca_view_x.data = <char *>(self.zpds[0].floatOrdinates)
-        ca_view_curves.data = <char *>(self.zpds[0].floatValues)
+        if doubles:
+            ca_view_x.data = <char *>(self.zpds[0].doubleOrdinates)
+            ca_view_curves.data = <char *>(self.zpds[0].doubleValues)
+        else:
+            ca_view_x.data = <char *>(self.zpds[0].floatOrdinates)
+            ca_view_curves.data = <char *>(self.zpds[0].floatValues)
         labels_list = self.labels
         return ca_view_x,ca_view_curves,labels_list
 
+    cdef np.ndarray _wrap_buffer(self,void *data,int typenum,int nd,np.npy_intp *dims):
+        # numpy array viewing heclib buffer, keeps this struct alive as its base
+        cdef np.ndarray arr
+        arr = np.PyArray_SimpleNewFromData(nd,dims,typenum,data)
+        np.set_array_base(arr,self)
+        return arr
+
+    def get_arrays(self):
+        """Get paired data values as numpy arrays viewing the struct data, no copy
+
+        Returns
+        -------
+            x,curves and labels_list
+            x: 1-D array of ordinates (x axis values) common for all the curves
+            curves: 2-D array of shape (data_no, curve_no), each column is a curve.
+                    It is the Fortran ordered transpose of the C array.
+            labels_list: list containing names of the curves
+
+        Notes
+        -----
+            * The arrays keep this struct alive and become invalid if the data of
+              the struct is modified by heclib. Copy them to keep them independent.
+        """
+        cdef:
+            np.npy_intp dims[2]
+            int typenum = np.NPY_FLOAT32
+            void *ordinates = NULL
+            void *values = NULL
+
+        dims[0] = self.curve_no()
+        dims[1] = self.data_no()
+        if self.zpds:
+            if self.zpds[0].floatValues:
+                ordinates = <void *>self.zpds[0].floatOrdinates
+                values = <void *>self.zpds[0].floatValues
+            elif self.zpds[0].doubleValues:
+                typenum = np.NPY_FLOAT64
+                ordinates = <void *>self.zpds[0].doubleOrdinates
+                values = <void *>self.zpds[0].doubleValues
+        if ordinates == NULL or values == NULL:
+            x = np.empty(0,dtype=np.float32)
+            curves = np.empty((0,0),dtype=np.float32,order='F')
+            return x,curves,self.labels or []
+
+        x = self._wrap_buffer(ordinates,typenum,1,&dims[1])
+        curves = self._wrap_buffer(values,typenum,2,dims).T
+        return x,curves,self.labels or []
+
     @property
     def labels(self):
         cdef:
@@ -166,6 +221,29 @@ cdef class PairedDataStruct:
                 return self.zpds[0].typeDependent 
         return ''
 
+    @property
+    def numberCurves(self):
+        """Total number of curves in the record, regardless of the retrieved window"""
+        if self.zpds:
+            return self.zpds[0].numberCurves
+
+    @property
+    def numberOrdinates(self):
+        """Total number of ordinates in the record, regardless of the retrieved window"""
+        if self.zpds:
+            return self.zpds[0].numberOrdinates
+
+    @property
+    def labelsLength(self):
+        if self.zpds:
+            return self.zpds[0].labelsLength
+
+    @property
+    def lastWrittenTime(self):
+        """Last write time of the record, milliseconds since 1970"""
+        if self.zpds:
+            return self.zpds[0].lastWrittenTime
+
 cdef class PairedDataContainer:
     cdef:
         public str pathname
@@ -182,6 +260,11 @@ cdef class PairedDataContainer:
         float [:] independent_axis_mv
         float [:,::1] curves_mv # delete this after saving to dss
         float *curves_ptr
+        # float64 curves are stored as doubles, without conversion to float32
+        readonly bint doubles
+        double [::1] independent_axis_dmv
+        double [:,::1] curves_dmv # delete this after saving to dss
+        double *curves_dptr
         readonly bytearray labels
         int labelsLength
         #public bytes null_separated_bytes       
@@ -231,8 +314,24 @@ cdef class PairedDataContainer:
         else:
             raise BaseException("Invalid Curve Data")
 
+    cdef int setDoubleData(self) except *:
+        if isinstance(self.curves,np.ndarray) and self.curves.ndim == 2:
+            self.curves_dmv = np.ascontiguousarray(self.curves,dtype=np.float64)
+            self.curves_dptr = &self.curves_dmv[0,0]
+        else:
+            raise BaseException("Curves data must be 2 dimensional numpy array")
+
+    cdef void clearData(self):
+        # release the curves buffers after saving to dss
+        self.curves_ptr = NULL
+        self.curves_mv = None
+        self.curves_dptr = NULL
+        self.curves_dmv = None
+
     cdef int setIndependentAxisValues(self) except *:
-        if isinstance(self.independent_axis,array.array):
+        if self.doubles:
+            self.independent_axis_dmv = np.ascontiguousarray(self.independent_axis,dtype=np.float64)
+        elif isinstance(self.independent_axis,array.array):
             self.independent_axis_mv = np.asarray(self.independent_axis,np.float32)
         elif isinstance(self.independent_axis,np.ndarray):
             self.independent_axis_mv = np.ascontiguousarray(self.independent_axis,dtype=np.float32)
@@ -282,23 +381,17 @@ cdef class PairedDataContainer:
             self.labelsLength = len(self.labels)
 
         elif mode == 1:
-            # single curve to preallocated pd
-            if labels_list_length:
-                label_name = self.labels_list[0]
-                x = '{0:<{1:d}s}'.format(label_name,label_size)[0:label_size] 
-                if x:
-                    if isinstance(x,str):
-                        _x = x.encode('ascii')
-                    elif isinstance(x,bytes):
-                        _x=x
-                    else:
-                        __x = str(x)
-                        _x = __x.encode('ascii')
-
-                    null_separated_bytes = _x+b"\x00"
-                    byte_array = bytearray(null_separated_bytes)
-                    self.labels = byte_array
-                    self.labelsLength = len(byte_array)
+            # curves (rows of curves_mv) to preallocated pd
+            if labels_list_length and label_size > 0:
+                byte_labels = []
+                rows = self.curves_dmv.shape[0] if self.doubles else self.curves_mv.shape[0]
+                for label_name in self.labels_list[:rows]:
+                    x = '{0:<{1:d}s}'.format(str(label_name),label_size)[0:label_size] 
+                    byte_labels.append(x.encode('ascii'))
+                null_separated_bytes = b"\x00".join(byte_labels)+b"\x00"
+                byte_array = bytearray(null_separated_bytes)
+                self.labels = byte_array
+                self.labelsLength = len(byte_array)
             else:
                 # Assigning labels does not makes sense, setting labelsLength = 0 should retain the current label
                 self.labels = bytearray(' '.encode('ascii')+b"\x00")
@@ -350,24 +443,37 @@ cdef class PairedDataContainer:
             #   dependent_units    
             #   dependent_type    
             assert self.curve_no >=1 and self.data_no >=1, "curve_no and data_no must be > 0"
+            self.doubles = False
             self.setLabels(mode=0, label_size = label_size)
 
         elif mode == 1:
-            # Save one curve on the preallocated/normal dataset
-            self.setFloatData()
+            # Save curves on the preallocated/normal dataset, float64 curves as doubles
+            self.doubles = isinstance(self.curves,np.ndarray) and self.curves.dtype == np.float64
+            if self.doubles:
+                self.setDoubleData()
+            else:
+                self.setFloatData()
             self.setLabels(mode=1,label_size = label_size)
 
         else:
             # normal pd
             assert self.curve_no >=1 and self.data_no >=1, "curve_no and data_no must be > 0"
-            self.setFloatData()
-            assert (self.curve_no * self.data_no) == self.curves_mv.size
+            self.doubles = isinstance(self.curves,np.ndarray) and self.curves.dtype == np.float64
+            if self.doubles:
+                self.setDoubleData()
+                assert (self.curve_no * self.data_no) == self.curves_dmv.size
+            else:
+                self.setFloatData()
+                assert (self.curve_no * self.data_no) == self.curves_mv.size
             self.setLabels(mode=-1)
 
         if not mode == 1:
             # Except for mode ==1, set the independent axis C array
             self.setIndependentAxisValues()
-            assert len(self.independent_axis_mv) == self.data_no
+            if self.doubles:
+                assert len(self.independent_axis_dmv) == self.data_no
+            else:
+                assert len(self.independent_axis_mv) == self.data_no
         return 0
 
 
@@ -401,25 +507,29 @@ cdef PairedDataStruct preallocNewPairedData(PairedDataContainer pdc):
     pd_st = createPDS(zpds)
     return pd_st
 
-cdef PairedDataStruct createOnePairedData(long long *ifltab,PairedDataContainer pdc,int curve_index,int start_ord_index=0,int end_ord_index=0):
+cdef PairedDataStruct createOnePairedData(long long *ifltab,PairedDataContainer pdc,int curve_index,int start_ord_index=0,int end_ord_index=0,int end_curve_index=0):
+    # curves from curve_index to end_curve_index (default curve_index), one per row of pdc curves
     cdef:
         zStructPairedData *zpds=NULL
         PairedDataStruct pd_st
         char *pathname = pdc.pathname
-        float *curves = pdc.curves_ptr
 
     zpds = zstructPdNew(pathname)
     zpds[0].startingCurve = curve_index
-    zpds[0].endingCurve = curve_index
+    zpds[0].endingCurve = end_curve_index if end_curve_index else curve_index
     if start_ord_index:
         zpds[0].startingOrdinate = start_ord_index
         zpds[0].endingOrdinate = end_ord_index
 
         
-    zpds[0].floatValues  = curves
+    if pdc.doubles:
+        zpds[0].floatValues  = NULL
+        zpds[0].doubleValues  = pdc.curves_dptr
+    else:
+        zpds[0].floatValues  = pdc.curves_ptr
+        zpds[0].doubleValues  = NULL
     zpds[0].floatOrdinates = NULL
     zpds[0].doubleOrdinates = NULL
-    zpds[0].doubleValues  = NULL
     if pdc.labelsLength>0:
         zpds[0].labels=<char *>pdc.labels
         zpds[0].labelsLength = pdc.labelsLength
@@ -451,3 +561,27 @@ cdef PairedDataStruct createNewFloatPairedData(PairedDataContainer pdc):
 
     pd_st = createPDS(zpds)
     return pd_st
+
+cdef PairedDataStruct createNewDoublePairedData(PairedDataContainer pdc):
+    cdef:
+        zStructPairedData *zpds=NULL
+        PairedDataStruct pd_st
+        char *pathname = pdc.pathname
+        double *independent_axis = &pdc.independent_axis_dmv[0]
+        double *curves = pdc.curves_dptr
+        int data_no = pdc.data_no
+        int curve_no = pdc.curve_no
+        char *independent_units = pdc.independent_units
+        char *independent_type = pdc.independent_type
+        char *dependent_units = pdc.dependent_units
+        char *dependent_type = pdc.dependent_type
+
+    zpds = zstructPdNewDoubles(pathname, independent_axis, curves, data_no,
+                               curve_no, independent_units, independent_type,
+                               dependent_units, dependent_type)
+    if pdc.labelsLength>0:
+        zpds[0].labelsLength = pdc.labelsLength
+        zpds[0].labels = <char *>pdc.labels
+
+    pd_st = createPDS(zpds)
+    return pd_st
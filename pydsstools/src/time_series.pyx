@@ -1,4 +1,62 @@
 #cython: c_string_type=str, c_string_encoding=ascii
+
+cdef inline void _float_missing_to_nan(float *values,Py_ssize_t length) nogil:
+    # Same missing flags as zisMissingFloat
+    cdef:
+        Py_ssize_t i
+        float val
+    for i in range(length):
+        val = values[i]
+        if val == UNDEFINED_FLOAT or val == -901.0 or val == -902.0:
+            values[i] = NAN
+
+cdef inline void _double_missing_to_nan(double *values,Py_ssize_t length) nogil:
+    # Same missing flags as zisMissingDouble
+    cdef:
+        Py_ssize_t i
+        double val
+    for i in range(length):
+        val = values[i]
+        if val == UNDEFINED_DOUBLE or val == -901.0 or val == -902.0:
+            values[i] = NAN
+
+cdef inline bint _is_missing(const float *fsrc,const double *dsrc,Py_ssize_t i) nogil:
+    # zisMissingFloat/zisMissingDouble for value i of float or double buffer
+    cdef double val
+    if fsrc:
+        val = fsrc[i]
+        return fsrc[i] == UNDEFINED_FLOAT or val == -901.0 or val == -902.0
+    val = dsrc[i]
+    return val == UNDEFINED_DOUBLE or val == -901.0 or val == -902.0
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _copy_values_float(const float *fsrc,const double *dsrc,
+                                    float[:] out,Py_ssize_t num) nogil:
+    # copy values into float32 output, missing values and padding are NaN
+    cdef Py_ssize_t i
+    for i in range(out.shape[0]):
+        if i >= num or _is_missing(fsrc,dsrc,i):
+            out[i] = NAN
+        elif fsrc:
+            out[i] = fsrc[i]
+        else:
+            out[i] = <float>dsrc[i]
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _copy_values_double(const float *fsrc,const double *dsrc,
+                                     double[:] out,Py_ssize_t num) nogil:
+    # copy values into float64 output, missing values and padding are NaN
+    cdef Py_ssize_t i
+    for i in range(out.shape[0]):
+        if i >= num or _is_missing(fsrc,dsrc,i):
+            out[i] = NAN
+        elif fsrc:
+            out[i] = fsrc[i]
+        else:
+            out[i] = dsrc[i]
+
 cdef TimeSeriesStruct createTSS(zStructTimeSeries *tss):
     """Creates time-series struct
     
@@ -43,42 +101,35 @@ cdef class TimeSeriesStruct:
     """
     cdef:
         zStructTimeSeries *tss
+        object _buffers # keeps alive the values, times and timezone the struct points to
 
     def __cinit__(self,*arg,**kwargs):
         self.tss=NULL
+        self._buffers=None
 
     cdef int get_number(self):
         cdef int num
         num = self.tss[0].numberValues
         return num 
 
+    cdef np.ndarray _wrap_buffer(self,void *data,int typenum,int length):
+        # numpy array viewing heclib buffer, keeps this struct alive as its base
+        cdef:
+            np.npy_intp dims[1]
+            np.ndarray arr
+        dims[0] = length
+        arr = np.PyArray_SimpleNewFromData(1,dims,typenum,data)
+        np.set_array_base(arr,self)
+        return arr
+
     def get_times(self,array_length):
-        cdef: 
-            int length = array_length
-            view.array mview = view.array(shape=(length,), 
-                                            itemsize=sizeof(int),format='i',
-                                            allocate_buffer=False)
-        mview.data = <char *>(self.tss[0].times)
-        return np.asarray(mview)
+        return self._wrap_buffer(<void *>self.tss[0].times,np.NPY_INT32,array_length)
 
     def get_values(self,array_length):
-        cdef: 
-            int length = array_length
-            view.array mview = view.array(shape=(length,), 
-                                            itemsize=sizeof(float),format='f',
-                                            allocate_buffer=False)
-        mview.data = <char *>(self.tss[0].floatValues)
-        return np.asarray(mview)
-
+        return self._wrap_buffer(<void *>self.tss[0].floatValues,np.NPY_FLOAT32,array_length)
 
     def get_double_values(self,array_length):
-        cdef: 
-            int length = array_length
-            view.array mview = view.array(shape=(length,), 
-                                            itemsize=sizeof(double),format='d',
-                                            allocate_buffer=False)
-        mview.data = <char *>(self.tss[0].doubleValues)
-        return np.asarray(mview)
+        return self._wrap_buffer(<void *>self.tss[0].doubleValues,np.NPY_FLOAT64,array_length)
 
     # No NULL pointer check for above function
     # NULL check with following functions
@@ -198,28 +249,39 @@ cdef class TimeSeriesStruct:
                 return result
 
     @property
-    def pytimes(self):
+    def nptimes(self):
+        """Returns times of the time-series as numpy datetime64[s] array.
+
+        The array is computed in one vectorized step from the integer times
+        (irregular) or from the start date and interval (regular). Calendar
+        based intervals (month, semi-month, tri-month, year) are handled.
+
+        Returns
+        -------
+            # numpy datetime64[s] array
+            # None when the time-series is empty or invalid
+        """
         cdef:
-            list datetimes
-            object times
-            int interval,granularity,num,count
+            int num,interval,granularity
+
         if self.tss:
             num = self.get_number()
-            interval = self.interval
-            times = self.times
-            
-            if times:
-                if interval <= 0:
-                    granularity = self.granularity
-                    datetimes = [getPyDateTimeFromValue(x,granularity,self.tss[0].julianBaseDate) for x in times]    
-                else:
-                    freq = times['freq']
-                    start_date = times['start_date'].python_datetime
-                    datetimes = [start_date]
-                    for i in range(1,num):
-                        new_date = datetimes[-1] + relativedelta(**freq)
-                        datetimes.append(new_date)
-                return datetimes
+            interval = self.tss[0].timeIntervalSeconds
+            if interval <= 0:
+                granularity = self.tss[0].timeGranularitySeconds
+                return getDatetime64FromValues(self.get_times(num),granularity,
+                                               self.tss[0].julianBaseDate)
+            start = getDatetime64FromJulian(self.tss[0].startJulianDate,
+                                            self.tss[0].startTimeSeconds)
+            return getRegularDatetime64(start,interval,num)
+
+    @property
+    def pytimes(self):
+        """Returns times of the time-series as list of python datetime objects
+        """
+        times = self.nptimes
+        if not times is None:
+            return times.tolist()
 
 
     @property
@@ -254,6 +316,9 @@ cdef class TimeSeriesStruct:
 
     @property
     def nodata(self):
+        """Returns boolean array, True for missing values (UNDEFINED, -901, -902)
+           and NaN. NaN is the missing value after to_series(copy=False).
+        """
         cdef:
             np.ndarray values
             np.ndarray result
@@ -261,12 +326,12 @@ cdef class TimeSeriesStruct:
         values = self.values
         if not values is None:
             if self.tss[0].floatValues:
-                check = lambda x : zisMissingFloat(x)==1
-            elif self.tss[0].doubleValues:
-                check = lambda x : zisMissingDouble(x)==1
-
-            func = np.vectorize(check)
-            result = func(values)
+                undefined = UNDEFINED_FLOAT
+            else:
+                undefined = UNDEFINED_DOUBLE
+            # NaN for values already converted by to_series
+            result = ((values == undefined) | (values == -901.0) |
+                      (values == -902.0) | np.isnan(values))
             return result
 
     @property
@@ -277,6 +342,132 @@ cdef class TimeSeriesStruct:
         return True
 
 
+    def to_series(self,bint copy=True):
+        """Returns the time-series as pandas Series with DatetimeIndex.
+
+        Parameter
+        ---------
+            copy: bool, default True
+                If True, the values are copied once and the struct is unchanged.
+                If False, the Series wraps the value buffer of this struct
+                without copying and the missing values (UNDEFINED, -901, -902)
+                are replaced by NaN in place, i.e., values property of this struct
+                returns NaN afterwards. The struct is kept alive by the Series.
+                Use it only when the struct is not shared, e.g., not cached.
+
+        Returns
+        -------
+            # pandas Series named by the pathname
+            # Empty Series when the time-series is empty or invalid
+        """
+        cdef:
+            int num
+            float[::1] float_mv
+            double[::1] double_mv
+
+        if not self.tss:
+            return pd.Series(np.empty(0,dtype=np.float32),
+                             index=pd.DatetimeIndex([]),name=self.pathname)
+
+        num = self.get_number()
+        if self.tss[0].floatValues:
+            values = self.get_values(num)
+            if copy:
+                values = values.copy()
+            float_mv = values
+            with nogil:
+                _float_missing_to_nan(&float_mv[0],num)
+        elif self.tss[0].doubleValues:
+            values = self.get_double_values(num)
+            if copy:
+                values = values.copy()
+            double_mv = values
+            with nogil:
+                _double_missing_to_nan(&double_mv[0],num)
+        else:
+            values = np.full(num,np.nan,dtype=np.float32)
+
+        index = pd.DatetimeIndex(self.nptimes)
+        return pd.Series(values,index=index,name=self.pathname,copy=False)
+
+    def copy_to(self,values_out,times_out=None):
+        """Copies the values (and times) into caller provided arrays without
+           creating intermediate arrays.
+
+        Parameter
+        ---------
+            values_out: 1-D float32 or float64 array, e.g., a row or column of 2-D array
+                Missing values are written as NaN. Elements after the last value are
+                set to NaN.
+            times_out: 1-D int32 or datetime64 array, optional
+                For int32 output, times are the time values in granularity units
+                since julianBaseDate (same as times of irregular time-series).
+                Only the first numberValues elements are written.
+
+        Returns
+        -------
+            # Number of values copied, 0 when the time-series is empty or invalid
+        """
+        cdef:
+            Py_ssize_t i,num = 0
+            float *fsrc = NULL
+            double *dsrc = NULL
+            int *tsrc = NULL
+            float[:] fout
+            double[:] dout
+            int[:] tout
+            bint to_double
+
+        if self.tss:
+            num = self.get_number()
+            fsrc = self.tss[0].floatValues
+            dsrc = self.tss[0].doubleValues
+            if not fsrc and not dsrc:
+                num = 0
+
+        dtype = np.dtype(values_out.dtype)
+        if dtype == np.float32:
+            to_double = False
+            fout = values_out
+            length = fout.shape[0]
+        elif dtype == np.float64:
+            to_double = True
+            dout = values_out
+            length = dout.shape[0]
+        else:
+            raise ValueError('values_out must be float32 or float64 array')
+        if length < num:
+            raise ValueError('values_out of length %d is smaller than %d values' % (length,num))
+
+        if not times_out is None and num:
+            if len(times_out) < num:
+                raise ValueError('times_out of length %d is smaller than %d values' % (len(times_out),num))
+            if np.issubdtype(times_out.dtype,np.datetime64):
+                times_out[:num] = self.nptimes
+            elif self.tss[0].timeIntervalSeconds <= 0:
+                tout = times_out
+                tsrc = self.tss[0].times
+                with nogil:
+                    for i in range(num):
+                        tout[i] = tsrc[i]
+            else:
+                granularity = self.tss[0].timeGranularitySeconds
+                if granularity <= 0:
+                    granularity = 60
+                base = getDatetime64FromJulian(self.tss[0].julianBaseDate)
+                times = (self.nptimes - base).astype(np.int64) // granularity
+                if times[-1] > np.iinfo(np.int32).max:
+                    raise ValueError('Time values overflow int32 for granularity of %d seconds' % granularity)
+                tout = times_out
+                tout[:num] = times.astype(np.int32)
+
+        with nogil:
+            if to_double:
+                _copy_values_double(fsrc,dsrc,dout,num)
+            else:
+                _copy_values_float(fsrc,dsrc,fout,num)
+        return num
+
     @property
     def type(self):
         """Returns the type of the time-series
@@ -413,6 +604,18 @@ cdef class TimeSeriesStruct:
                 timezone = self.tss[0].timeZoneName
         return timezone        
 
+    @property
+    def lastWrittenTime(self):
+        """Returns last write time of the record(s) read, milliseconds since 1970"""
+        if self.tss:
+            return self.tss[0].lastWrittenTime
+
+    @property
+    def fileLastWrittenTime(self):
+        """Returns last write time of the dss file, milliseconds since 1970"""
+        if self.tss:
+            return self.tss[0].fileLastWrittenTime
+
     @property
     def _julian_base_date(self):
         if self.tss:
@@ -433,10 +636,11 @@ cdef class TimeSeriesContainer:
         object _values
         float *floatValues
         double *doubleValues
-        float [:] float_mv
-        double [:] double_mv
+        const float [::1] float_mv
+        const double [::1] double_mv
         void *Values
-        int [:] int_mv
+        const int [::1] int_mv
+        dict _scratch
         int *intTimes
         object _timezone_bytes
         char *timeZoneName
@@ -464,100 +668,87 @@ cdef class TimeSeriesContainer:
         self._timezone_bytes = _timezone.encode('ascii')
         self.timeZoneName = PyBytes_AS_STRING(self._timezone_bytes)
         self._startDateBase=''
+        self._scratch = {}
 
-    cdef int setFloatValues(self):
+    cdef object _convertBuffer(self,object values,str typecode):
+        """Converts values into contiguous array of typecode. The scratch array of the
+           container is reused when no struct of earlier write still points at it,
+           otherwise new scratch array is made. Raises OverflowError when integer
+           values do not fit in int32 times.
+        """
+        values = np.asarray(values)
+        if typecode == 'i' and values.dtype.kind in 'iu' and values.size:
+            info = np.iinfo(np.int32)
+            if values.min() < info.min or values.max() > info.max:
+                raise OverflowError("Time values do not fit in int32, use coarser granularity")
+        if values.ndim != 1:
+            return np.ascontiguousarray(values,dtype=typecode)
+        cdef Py_ssize_t length = values.shape[0]
+        scratch = self._scratch.get(typecode)
+        # Referenced by _scratch and this variable only; views of it held by the
+        # struct of earlier write (or by this container) add to the count
+        if scratch is None or scratch.shape[0] < length or (<PyObject *>scratch).ob_refcnt > 2:
+            scratch = np.empty(length,dtype=typecode)
+            self._scratch[typecode] = scratch
+        out = scratch[:length]
+        out[...] = values
+        return out
+
+    cdef int setFloatValues(self) except *:
         """ Used by setValues member function to set Regular time-series values
+
+            Any contiguous float32 buffer (numpy array, array.array, memoryview, etc.),
+            read-only included, is used without copying, others are converted into
+            the scratch array.
         """
         logging.debug("Setting floatValues")
-        if isinstance(self._values,array.array):
-            if self._values.typecode == 'f':
-                self.float_mv = self._values
-                self.floatValues=&self.float_mv[0]
-            else:
-                self.setPyListType('f')
-
-        elif isinstance(self._values,(list,tuple)):
-            self.setPyListType('f')
-
-        elif isinstance(self._values,np.ndarray):
-            if self._values.dtype==np.float32:
-                self.float_mv = self._values
-                self.floatValues=&self.float_mv[0]
-            else:
-                self.float_mv = self._values.astype(np.float32)
-                self.floatValues=&self.float_mv[0]
-
-        else:
-            raise "Invalid Values"
-
+        try:
+            self.float_mv = self._values
+        except (TypeError,ValueError,BufferError):
+            # release the previous view of the scratch array first
+            self.float_mv = None
+            self.float_mv = self._convertBuffer(self._values,'f')
+        self.floatValues=<float *>&self.float_mv[0]
         self.doubleValues=NULL
 
-    cdef int setDoubleValues(self):
+    cdef int setDoubleValues(self) except *:
         """ Used by setValues member function to set Irregular time-series values
+
+            Any contiguous float64 buffer is used without copying, others are
+            converted into the scratch array.
         """
         logging.debug("Setting doubleValues")
-        if isinstance(self._values,array.array):
-            if self._values.typecode == 'd':
-                self.double_mv = self._values
-                self.doubleValues=&self.double_mv[0]
-            else:
-                self.setPyListType('d')
-
-        elif isinstance(self._values,(list,tuple)):
-            self.setPyListType('d')
-
-        elif isinstance(self._values,np.ndarray):
-            if self._values.dtype==np.float64:
-                self.double_mv = self._values
-                self.doubleValues=&self.double_mv[0]
-            else:
-                self.double_mv = self._values.astype(np.float64)
-                self.doubleValues=&self.double_mv[0]
-
-        else:
-            raise "Invalid Values"
-
+        try:
+            self.double_mv = self._values
+        except (TypeError,ValueError,BufferError):
+            # release the previous view of the scratch array first
+            self.double_mv = None
+            self.double_mv = self._convertBuffer(self._values,'d')
+        self.doubleValues=<double *>&self.double_mv[0]
         self.floatValues=NULL
 
-    cdef int setPyListType(self,type_code='f'):
-        if type_code == 'f':
-            self.float_mv = array.array(type_code,self._values)
-            self.floatValues=&self.float_mv[0]
-        elif type_code == 'd':
-            self.double_mv = array.array(type_code,self._values)
-            self.doubleValues=&self.double_mv[0]
-        else:
-            pass
-        
     cdef int setTimePtr(self) except *:
         """Sets pointer to time array, only needed for irregular time-series
+
+           Any contiguous int32 buffer is used without copying, others are converted
+           into the scratch array. Raises OverflowError for times out of int32 range.
         """
         logging.debug("Setting times")
-        if isinstance(self.times,array.array):
-            if self.times.typecode in ('i',):
-                self.int_mv = self.times
-                self.intTimes=&self.int_mv[0]
-            else:
-                logging.error('Typecode error: Time array typecode must be i') 
-                raise Exception("Typecode error: Time array typecode must be i") 
-
-        elif isinstance(self.times,(list,tuple)):
-            self.int_mv = np.array(self.times,dtype=np.int32) #array.array('l',self.times)
-            self.intTimes=&self.int_mv[0]
-
-        elif isinstance(self.times,np.ndarray):
-            if self.times.dtype==np.int32:
-                self.int_mv = self.times
-                self.intTimes=&self.int_mv[0]
-            else:
-                self.int_mv = self.times.astype(np.int32)
-                self.intTimes=&self.int_mv[0]
-
-        else:
+        if self.times is None or isinstance(self.times,(str,bytes)):
             logging.error('Value error: Time array is invalid') 
             raise Exception("Invalid Time Values/Type")
+        try:
+            self.int_mv = self.times
+        except (TypeError,ValueError,BufferError):
+            self.int_mv = None
+            try:
+                self.int_mv = self._convertBuffer(self.times,'i')
+            except (TypeError,ValueError):
+                logging.error('Value error: Time array is invalid') 
+                raise Exception("Invalid Time Values/Type")
+        self.intTimes=<int *>&self.int_mv[0]
     
-    cpdef int setValues(self):
+    cpdef int setValues(self) except *:
         """Extension function to set correct pointer type to the user entered values
            data
         """
@@ -631,6 +822,11 @@ cdef TimeSeriesStruct createNewTimeSeries(TimeSeriesContainer tsc):
         tss[0].timeZoneName = tsc.timeZoneName
 
     ts_st = createTSS(tss)
+    # the struct does not copy the values, times and timezone of the container
+    if interval <= 0:
+        ts_st._buffers = (tsc.double_mv,tsc.int_mv,tsc._timezone_bytes)
+    else:
+        ts_st._buffers = (tsc.float_mv,tsc._timezone_bytes)
     logging.debug("length = {}".format(ts_st.numberValues))
     return ts_st  
 
@@ -46,6 +46,7 @@ cdef class dss_info:
         readonly int version
         readonly int numberValues
         readonly int logicalNumberValues
+        readonly long long lastWriteTimeMillis
         # TS
         readonly int values1Number
         readonly int numberRecordsFound
@@ -67,7 +68,8 @@ cdef class dss_info:
 
     def __init__(self,Open fid,char *pathname):
         self.recordSize = zstructRecordSizeNew(pathname)
-        self.status = zgetRecordSize(fid.ifltab,self.recordSize)
+        with fid._lock, _heclib_lock:
+            self.status = zgetRecordSize(fid.ifltab,self.recordSize)
         if not self.status == 0: # STATUS_OK != 0
             zstructFree(self.recordSize)
             self.recordSize=NULL
@@ -78,6 +80,7 @@ cdef class dss_info:
         self.version = self.recordSize[0].version
         self.numberValues = self.recordSize[0].numberValues
         self.logicalNumberValues = self.recordSize[0].logicalNumberValues
+        self.lastWriteTimeMillis = self.recordSize[0].lastWriteTimeMillis
         # TS
         self.values1Number = self.recordSize[0].values1Number
         self.numberRecordsFound = self.recordSize[0].numberRecordsFound
@@ -124,7 +127,8 @@ cpdef list pd_size(Open fid,char *pathname):
 
 cpdef squeeze_file(str file_path):
     cdef int status
-    status = zsqueeze(file_path)
+    with _heclib_lock:
+        status = zsqueeze(file_path)
 
 cdef int copyRecord(Open copyFrom, Open copyTo, str pathnameFrom, str pathnameTo):
     """Copy a record from one hec-dss file (From-) to another (To-)
@@ -152,7 +156,11 @@ cdef int copyRecord(Open copyFrom, Open copyTo, str pathnameFrom, str pathnameTo
         char *pathFrom = pathnameFrom
         char *pathTo = pathnameTo
         int status
-    status = zcopyRecord(ifltabFrom,ifltabTo,pathFrom,pathTo)
+    # same lock order in all threads
+    if id(copyFrom) > id(copyTo):
+        copyFrom, copyTo = copyTo, copyFrom
+    with copyFrom._lock, copyTo._lock, _heclib_lock:
+        status = zcopyRecord(ifltabFrom,ifltabTo,pathFrom,pathTo)
     return status
 
 cpdef int copyRecordTo(Open copyFrom, str copyToFile, str pathnameFrom, str pathnameTo):
@@ -184,7 +192,8 @@ cpdef int copyRecordTo(Open copyFrom, str copyToFile, str pathnameFrom, str path
         int status
     with Open(copyToFile) as fid:
         ifltabTo = fid.ifltab
-        status = zcopyRecord(ifltabFrom,ifltabTo,pathFrom,pathTo)
+        with copyFrom._lock, _heclib_lock:
+            status = zcopyRecord(ifltabFrom,ifltabTo,pathFrom,pathTo)
         return status
 
 cpdef int get_grid_version(Open _open, str pathname):
@@ -194,7 +203,8 @@ cpdef int get_grid_version(Open _open, str pathname):
         int *zversion = <int*>malloc(sizeof(int*))
         int ver = -9999
         int status
-    status = zspatialGridRetrieveVersion(ifltab,path,zversion)
+    with _open._lock, _heclib_lock:
+        status = zspatialGridRetrieveVersion(ifltab,path,zversion)
     if zversion:
         ver = zversion[0]
         free(zversion)